@@ -1,67 +1,117 @@
-from django.contrib import admin
-from .models import Section, Question, TestAttempt, TestAnswer
-
-
-@admin.register(Section)
-class SectionAdmin(admin.ModelAdmin):
-    list_display = ['section_id', 'name_ar', 'question_count', 'order']
-    list_editable = ['order']
-    search_fields = ['section_id', 'name_ar', 'name_en']
-    ordering = ['order', 'section_id']
-
-
-@admin.register(Question)
-class QuestionAdmin(admin.ModelAdmin):
-    list_display = ['question_id', 'section', 'text_preview', 'difficulty', 'is_active']
-    list_filter = ['section', 'difficulty', 'is_active']
-    search_fields = ['question_id', 'text_ar', 'text_en']
-    list_editable = ['is_active']
-
-    def text_preview(self, obj):
-        return obj.text_ar[:50] + '...' if len(obj.text_ar) > 50 else obj.text_ar
-
-    text_preview.short_description = 'نص السؤال'
-
-
-class TestAnswerInline(admin.TabularInline):
-    model = TestAnswer
-    extra = 0
-    readonly_fields = ['question', 'selected_answer', 'is_correct', 'answered_at']
-
-
-@admin.register(TestAttempt)
-class TestAttemptAdmin(admin.ModelAdmin):
-    list_display = [
-        'id',
-        'test_type',
-        'section',
-        'correct_answers',
-        'total_questions',
-        'score_percentage',
-        'passed',
-        'started_at'
-    ]
-    list_filter = ['test_type', 'passed', 'with_timer', 'section']
-    readonly_fields = [
-        'started_at',
-        'completed_at',
-        'answered_questions',
-        'correct_answers',
-        'score_percentage',
-        'passed',
-        'time_taken_seconds'
-    ]
-    inlines = [TestAnswerInline]
-
-    def has_add_permission(self, request):
-        return False
-
-
-@admin.register(TestAnswer)
-class TestAnswerAdmin(admin.ModelAdmin):
-    list_display = ['attempt', 'question', 'selected_answer', 'is_correct', 'answered_at']
-    list_filter = ['is_correct', 'answered_at']
-    readonly_fields = ['attempt', 'question', 'selected_answer', 'is_correct', 'answered_at']
-
-    def has_add_permission(self, request):
-        return False
+from django.contrib import admin
+from django.db.models import Q
+from .models import Section, Question, TestAttempt, TestAnswer
+from .search import question_search
+
+
+@admin.register(Section)
+class SectionAdmin(admin.ModelAdmin):
+    list_display = ['section_id', 'name_ar', 'question_count', 'order']
+    list_editable = ['order']
+    search_fields = ['section_id', 'name_ar', 'name_en']
+    ordering = ['order', 'section_id']
+
+
+@admin.register(Question)
+class QuestionAdmin(admin.ModelAdmin):
+    list_display = [
+        'question_id',
+        'section',
+        'text_preview',
+        'difficulty',
+        'answered_count',
+        'percent_correct',
+        'median_time',
+        'is_active'
+    ]
+    list_filter = ['section', 'difficulty', 'is_active']
+    search_fields = ['question_id']
+    list_editable = ['is_active']
+    # الإحصائيات من الجدول المجمع عبر JOIN واحد بدلاً من تجميع الإجابات
+    list_select_related = ['section', 'statistics']
+    # أقصى عدد لنتائج البحث النصي في قائمة المشرف
+    search_limit = 1000
+
+    def get_search_results(self, request, queryset, search_term):
+        """معرف السؤال أو البحث النصي عبر الفهرس بدلاً من icontains على النصوص"""
+        search_term = search_term.strip()
+        if not search_term:
+            return queryset, False
+        ids = [
+            pk for pk, score in
+            question_search.search(search_term, limit=self.search_limit, include_inactive=True)
+        ]
+        return queryset.filter(Q(pk__in=ids) | Q(question_id__icontains=search_term)), False
+
+    def text_preview(self, obj):
+        return obj.text_ar[:50] + '...' if len(obj.text_ar) > 50 else obj.text_ar
+
+    text_preview.short_description = 'نص السؤال'
+
+    def _statistics(self, obj):
+        return getattr(obj, 'statistics', None)
+
+    @admin.display(description='عدد الإجابات', ordering='statistics__answered_count')
+    def answered_count(self, obj):
+        statistics = self._statistics(obj)
+        return statistics.answered_count if statistics else 0
+
+    @admin.display(description='نسبة الصحيحة', ordering='statistics__percent_correct')
+    def percent_correct(self, obj):
+        statistics = self._statistics(obj)
+        if statistics is None or statistics.percent_correct is None:
+            return '-'
+        return f'{statistics.percent_correct:.1f}%'
+
+    @admin.display(description='وسيط الزمن (ث)', ordering='statistics__median_time_seconds')
+    def median_time(self, obj):
+        statistics = self._statistics(obj)
+        if statistics is None or statistics.median_time_seconds is None:
+            return '-'
+        return f'{statistics.median_time_seconds:.0f}'
+
+
+class TestAnswerInline(admin.TabularInline):
+    model = TestAnswer
+    extra = 0
+    readonly_fields = ['question', 'selected_answer', 'is_correct', 'answered_at']
+
+
+@admin.register(TestAttempt)
+class TestAttemptAdmin(admin.ModelAdmin):
+    list_display = [
+        'id',
+        'test_type',
+        'section',
+        'correct_answers',
+        'total_questions',
+        'score_percentage',
+        'passed',
+        'started_at'
+    ]
+    list_filter = ['test_type', 'passed', 'with_timer', 'section']
+    list_select_related = ['section']
+    readonly_fields = [
+        'started_at',
+        'completed_at',
+        'answered_questions',
+        'correct_answers',
+        'score_percentage',
+        'passed',
+        'time_taken_seconds'
+    ]
+    inlines = [TestAnswerInline]
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(TestAnswer)
+class TestAnswerAdmin(admin.ModelAdmin):
+    list_display = ['attempt', 'question', 'selected_answer', 'is_correct', 'answered_at']
+    list_filter = ['is_correct', 'answered_at']
+    list_select_related = ['attempt', 'question']
+    readonly_fields = ['attempt', 'question', 'selected_answer', 'is_correct', 'answered_at']
+
+    def has_add_permission(self, request):
+        return False
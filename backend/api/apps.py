@@ -1,7 +1,10 @@
-# ============================================
-from django.apps import AppConfig
-
-class ApiConfig(AppConfig):
-    default_auto_field = 'django.db.models.BigAutoField'
-    name = 'api'
-    verbose_name = 'اختبار القيادة السويدي'
+# ============================================
+from django.apps import AppConfig
+
+class ApiConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'api'
+    verbose_name = 'اختبار القيادة السويدي'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,192 @@
+"""
+أرشفة المحاولات المكتملة القديمة (تقسيم ساخن / بارد)
+
+تُنقل المحاولات المكتملة الأقدم من ATTEMPT_ARCHIVE_AFTER_DAYS يوماً مع
+إجاباتها من TestAttempt و TestAnswer إلى ArchivedAttempt، فيبقى في
+الجداول الساخنة ما يُستعلم عنه فعلاً وتصغر فهارسها. كل محاولة تصبح صفاً
+واحداً وإجاباتها (حوالي 65 صفاً) سجلات ثابتة الحجم في حقل واحد.
+
+مع format=jsonl تُكتب الإجابات في ملفات JSONL مضغوطة بـ gzip (ملف لكل
+شهر في ATTEMPT_ARCHIVE_DIR) ويبقى في قاعدة البيانات صف الملخص فقط.
+
+الإحصائيات المجمعة لا تتغير بالأرشفة، وأوامر إعادة بنائها تضيف
+المحاولات والإجابات المؤرشفة.
+"""
+import gzip
+import json
+import os
+import struct
+
+from django.conf import settings
+from django.db import transaction
+
+from .models import TestAttempt, TestAnswer, ArchivedAttempt
+
+
+ARCHIVE_FORMATS = ('table', 'jsonl')
+
+# معرف السؤال، الإجابة المختارة، صحيحة، الوقت المستغرق (-1 = غير معروف)
+ANSWER_RECORD = struct.Struct('<qbbi')
+
+# مدى الحقلين المحدودين في السجل (الأرشيفات الموجودة تبقى بنفس الصيغة)
+SELECTED_RANGE = range(-128, 128)
+MAX_RECORD_SECONDS = 2 ** 31 - 1
+
+ATTEMPT_FIELDS = [
+    'id',
+    'test_type',
+    'section_id',
+    'with_timer',
+    'started_at',
+    'completed_at',
+    'total_questions',
+    'answered_questions',
+    'correct_answers',
+    'score_percentage',
+    'passed',
+    'time_taken_seconds',
+    'exam_seed',
+]
+
+
+def pack_answers(answers):
+    """
+    ضغط إجابات [(السؤال، الإجابة، صحيحة، الوقت)] في سجلات ثابتة الحجم
+    - إجابة خارج مدى البايت (إدخال قديم غير صالح) تُحفظ -1، فتبقى في عدد
+      الإجابات والصحيحة دون توزيع الخيارات كما في QuestionStatistics.add
+    - الوقت الأكبر من MAX_RECORD_SECONDS يُقص إليه (نفس خانة المدرج الأخيرة)
+    """
+    records = []
+    clamped = 0
+    for question_id, selected, is_correct, seconds in answers:
+        if selected not in SELECTED_RANGE:
+            selected = -1
+            clamped += 1
+        if seconds is None or seconds < 0:
+            seconds = -1
+        elif seconds > MAX_RECORD_SECONDS:
+            seconds = MAX_RECORD_SECONDS
+            clamped += 1
+        records.append(ANSWER_RECORD.pack(question_id, selected, int(is_correct), seconds))
+    if clamped:
+        print(f"تحذير: {clamped} قيمة خارج مدى سجل الأرشيف (إجابة أو وقت) حُفظت بقيمة بديلة")
+    return b''.join(records)
+
+
+def unpack_answers(data):
+    """فك ضغط الإجابات إلى [(السؤال، الإجابة، صحيحة، الوقت)]"""
+    return [
+        (question_id, selected, bool(is_correct), None if seconds < 0 else seconds)
+        for question_id, selected, is_correct, seconds in ANSWER_RECORD.iter_unpack(bytes(data))
+    ]
+
+
+def archive_path(completed_at, directory=None):
+    directory = directory or settings.ATTEMPT_ARCHIVE_DIR
+    return os.path.join(directory, f'attempts-{completed_at:%Y-%m}.jsonl.gz')
+
+
+def _write_jsonl(rows, answers, directory):
+    """إضافة المحاولات وإجاباتها إلى ملفات الأشهر وإرجاع {المحاولة: الملف}"""
+    os.makedirs(directory, exist_ok=True)
+    by_file = {}
+    for row in rows:
+        by_file.setdefault(archive_path(row['completed_at'], directory), []).append(row)
+
+    files = {}
+    for path, file_rows in by_file.items():
+        # كل إضافة عضو gzip مستقل، والملف يُقرأ كاملاً كملف واحد
+        with gzip.open(path, 'at', encoding='utf-8') as archive:
+            for row in file_rows:
+                archive.write(json.dumps({
+                    **row,
+                    'answers': answers.get(row['id'], []),
+                }, ensure_ascii=False, default=str) + '\n')
+                files[row['id']] = os.path.basename(path)
+    return files
+
+
+def archive_attempts(cutoff, batch_size=1000, archive_format='table', directory=None, stdout=None):
+    """نقل المحاولات المكتملة قبل cutoff على دفعات وإرجاع (المحاولات، الإجابات)"""
+    if archive_format not in ARCHIVE_FORMATS:
+        raise ValueError(f"صيغة الأرشيف غير مدعومة: {archive_format}")
+    directory = directory or settings.ATTEMPT_ARCHIVE_DIR
+
+    queryset = TestAttempt.objects.filter(completed_at__lt=cutoff).order_by('pk')
+    attempts_total = 0
+    answers_total = 0
+    last_pk = 0
+
+    while True:
+        rows = list(queryset.filter(pk__gt=last_pk).values(*ATTEMPT_FIELDS)[:batch_size])
+        if not rows:
+            break
+        ids = [row['id'] for row in rows]
+        last_pk = ids[-1]
+
+        answers = {}
+        answer_rows = TestAnswer.objects.filter(attempt_id__in=ids).order_by('attempt_id', 'id').values_list(
+            'attempt_id', 'question_id', 'selected_answer', 'is_correct', 'time_spent_seconds'
+        )
+        for attempt_id, *answer in answer_rows:
+            answers.setdefault(attempt_id, []).append(answer)
+
+        files = _write_jsonl(rows, answers, directory) if archive_format == 'jsonl' else {}
+
+        archived = [
+            ArchivedAttempt(
+                **row,
+                answers=None if archive_format == 'jsonl' else pack_answers(answers.get(row['id'], [])),
+                archive_file=files.get(row['id'], '')
+            )
+            for row in rows
+        ]
+        with transaction.atomic():
+            # إعادة التشغيل بعد فشل سابق لا تكرر المحاولات
+            ArchivedAttempt.objects.bulk_create(archived, ignore_conflicts=True)
+            answers_deleted, _ = TestAnswer.objects.filter(attempt_id__in=ids).delete()
+            TestAttempt.objects.filter(pk__in=ids).delete()
+
+        attempts_total += len(rows)
+        answers_total += answers_deleted
+        if stdout:
+            stdout(f'   {attempts_total} محاولة، {answers_total} إجابة')
+
+    return attempts_total, answers_total
+
+
+def iter_archived_attempt_answers(queryset=None, directory=None):
+    """
+    إجابات المحاولات المؤرشفة: (المحاولة، السؤال، الإجابة، صحيحة، الوقت)
+    - queryset: المحاولات المؤرشفة المطلوبة (الافتراضي كلها)
+    """
+    directory = directory or settings.ATTEMPT_ARCHIVE_DIR
+    if queryset is None:
+        queryset = ArchivedAttempt.objects.all()
+    files = set()
+    file_ids = set()
+    packed = queryset.order_by().values_list('id', 'answers', 'archive_file')
+    for pk, data, archive_file in packed.iterator(chunk_size=2000):
+        if archive_file:
+            files.add(archive_file)
+            file_ids.add(pk)
+        elif data:
+            for answer in unpack_answers(data):
+                yield (pk, *answer)
+
+    for name in sorted(files):
+        with gzip.open(os.path.join(directory, name), 'rt', encoding='utf-8') as archive:
+            for line in archive:
+                row = json.loads(line)
+                # أسطر دفعة فشلت بعد كتابة الملف (أو مكررة بعد إعادة التشغيل) تُتجاهل
+                if row['id'] not in file_ids:
+                    continue
+                file_ids.discard(row['id'])
+                for question_id, selected, is_correct, seconds in row['answers']:
+                    yield row['id'], question_id, selected, is_correct, seconds
+
+
+def iter_archived_answers(directory=None):
+    """كل الإجابات المؤرشفة: (السؤال، الإجابة، صحيحة، الوقت)"""
+    for _, *answer in iter_archived_attempt_answers(directory=directory):
+        yield tuple(answer)
@@ -0,0 +1,192 @@
+"""
+نسخ غير متزامنة (ASGI) من نقاط النهاية الساخنة للاختبار
+
+عند التشغيل عبر config.asgi (مثل uvicorn أو daphne) تُنفذ هذه العروض على
+حلقة الأحداث مباشرة وتستخدم ORM غير المتزامن، فلا يُحجز خيط لكل طلب
+ينتظر قاعدة البيانات. تصحيح الإجابات وإنهاء المحاولة يحتاجان معاملة
+وقفل صف (select_for_update) غير مدعومين في ORM غير المتزامن، لذلك
+يُنفذان عبر sync_to_async.
+
+- GET  async/questions/random_full_test/
+- GET  async/questions/by_section/?section_id=...&random=N
+- POST async/attempts/
+- POST async/attempts/<id>/submit/
+"""
+import json
+import random
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_POST
+
+from .exam_pool import exam_pool, build_exam_snapshot, generate_exam_ids, ExamSnapshotError
+from .models import Section, TestAttempt, TestAnswer
+from .payload_cache import question_payload_cache, render_json, render_with_fragments
+from .question_pool import question_pool, FULL_TEST_DISTRIBUTION
+from .serializers import SectionSerializer, TestAttemptSerializer, TestSubmissionSerializer
+from .views import get_client_ip, answers_queryset, parse_selected_answers, invalid_answers_error
+from .write_behind import attempt_buffer
+
+
+def json_response(data, status=200):
+    """استجابة JSON بنفس إعدادات DRF"""
+    return HttpResponse(render_json(data), status=status, content_type='application/json')
+
+
+def parse_body(request):
+    """قراءة جسم الطلب بصيغة JSON (يرجع None إذا كان غير صالح)"""
+    if not request.body:
+        return {}
+    try:
+        data = json.loads(request.body)
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+async def render_questions(envelope, question_ids):
+    """بناء استجابة JSON بدمج أجزاء الأسئلة المخزنة مؤقتاً"""
+    fragments = await question_payload_cache.arender(question_ids)
+    envelope['total'] = len(fragments)
+    body = render_with_fragments(envelope, 'questions', fragments)
+    return HttpResponse(body, content_type='application/json')
+
+
+async def serialize_attempt(attempt):
+    """تحويل المحاولة مع إجاباتها (تُجلب الإجابات مسبقاً عبر ORM غير المتزامن)"""
+    answers = [answer async for answer in answers_queryset().filter(attempt=attempt)]
+    attempt._prefetched_objects_cache = {'answers': answers}
+    return TestAttemptSerializer(attempt).data
+
+
+@require_GET
+async def random_full_test(request):
+    """توليد 65 سؤال عشوائي حسب توزيع الاختبار الكامل"""
+    body = await exam_pool.apop()
+    if body is not None:
+        return HttpResponse(body, content_type='application/json')
+
+    question_ids = generate_exam_ids(random, await question_pool.aget_index())
+
+    return await render_questions({
+        'total': len(question_ids),
+        'distribution': FULL_TEST_DISTRIBUTION,
+    }, question_ids)
+
+
+@require_GET
+async def by_section(request):
+    """الحصول على أسئلة قسم محدد (مع random=N لعدد عشوائي)"""
+    section_id = request.GET.get('section_id')
+    random_count = request.GET.get('random')
+
+    if not section_id:
+        return json_response({'error': 'معرف القسم مطلوب (section_id)'}, status=400)
+
+    try:
+        section = await Section.objects.aget(section_id=section_id)
+    except Section.DoesNotExist:
+        return json_response({'error': 'القسم غير موجود'}, status=404)
+
+    index = await question_pool.aget_index()
+    question_ids = list(index.get(section_id, ()))
+
+    if random_count:
+        try:
+            question_ids = await question_pool.asample_ids(section_id, int(random_count))
+        except ValueError:
+            pass
+
+    return await render_questions({
+        'section': SectionSerializer(section).data,
+        'total': len(question_ids),
+    }, question_ids)
+
+
+@csrf_exempt
+@require_POST
+async def create_attempt(request):
+    """إنشاء محاولة اختبار جديدة"""
+    data = parse_body(request)
+    if data is None:
+        return json_response({'error': 'بيانات JSON غير صالحة'}, status=400)
+
+    test_type = data.get('test_type')
+    section_id = data.get('section_id')
+    with_timer = data.get('with_timer', False)
+
+    if test_type not in ['full', 'section']:
+        return json_response({'error': 'نوع الاختبار غير صحيح'}, status=400)
+
+    if test_type == 'full':
+        section = None
+    else:
+        if not section_id:
+            return json_response({'error': 'معرف القسم مطلوب لاختبار القسم'}, status=400)
+        try:
+            section = await Section.objects.aget(section_id=section_id)
+        except Section.DoesNotExist:
+            return json_response({'error': 'القسم غير موجود'}, status=404)
+
+    state = await question_pool.aget_state()
+    try:
+        question_ids, answer_keys, seed = build_exam_snapshot(
+            state,
+            test_type,
+            section_id,
+            data.get('question_ids'),
+            data.get('seed')
+        )
+    except ExamSnapshotError as e:
+        return json_response({'error': str(e)}, status=400)
+
+    attempt = TestAttempt(
+        test_type=test_type,
+        section=section,
+        with_timer=with_timer,
+        user_ip=get_client_ip(request),
+        user_agent=request.META.get('HTTP_USER_AGENT', '')
+    )
+    attempt.set_snapshot(question_ids, answer_keys, seed, state.version)
+    if attempt_buffer.enabled:
+        await sync_to_async(attempt_buffer.add)(attempt)
+    else:
+        await attempt.asave()
+
+    # محاولة جديدة بلا إجابات
+    attempt._prefetched_objects_cache = {'answers': TestAnswer.objects.none()}
+    return json_response(TestAttemptSerializer(attempt).data, status=201)
+
+
+@csrf_exempt
+@require_POST
+async def submit(request, pk):
+    """إرسال نتائج الاختبار: {"answers": {"question_id": selected_answer_index, ...}}"""
+    data = parse_body(request)
+    if data is None:
+        return json_response({'error': 'بيانات JSON غير صالحة'}, status=400)
+
+    if attempt_buffer.is_pending(pk):
+        await sync_to_async(attempt_buffer.flush)()
+
+    try:
+        attempt = await TestAttempt.objects.select_related('section').aget(pk=pk)
+    except TestAttempt.DoesNotExist:
+        return json_response({'error': 'المحاولة غير موجودة'}, status=404)
+
+    if attempt.completed_at:
+        return json_response({'error': 'تم إكمال هذا الاختبار مسبقاً'}, status=400)
+
+    submission_serializer = TestSubmissionSerializer(data=data)
+    if not submission_serializer.is_valid():
+        return json_response(submission_serializer.errors, status=400)
+
+    selected_answers = parse_selected_answers(submission_serializer.validated_data['answers'])
+    error = invalid_answers_error(selected_answers, await question_pool.aget_state())
+    if error:
+        return json_response(error, status=400)
+    if not await sync_to_async(attempt.submit_answers)(selected_answers):
+        return json_response({'error': 'تم إكمال هذا الاختبار مسبقاً'}, status=400)
+
+    return json_response(await serialize_attempt(attempt))
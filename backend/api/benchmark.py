@@ -0,0 +1,305 @@
+"""
+قياس أداء نقاط النهاية الساخنة
+
+يُنشئ بيانات بحجم واقعي ثم يقيس زمن الاستجابة (النسب المئوية) وعدد
+الاستعلامات لكل نقطة نهاية، ويُخرج النتائج بصيغة JSON لمقارنتها بين
+الإصدارات. يعمل على SQLite أو PostgreSQL محلي دون خدمات خارجية.
+"""
+import json
+import platform
+import random
+import statistics
+import subprocess
+import time
+from datetime import timedelta
+
+import django
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection, close_old_connections
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from .exam_pool import generate_exam_ids
+from .models import Section, Question, TestAttempt, TestAnswer
+from .payload_cache import question_payload_cache
+from .question_pool import question_pool, FULL_TEST_DISTRIBUTION
+from .sampling import adaptive_sampler
+
+BATCH_SIZE = 5000
+
+
+def seed_dataset(questions=5000, attempts=20000, answers_per_attempt=65, seed=0, stdout=print):
+    """إنشاء بنك أسئلة موزع حسب الاختبار الكامل مع محاولات وإجابات"""
+    rng = random.Random(seed)
+    total_weight = sum(FULL_TEST_DISTRIBUTION.values())
+
+    question_ids = []
+    for order, (section_id, weight) in enumerate(FULL_TEST_DISTRIBUTION.items()):
+        section = Section.objects.create(
+            section_id=section_id,
+            name_ar=section_id,
+            description_ar='',
+            order=order
+        )
+        count = max(weight, questions * weight // total_weight)
+        created = Question.objects.bulk_create([
+            Question(
+                section=section,
+                question_id=f'B{order}{q:07d}',
+                text_ar=f'سؤال تجريبي رقم {q} في القسم {section_id}',
+                options_ar=['الخيار الأول', 'الخيار الثاني', 'الخيار الثالث', 'الخيار الرابع'],
+                correct_answer=rng.randrange(4),
+                explanation_ar='شرح الإجابة الصحيحة',
+                difficulty=rng.choice(['easy', 'medium', 'hard'])
+            )
+            for q in range(count)
+        ], batch_size=BATCH_SIZE)
+        question_ids.extend(question.pk for question in created)
+    stdout(f'   الأسئلة: {len(question_ids)}')
+
+    correct_answers = dict(Question.objects.values_list('id', 'correct_answer'))
+    now = timezone.now()
+    answers_per_attempt = min(answers_per_attempt, len(question_ids))
+
+    created_attempts = 0
+    created_answers = 0
+    while created_attempts < attempts:
+        size = min(BATCH_SIZE // max(answers_per_attempt, 1) or 1, attempts - created_attempts)
+        batch = []
+        for i in range(size):
+            started_at = now - timedelta(minutes=created_attempts + i)
+            batch.append(TestAttempt(
+                test_type='full',
+                started_at=started_at,
+                completed_at=started_at + timedelta(minutes=rng.randint(10, 50)),
+                total_questions=65,
+                answered_questions=answers_per_attempt,
+            ))
+        batch = TestAttempt.objects.bulk_create(batch)
+
+        answers = []
+        for attempt in batch:
+            correct = 0
+            for question_id in rng.sample(question_ids, answers_per_attempt):
+                selected = rng.randrange(4)
+                is_correct = selected == correct_answers[question_id]
+                correct += is_correct
+                answers.append(TestAnswer(
+                    attempt=attempt,
+                    question_id=question_id,
+                    selected_answer=selected,
+                    is_correct=is_correct,
+                    time_spent_seconds=rng.randint(3, 90)
+                ))
+            attempt.correct_answers = correct
+            attempt.score_percentage = correct / 65 * 100
+            attempt.passed = correct >= 52
+        TestAnswer.objects.bulk_create(answers, batch_size=BATCH_SIZE)
+        TestAttempt.objects.bulk_update(
+            batch,
+            ['correct_answers', 'score_percentage', 'passed'],
+            batch_size=BATCH_SIZE
+        )
+
+        created_attempts += len(batch)
+        created_answers += len(answers)
+
+    stdout(f'   المحاولات: {created_attempts}، الإجابات: {created_answers}')
+    call_command('rebuild_attempt_statistics', stdout=_NullWriter())
+    call_command('rebuild_question_statistics', stdout=_NullWriter())
+
+    return {
+        'questions': len(question_ids),
+        'attempts': created_attempts,
+        'answers': created_answers,
+    }
+
+
+class _NullWriter:
+    def write(self, *args, **kwargs):
+        pass
+
+    def flush(self):
+        pass
+
+
+def percentile(values, pct):
+    """النسبة المئوية بطريقة الرتبة الأقرب"""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def summarize(timings, query_counts=None):
+    timings_ms = [t * 1000 for t in timings]
+    summary = {
+        'requests': len(timings_ms),
+        'latency_ms': {
+            'min': round(min(timings_ms), 3),
+            'mean': round(statistics.fmean(timings_ms), 3),
+            'p50': round(percentile(timings_ms, 50), 3),
+            'p90': round(percentile(timings_ms, 90), 3),
+            'p99': round(percentile(timings_ms, 99), 3),
+            'max': round(max(timings_ms), 3),
+        },
+    }
+    if query_counts is not None:
+        summary['queries'] = {
+            'mean': round(statistics.fmean(query_counts), 2),
+            'max': max(query_counts),
+        }
+    return summary
+
+
+class Benchmark:
+    """تشغيل سيناريوهات القياس على نقاط النهاية"""
+
+    def __init__(self, iterations=50, warmup=5):
+        self.iterations = iterations
+        self.warmup = warmup
+        self.client = Client()
+
+    def post_json(self, url, data=None):
+        return self.client.post(url, json.dumps(data or {}), content_type='application/json')
+
+    def measure(self, scenario):
+        """قياس سيناريو: (دالة تحضير غير محسوبة أو None، دالة الطلب)"""
+        for _ in range(self.warmup):
+            self._run(scenario)
+
+        timings = []
+        query_counts = []
+        for _ in range(self.iterations):
+            elapsed, queries = self._run(scenario)
+            timings.append(elapsed)
+            query_counts.append(queries)
+        return summarize(timings, query_counts)
+
+    def _run(self, scenario):
+        setup, call = scenario
+        args = setup() if setup else ()
+        with CaptureQueriesContext(connection) as ctx:
+            started = time.perf_counter()
+            response = call(*args)
+            elapsed = time.perf_counter() - started
+        if response.status_code >= 400:
+            raise RuntimeError(f'{response.status_code}: {response.content[:200]!r}')
+        return elapsed, len(ctx)
+
+    def scenarios(self):
+        """السيناريوهات المقاسة"""
+        attempt_data, answers = self.exam()
+
+        def get(url):
+            return None, lambda: self.client.get(url)
+
+        def create_attempt():
+            return (self.post_json('/api/attempts/', attempt_data).json()['id'],)
+
+        def submit(attempt_id):
+            return self.post_json(f'/api/attempts/{attempt_id}/submit/', {'answers': answers})
+
+        return {
+            'random_full_test': get('/api/questions/random_full_test/'),
+            'by_section': get('/api/questions/by_section/?section_id=environment'),
+            'by_section_random': get('/api/questions/by_section/?section_id=traffic_rules&random=20'),
+            'weak_areas': get('/api/questions/weak_areas/?section_id=traffic_rules&count=20'),
+            'attempts_create': (None, lambda: self.post_json('/api/attempts/', attempt_data)),
+            'attempts_submit': (create_attempt, submit),
+            'attempts_list': get('/api/attempts/'),
+            'attempts_statistics': get('/api/attempts/statistics/'),
+            'attempts_statistics_30_days': get('/api/attempts/statistics/?days=30'),
+            'section_statistics': get('/api/sections/traffic_rules/statistics/'),
+            'sections_statistics': get('/api/sections/statistics/'),
+        }
+
+    def exam(self):
+        """بيانات إنشاء محاولة بأسئلة ثابتة (حسب توزيع الاختبار) وإجابات إرسالها"""
+        question_ids = generate_exam_ids(random.Random(0))
+        attempt_data = {'test_type': 'full', 'question_ids': question_ids}
+        return attempt_data, {str(pk): 0 for pk in question_ids}
+
+    def connection_profiles(self, requests=200):
+        """
+        إنتاجية submit مع اتصال جديد لكل طلب مقابل الاتصالات الدائمة
+        يحاكي خادم WSGI بإغلاق الاتصالات المنتهية قبل كل طلب وبعده
+        """
+        attempt_data, answers = self.exam()
+        profiles = {
+            'conn_max_age=0': (0, False),
+            'conn_max_age=600': (600, False),
+            'conn_max_age=600+health_checks': (600, True),
+        }
+        settings_dict = connection.settings_dict
+        original = (settings_dict['CONN_MAX_AGE'], settings_dict['CONN_HEALTH_CHECKS'])
+
+        results = {}
+        try:
+            for name, (max_age, health_checks) in profiles.items():
+                attempt_ids = [
+                    self.post_json('/api/attempts/', attempt_data).json()['id']
+                    for _ in range(requests)
+                ]
+                settings_dict['CONN_MAX_AGE'] = max_age
+                settings_dict['CONN_HEALTH_CHECKS'] = health_checks
+                # عمر الاتصال يُحسب عند فتحه، لذلك نبدأ باتصال جديد لكل إعداد
+                connection.close()
+
+                timings = []
+                started = time.perf_counter()
+                for attempt_id in attempt_ids:
+                    request_started = time.perf_counter()
+                    close_old_connections()
+                    response = self.post_json(f'/api/attempts/{attempt_id}/submit/', {'answers': answers})
+                    close_old_connections()
+                    timings.append(time.perf_counter() - request_started)
+                    if response.status_code >= 400:
+                        raise RuntimeError(f'{response.status_code}: {response.content[:200]!r}')
+                elapsed = time.perf_counter() - started
+
+                results[name] = {
+                    'requests_per_second': round(requests / elapsed, 1),
+                    **summarize(timings),
+                }
+        finally:
+            settings_dict['CONN_MAX_AGE'], settings_dict['CONN_HEALTH_CHECKS'] = original
+            connection.close()
+        return results
+
+    def run(self, only=None):
+        results = {}
+        for name, scenario in self.scenarios().items():
+            if only and name not in only:
+                continue
+            results[name] = self.measure(scenario)
+        return results
+
+
+def reset_caches():
+    cache.clear()
+    question_pool.invalidate()
+    adaptive_sampler.invalidate()
+    question_payload_cache.clear()
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            stderr=subprocess.DEVNULL,
+            text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment_info():
+    return {
+        'revision': git_revision(),
+        'timestamp': timezone.now().isoformat(),
+        'database': connection.vendor,
+        'python': platform.python_version(),
+        'django': django.get_version(),
+    }
@@ -0,0 +1,56 @@
+"""
+ضغط الاستجابات
+
+GZipMiddleware من Django مع دعم Brotli: إذا كانت مكتبة brotli مثبتة
+وأرسل العميل br في Accept-Encoding تُضغط الاستجابة بـ brotli، وإلا بـ gzip.
+أجسام الأسئلة (نصوص وخيارات متكررة) تتقلص بأكثر من 3 أضعاف.
+
+- RESPONSE_BROTLI_QUALITY: مستوى ضغط brotli (0-11، الافتراضي 5)
+"""
+import re
+
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+re_accepts_brotli = re.compile(r'\bbr\b')
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """ضغط الاستجابات بـ brotli عند توفره وقبول العميل له، وإلا gzip"""
+
+    def process_response(self, request, response):
+        # الملفات المضغوطة مسبقاً (مثل التصدير بـ gzip)
+        if response.get('Content-Type', '').startswith('application/gzip'):
+            return response
+        if brotli is None or not re_accepts_brotli.search(request.META.get('HTTP_ACCEPT_ENCODING', '')):
+            return super().process_response(request, response)
+
+        # الاستجابات المتدفقة تُضغط بـ gzip
+        if response.streaming:
+            return super().process_response(request, response)
+        if len(response.content) < 200 or response.has_header('Content-Encoding'):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        compressed = brotli.compress(
+            response.content,
+            quality=getattr(settings, 'RESPONSE_BROTLI_QUALITY', 5)
+        )
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response.headers['Content-Length'] = str(len(compressed))
+        # ETag القوي لا يصلح بعد تغيير الجسم
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = 'br'
+        return response
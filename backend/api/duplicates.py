@@ -0,0 +1,214 @@
+"""
+كشف الأسئلة شبه المكررة (MinHash + LSH)
+
+كل سؤال يُمثَّل بمجموعة أزواج كلمات متتالية (shingles) من نصه وخياراته
+بعد التطبيع (normalization.py)، والخيارات مرتبة فلا يؤثر ترتيبها.
+التشابه المقدّر هو تشابه Jaccard بين المجموعتين.
+
+- توقيع MinHash بتجزئة واحدة (one permutation hashing): قيمة التجزئة
+  تُوزع على NUM_PERM خانة ويُحفظ أصغرها في كل خانة، والخانات الفارغة
+  تُملأ من الخانة التالية (densification)، فالكلفة خطية في عدد الكلمات
+- LSH: التوقيع يُقسم إلى شرائح (bands)، والأسئلة التي تتطابق في شريحة
+  واحدة على الأقل هي فقط التي تُقارن، فلا تُقارن كل الأزواج
+- كل مقارنة تُتحقق بنسبة الخانات المتطابقة، والأزواج المتشابهة تُجمع في
+  مجموعات (union-find)
+
+لا يعتمد على Django، فيمكن استخدامه على ملف قبل الاستيراد (check.py).
+"""
+import zlib
+from array import array
+
+from .normalization import TOKEN_RE, normalize_text
+
+
+DEFAULT_THRESHOLD = 0.8
+NUM_PERM = 64
+SHINGLE_SIZE = 2
+
+HASH_BITS = 32
+HASH_MIX = 0x9E3779B1
+HASH_MASK = (1 << HASH_BITS) - 1
+
+
+def shingles(text, options=(), size=SHINGLE_SIZE):
+    """
+    تجزئات أزواج الكلمات المتتالية للنص ولكل خيار على حدة
+    (الجزء الأقصر من size يُستخدم كاملاً)
+    """
+    # تطبيع النص والخيارات باستدعاء واحد ثم تقسيمها
+    lines = normalize_text('\n'.join([text or '', *(option for option in options or () if option)])).split('\n')
+    segments = [TOKEN_RE.findall(lines[0])] + sorted(TOKEN_RE.findall(line) for line in lines[1:])
+    hashes = set()
+    for tokens in segments:
+        if not tokens:
+            continue
+        if len(tokens) < size:
+            grams = [' '.join(tokens)]
+        else:
+            grams = [' '.join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)]
+        hashes.update((zlib.crc32(gram.encode('utf-8')) * HASH_MIX) & HASH_MASK for gram in grams)
+    return hashes
+
+
+def choose_bands(num_perm, threshold):
+    """
+    (عدد الشرائح، عدد الخانات في كل شريحة) بحيث يكون حد الترشيح
+    (1/b)^(1/r) أقرب قيمة لا تتجاوز threshold (تقليل الأزواج المفقودة)
+    """
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        if (1 / bands) ** (1 / rows) <= threshold:
+            best = (bands, rows)
+    return best
+
+
+class DuplicateCluster:
+    """مجموعة أسئلة متشابهة: المفاتيح وأقل تشابه بين الأزواج التي جمعتها"""
+
+    __slots__ = ('keys', 'similarity')
+
+    def __init__(self, keys, similarity):
+        self.keys = keys
+        self.similarity = similarity
+
+    def __len__(self):
+        return len(self.keys)
+
+    def as_dict(self):
+        return {'keys': self.keys, 'similarity': round(self.similarity, 3)}
+
+
+class DuplicateDetector:
+    """
+    كشف تدريجي: add لكل سؤال ثم clusters للمجموعات
+    num_perm يجب أن يكون قوة للعدد 2
+    """
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD, num_perm=NUM_PERM, shingle_size=SHINGLE_SIZE):
+        if num_perm < 2 or num_perm & (num_perm - 1):
+            raise ValueError('num_perm يجب أن يكون قوة للعدد 2')
+        if not 0 < threshold <= 1:
+            raise ValueError('حد التشابه يجب أن يكون بين 0 و 1')
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.bands, self.rows = choose_bands(num_perm, threshold)
+        self._bin_shift = HASH_BITS - (num_perm.bit_length() - 1)
+        self._value_mask = (1 << self._bin_shift) - 1
+        self.keys = []
+        self.signatures = []
+        # شريحة -> موضع (أو قائمة مواضع) الأسئلة الممثِّلة لها
+        self._buckets = {}
+        self._parents = []
+        self._similarity = {}
+
+    def __len__(self):
+        return len(self.keys)
+
+    def signature(self, hashes):
+        """توقيع MinHash بتجزئة واحدة مع ملء الخانات الفارغة"""
+        shift = self._bin_shift
+        mask = self._value_mask
+        # ترتيب تنازلي: آخر قيمة تُكتب في كل خانة هي أصغرها
+        bins = {h >> shift: h & mask for h in sorted(hashes, reverse=True)}
+
+        # الخانة الفارغة تأخذ قيمة أقرب خانة ممتلئة بعدها مع إزاحة بحسب المسافة
+        # (rotation densification) فتبقى التواقيع قابلة للمقارنة خانة بخانة
+        size = self.num_perm
+        signature = array('Q', bytes(8 * size))
+        start = nearest = max(bins)
+        for step in range(size):
+            slot = (start - step) % size
+            value = bins.get(slot)
+            if value is None:
+                signature[slot] = bins[nearest] + ((nearest - slot) % size) * (mask + 1)
+            else:
+                signature[slot] = value
+                nearest = slot
+        return signature
+
+    def similarity(self, first, second):
+        """تشابه Jaccard المقدّر بين سؤالين (بموضعيهما)"""
+        a = self.signatures[first]
+        b = self.signatures[second]
+        return sum(x == y for x, y in zip(a, b)) / self.num_perm
+
+    def add(self, key, text, options=()):
+        """إضافة سؤال ومقارنته بالأسئلة المرشحة فقط، وإرجاع False إن كان بلا نص"""
+        hashes = shingles(text, options, self.shingle_size)
+        if not hashes:
+            return False
+
+        doc = len(self.keys)
+        signature = self.signature(hashes)
+        self.keys.append(key)
+        self.signatures.append(signature)
+        self._parents.append(doc)
+
+        compared = set()
+        rows = self.rows
+        for band in range(self.bands):
+            bucket = hash((band, *signature[band * rows:(band + 1) * rows]))
+            leaders = self._buckets.get(bucket)
+            if leaders is None:
+                self._buckets[bucket] = doc
+                continue
+            if isinstance(leaders, int):
+                leaders = self._buckets[bucket] = [leaders]
+
+            matched = False
+            for leader in leaders:
+                if leader in compared:
+                    matched = matched or self._find(leader) == self._find(doc)
+                    continue
+                compared.add(leader)
+                similarity = self.similarity(doc, leader)
+                if similarity >= self.threshold:
+                    self._union(doc, leader, similarity)
+                    matched = True
+            if not matched:
+                leaders.append(doc)
+        return True
+
+    def _find(self, doc):
+        parents = self._parents
+        while parents[doc] != doc:
+            parents[doc] = parents[parents[doc]]
+            doc = parents[doc]
+        return doc
+
+    def _union(self, first, second, similarity):
+        first = self._find(first)
+        second = self._find(second)
+        lowest = min(
+            similarity,
+            self._similarity.pop(first, 1.0),
+            self._similarity.get(second, 1.0)
+        )
+        if first != second:
+            self._parents[first] = second
+        self._similarity[second] = lowest
+
+    def clusters(self):
+        """مجموعات الأسئلة المتشابهة (الأكبر أولاً)"""
+        groups = {}
+        for doc in range(len(self.keys)):
+            groups.setdefault(self._find(doc), []).append(self.keys[doc])
+        clusters = [
+            DuplicateCluster(keys, self._similarity.get(root, 1.0))
+            for root, keys in groups.items()
+            if len(keys) > 1
+        ]
+        clusters.sort(key=lambda cluster: (-len(cluster), str(cluster.keys[0])))
+        return clusters
+
+
+def find_duplicates(records, threshold=DEFAULT_THRESHOLD, **kwargs):
+    """مجموعات الأسئلة المتشابهة من (المفتاح، النص، الخيارات)"""
+    detector = DuplicateDetector(threshold, **kwargs)
+    for key, text, options in records:
+        detector.add(key, text, options)
+    return detector.clusters()
@@ -0,0 +1,296 @@
+"""
+مجمّع اختبارات كاملة جاهزة مسبقاً
+
+يحتفظ في الذاكرة المؤقتة بطابور من استجابات random_full_test الجاهزة
+(JSON كامل بنفس التوزيع)، فيصبح بدء الاختبار زيادة عداد وقراءة واحدة.
+عند نزول عدد الاختبارات الجاهزة تحت الحد الأدنى يُعاد ملء الطابور في
+خيط خلفي داخل العملية، أو عبر الأمر refill_exam_pool دون أي طابور خارجي.
+
+الطابور مكوّن من عدادين (head و tail) وخانة لكل اختبار. كل اختبار يحمل
+رقم إصدار بنك الأسئلة الذي وُلّد منه، فتُهمل الاختبارات القديمة بعد
+تعديل الأسئلة ويُولّد الاختبار عند الطلب، ثم تُستبدل في إعادة الملء التالية.
+
+الإعدادات:
+- EXAM_POOL_SIZE: عدد الاختبارات الجاهزة المطلوب (0 يعطّل المجمّع)
+- EXAM_POOL_LOW_WATER: الحد الذي يبدأ عنده إعادة الملء (الافتراضي نصف الحجم)
+- EXAM_POOL_REFILL_THREAD: إعادة الملء في خيط خلفي عند الطلب
+- EXAM_POOL_CACHE_ALIAS: الذاكرة المؤقتة المستخدمة (مشتركة بين العمليات مع Redis)
+- EXAM_POOL_TIMEOUT: مدة صلاحية الاختبار الجاهز بالثواني
+"""
+import random
+import threading
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection
+
+from .payload_cache import question_payload_cache, render_with_fragments
+from .question_pool import question_pool, get_pool_version, aget_pool_version, FULL_TEST_DISTRIBUTION
+
+
+class ExamSnapshotError(ValueError):
+    """خطأ في تحديد أسئلة المحاولة"""
+
+
+def sample_section_ids(section_id, count, rng=random, index=None):
+    """الحصول على عدد محدد من معرفات الأسئلة العشوائية من قسم معين"""
+    if index is None:
+        index = question_pool.get_index()
+    if section_id not in index:
+        print(f"خطأ: القسم {section_id} غير موجود أو لا يحتوي على أسئلة نشطة")
+        return []
+
+    ids = index[section_id]
+    question_ids = list(ids) if len(ids) <= count else rng.sample(ids, count)
+
+    # إذا كان عدد الأسئلة المطلوبة أكبر من المتاح
+    if len(question_ids) < count:
+        print(f"تحذير: القسم {section_id} يحتوي على {len(question_ids)} سؤال فقط، مطلوب {count}")
+
+    return question_ids
+
+
+def generate_exam_ids(rng=random, index=None):
+    """
+    اختيار أسئلة اختبار كامل حسب التوزيع ثم خلطها
+    مع random.Random(seed) ونفس الفهرس تكون النتيجة نفسها دائماً
+    """
+    if index is None:
+        index = question_pool.get_index()
+    question_ids = []
+    for section_id, count in FULL_TEST_DISTRIBUTION.items():
+        question_ids.extend(sample_section_ids(section_id, count, rng, index))
+    rng.shuffle(question_ids)
+    return question_ids
+
+
+def expected_exam_counts(state):
+    """
+    عدد أسئلة كل قسم في اختبار كامل حسب الفهرس الحالي:
+    توزيع الاختبار الكامل (أو المتاح إن كان أقل)
+    """
+    return Counter({
+        section: min(count, len(state.index.get(section, ())))
+        for section, count in FULL_TEST_DISTRIBUTION.items()
+    })
+
+
+def build_exam_snapshot(state, test_type, section_id=None, question_ids=None, seed=None):
+    """
+    تحديد أسئلة المحاولة من حالة الفهرس وإرجاع (المعرفات، مفاتيح الإجابات، البذرة)
+    - question_ids: الأسئلة التي استلمها المستخدم. في الاختبار الكامل يجب أن يطابق
+      عددها من كل قسم expected_exam_counts لأن النجاح يُحسب من 52 إجابة صحيحة،
+      وفي اختبار القسم تكفي أي مجموعة من أسئلته (by_section?random و weak_areas)
+      لأن نسبة النجاح تُحسب من عدد أسئلة النسخة
+    - وإلا اختبار كامل مولّد من البذرة (عشوائية إن لم تُحدد) أو كل أسئلة القسم
+    """
+    if test_type == 'full':
+        allowed = state.answer_keys
+    else:
+        allowed = set(state.index.get(section_id, ()))
+
+    if question_ids is not None:
+        try:
+            ids = list(dict.fromkeys(int(pk) for pk in question_ids))
+        except (TypeError, ValueError):
+            raise ExamSnapshotError('معرفات الأسئلة غير صالحة')
+        if any(pk not in allowed for pk in ids):
+            raise ExamSnapshotError('بعض الأسئلة غير موجودة أو غير نشطة')
+        if test_type == 'full' and Counter(state.sections[pk] for pk in ids) != expected_exam_counts(state):
+            raise ExamSnapshotError('عدد الأسئلة لا يطابق توزيع الاختبار')
+        seed = None
+    elif test_type == 'full':
+        try:
+            seed = random.SystemRandom().getrandbits(63) if seed is None else int(seed)
+        except (TypeError, ValueError):
+            raise ExamSnapshotError('البذرة يجب أن تكون رقماً صحيحاً')
+        ids = generate_exam_ids(random.Random(seed), state.index)
+    else:
+        ids = list(state.index.get(section_id, ()))
+        seed = None
+
+    if not ids:
+        raise ExamSnapshotError('لا توجد أسئلة متاحة')
+
+    return ids, [state.answer_keys[pk] for pk in ids], seed
+
+
+def render_exam(question_ids):
+    """استجابة random_full_test الكاملة بصيغة JSON"""
+    fragments = question_payload_cache.render(question_ids)
+    return render_with_fragments({
+        'total': len(fragments),
+        'distribution': FULL_TEST_DISTRIBUTION,
+    }, 'questions', fragments)
+
+
+class ExamPool:
+    """طابور اختبارات جاهزة في الذاكرة المؤقتة"""
+
+    key_prefix = 'exam-pool'
+
+    def __init__(self):
+        self._refill_lock = threading.Lock()
+        self._refill_thread = None
+
+    @property
+    def size(self):
+        return getattr(settings, 'EXAM_POOL_SIZE', 0)
+
+    @property
+    def low_water(self):
+        low_water = getattr(settings, 'EXAM_POOL_LOW_WATER', None)
+        return self.size // 2 if low_water is None else low_water
+
+    @property
+    def cache(self):
+        return caches[getattr(settings, 'EXAM_POOL_CACHE_ALIAS', 'default')]
+
+    @property
+    def timeout(self):
+        return getattr(settings, 'EXAM_POOL_TIMEOUT', 60 * 60)
+
+    @property
+    def head_key(self):
+        return f'{self.key_prefix}:head'
+
+    @property
+    def tail_key(self):
+        return f'{self.key_prefix}:tail'
+
+    def _slot_key(self, slot):
+        return f'{self.key_prefix}:slot:{slot}'
+
+    def _incr(self, cache, key):
+        try:
+            return cache.incr(key)
+        except ValueError:
+            cache.add(key, 0, timeout=None)
+            return cache.incr(key)
+
+    async def _aincr(self, cache, key):
+        try:
+            return await cache.aincr(key)
+        except ValueError:
+            await cache.aadd(key, 0, timeout=None)
+            return await cache.aincr(key)
+
+    def _take(self, slot, values, current_version):
+        """استخراج الاختبار من القيم المقروءة وإرجاع (الاختبار أو None، العدد المتبقي)"""
+        remaining = (values.get(self.tail_key) or 0) - slot
+        item = values.get(self._slot_key(slot))
+        if item is None:
+            return None, remaining
+        version, body = item
+        if version != current_version:
+            return None, remaining
+        return body, remaining
+
+    def pop(self):
+        """سحب اختبار جاهز (أو None إذا كان المجمّع معطلاً أو فارغاً)"""
+        if self.size <= 0:
+            return None
+        cache = self.cache
+        slot = self._incr(cache, self.head_key)
+        values = cache.get_many([self._slot_key(slot), self.tail_key])
+        body, remaining = self._take(slot, values, get_pool_version())
+        # خانة قديمة أو منتهية تعني أن ما بعدها غالباً مثلها، فلا يُعتمد على العدد المتبقي
+        if body is None or remaining < self.low_water:
+            self.request_refill()
+        return body
+
+    async def apop(self):
+        """النسخة غير المتزامنة من pop"""
+        if self.size <= 0:
+            return None
+        cache = self.cache
+        slot = await self._aincr(cache, self.head_key)
+        values = await cache.aget_many([self._slot_key(slot), self.tail_key])
+        body, remaining = self._take(slot, values, await aget_pool_version())
+        if body is None or remaining < self.low_water:
+            self.request_refill()
+        return body
+
+    def available(self):
+        """عدد الاختبارات الجاهزة (تقريبي)"""
+        values = self.cache.get_many([self.head_key, self.tail_key])
+        return max(0, (values.get(self.tail_key) or 0) - (values.get(self.head_key) or 0))
+
+    def refill(self, rng=random):
+        """ملء المجمّع حتى الحجم المطلوب وإرجاع عدد الاختبارات المضافة أو المستبدلة"""
+        if self.size <= 0:
+            return 0
+        cache = self.cache
+        lock_key = f'{self.key_prefix}:refill-lock'
+        if not cache.add(lock_key, 1, timeout=60):
+            # عملية أخرى تعيد الملء حالياً
+            return 0
+
+        added = 0
+        try:
+            values = cache.get_many([self.head_key, self.tail_key])
+            head = values.get(self.head_key) or 0
+            tail = max(values.get(self.tail_key) or 0, head)
+            version = get_pool_version()
+
+            # الخانات القديمة (إصدار سابق أو منتهية الصلاحية) تُستبدل في مكانها
+            # بدل الإضافة خلفها، وإلا حُسبت ضمن المتبقي وسُحب منها None
+            current = cache.get_many([self._slot_key(slot) for slot in range(head + 1, tail + 1)])
+            for slot in range(head + 1, tail + 1):
+                item = current.get(self._slot_key(slot))
+                if item is not None and item[0] == version:
+                    continue
+                if slot <= (cache.get(self.head_key) or head):
+                    # سُحبت الخانة أثناء إعادة الملء
+                    continue
+                body = render_exam(generate_exam_ids(rng))
+                cache.set(self._slot_key(slot), (version, body), timeout=self.timeout)
+                added += 1
+
+            head = cache.get(self.head_key) or head
+            while tail - head < self.size:
+                tail = max(tail, head) + 1
+                # الخانة تُكتب قبل تحريك tail حتى لا يقرأها أحد وهي فارغة
+                body = render_exam(generate_exam_ids(rng))
+                cache.set(self._slot_key(tail), (version, body), timeout=self.timeout)
+                cache.set(self.tail_key, tail, timeout=None)
+                added += 1
+                head = cache.get(self.head_key) or head
+        finally:
+            cache.delete(lock_key)
+        return added
+
+    def request_refill(self):
+        """بدء إعادة الملء في خيط خلفي (مرة واحدة في نفس الوقت)"""
+        if not getattr(settings, 'EXAM_POOL_REFILL_THREAD', True):
+            return
+        with self._refill_lock:
+            if self._refill_thread is not None and self._refill_thread.is_alive():
+                return
+            self._refill_thread = threading.Thread(
+                target=self._refill_in_thread,
+                name='exam-pool-refill',
+                daemon=True
+            )
+            self._refill_thread.start()
+
+    def _refill_in_thread(self):
+        try:
+            self.refill()
+        except Exception as e:
+            print(f"خطأ في إعادة ملء مجمّع الاختبارات: {e}")
+        finally:
+            connection.close()
+
+    def clear(self):
+        """تفريغ المجمّع"""
+        cache = self.cache
+        values = cache.get_many([self.head_key, self.tail_key])
+        head = values.get(self.head_key) or 0
+        tail = values.get(self.tail_key) or 0
+        cache.delete_many([self._slot_key(slot) for slot in range(head + 1, tail + 1)])
+        cache.delete_many([self.head_key, self.tail_key])
+
+
+exam_pool = ExamPool()
@@ -0,0 +1,197 @@
+"""
+تصدير المحاولات والإجابات بتدفق (CSV أو JSONL، مع gzip اختياري)
+
+الصفوف تُقرأ بمؤشر من جهة الخادم (iterator(chunk_size)) وتُكتب سطراً
+سطراً، فلا يتجاوز استهلاك الذاكرة حجم دفعة واحدة مهما كان عدد الصفوف.
+يُستخدم من نقطة النهاية attempts/export/ ومن الأمر export_attempts.
+عنوان IP ومعلومات المتصفح لا تُصدّر.
+
+المحاولات المنقولة إلى الأرشيف (archive_attempts) لا تُصدّر إلا مع
+include_archived، وتأتي بعد المحاولات الحالية. إجاباتها لا تحمل معرفاً ولا
+وقت إجابة، لذلك تُفلتر حسب وقت إنهاء المحاولة بدلاً من answered_at.
+"""
+import csv
+import json
+import zlib
+from datetime import datetime, time, timedelta
+from itertools import chain
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from .archive import iter_archived_attempt_answers
+from .models import Question, TestAttempt, TestAnswer, ArchivedAttempt
+
+
+EXPORT_KINDS = ('attempts', 'answers')
+EXPORT_FORMATS = ('csv', 'jsonl')
+CHUNK_SIZE = 2000
+
+EXPORT_COLUMNS = {
+    'attempts': [
+        'id',
+        'test_type',
+        'section__section_id',
+        'with_timer',
+        'started_at',
+        'completed_at',
+        'total_questions',
+        'answered_questions',
+        'correct_answers',
+        'score_percentage',
+        'passed',
+        'time_taken_seconds',
+        'exam_seed',
+    ],
+    'answers': [
+        'id',
+        'attempt_id',
+        'question_id',
+        'question__question_id',
+        'question__section__section_id',
+        'selected_answer',
+        'is_correct',
+        'answered_at',
+        'time_spent_seconds',
+    ],
+}
+
+
+class ExportError(ValueError):
+    """معاملات تصدير غير صالحة"""
+
+
+def parse_day(value, name):
+    """تحويل YYYY-MM-DD إلى بداية اليوم بالتوقيت المحلي"""
+    if not value:
+        return None
+    try:
+        day = parse_date(value)
+    except ValueError:
+        day = None
+    if day is None:
+        raise ExportError(f'التاريخ {name} غير صالح (YYYY-MM-DD)')
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def _filter_rows(queryset, date_field, section_field, since, until, section_id):
+    if since:
+        queryset = queryset.filter(**{f'{date_field}__gte': since})
+    if until:
+        queryset = queryset.filter(**{f'{date_field}__lt': until + timedelta(days=1)})
+    if section_id and section_field:
+        queryset = queryset.filter(**{section_field: section_id})
+    return queryset
+
+
+def export_queryset(kind, since=None, until=None, section_id=None):
+    """
+    الاستعلام المطلوب تصديره
+    - المحاولات حسب وقت البدء وقسم الاختبار
+    - الإجابات حسب وقت الإجابة وقسم السؤال
+    - until يشمل اليوم نفسه
+    """
+    if kind not in EXPORT_KINDS:
+        raise ExportError(f"نوع التصدير غير مدعوم، المتاح: {', '.join(EXPORT_KINDS)}")
+    since = parse_day(since, 'since')
+    until = parse_day(until, 'until')
+
+    if kind == 'attempts':
+        queryset = TestAttempt.objects.all()
+        date_field = 'started_at'
+        section_field = 'section__section_id'
+    else:
+        queryset = TestAnswer.objects.all()
+        date_field = 'answered_at'
+        section_field = 'question__section__section_id'
+
+    queryset = _filter_rows(queryset, date_field, section_field, since, until, section_id)
+    return queryset.order_by('pk').values_list(*EXPORT_COLUMNS[kind])
+
+
+def archived_rows(kind, since=None, until=None, section_id=None):
+    """صفوف المحاولات المؤرشفة أو إجاباتها بنفس أعمدة EXPORT_COLUMNS"""
+    if kind not in EXPORT_KINDS:
+        raise ExportError(f"نوع التصدير غير مدعوم، المتاح: {', '.join(EXPORT_KINDS)}")
+    since = parse_day(since, 'since')
+    until = parse_day(until, 'until')
+
+    if kind == 'attempts':
+        queryset = _filter_rows(
+            ArchivedAttempt.objects.all(), 'started_at', 'section__section_id', since, until, section_id
+        )
+        return queryset.order_by('pk').values_list(*EXPORT_COLUMNS[kind]).iterator(chunk_size=CHUNK_SIZE)
+
+    queryset = _filter_rows(ArchivedAttempt.objects.all(), 'completed_at', None, since, until, None)
+    return _iter_archived_answer_rows(queryset.order_by('pk'), section_id)
+
+
+def _iter_archived_answer_rows(queryset, section_id):
+    questions = {
+        pk: (question_id, section)
+        for pk, question_id, section in Question.objects.values_list('id', 'question_id', 'section__section_id')
+    }
+    for attempt_id, question_id, selected, is_correct, seconds in iter_archived_attempt_answers(queryset):
+        code, section = questions.get(question_id, (None, None))
+        if section_id and section != section_id:
+            continue
+        yield None, attempt_id, question_id, code, section, selected, is_correct, None, seconds
+
+
+def _header(column):
+    return column.replace('__', '_')
+
+
+class _Echo:
+    """ملف وهمي يعيد ما يُكتب فيه (لاستخدام csv.writer دون تخزين)"""
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(kind, rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow([_header(column) for column in EXPORT_COLUMNS[kind]])
+    for row in rows:
+        yield writer.writerow(['' if value is None else value for value in row])
+
+
+def iter_jsonl(kind, rows):
+    columns = [_header(column) for column in EXPORT_COLUMNS[kind]]
+    for row in rows:
+        yield json.dumps(dict(zip(columns, row)), ensure_ascii=False, default=str) + '\n'
+
+
+def gzip_stream(chunks, level=6):
+    """ضغط تدفق نصي بـ gzip دون تجميعه"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode('utf-8'))
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def iter_export(kind, export_format='csv', compress=False, since=None, until=None, section_id=None,
+                include_archived=False):
+    """تدفق ملف التصدير (بايتات) بعد التحقق من المعاملات"""
+    if export_format not in EXPORT_FORMATS:
+        raise ExportError(f"الصيغة غير مدعومة، المتاح: {', '.join(EXPORT_FORMATS)}")
+    rows = export_queryset(kind, since, until, section_id).iterator(chunk_size=CHUNK_SIZE)
+    if include_archived:
+        rows = chain(rows, archived_rows(kind, since, until, section_id))
+    lines = (iter_csv if export_format == 'csv' else iter_jsonl)(kind, rows)
+    if compress:
+        return gzip_stream(lines)
+    return (line.encode('utf-8') for line in lines)
+
+
+def export_filename(kind, export_format, compress=False):
+    name = f'{kind}-{timezone.localdate():%Y%m%d}.{export_format}'
+    return name + '.gz' if compress else name
+
+
+def export_content_type(export_format, compress=False):
+    if compress:
+        return 'application/gzip'
+    return 'text/csv; charset=utf-8' if export_format == 'csv' else 'application/x-ndjson; charset=utf-8'
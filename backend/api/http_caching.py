@@ -0,0 +1,73 @@
+"""
+التخزين المؤقت عبر HTTP لنقاط نهاية المحتوى الثابت (الأقسام والأسئلة)
+
+المحتوى لا يتغير إلا عند تعديل سؤال أو قسم أو تشغيل الاستيراد، وكلها
+ترفع رقم إصدار بنك الأسئلة (صف QuestionBankVersion في قاعدة البيانات).
+لذلك تُشتق ترويسات ETag و Last-Modified من هذا الإصدار، ويُرد على الطلبات
+الشرطية (If-None-Match / If-Modified-Since) بـ 304 بعد المصادقة والتحقق من
+معاملات الطلب (initial) وقبل تنفيذ أي استعلام أو تحويل.
+"""
+from django.conf import settings
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+from .question_pool import get_pool_validators
+
+
+class NotModified(Exception):
+    """إنهاء الطلب باستجابة 304 جاهزة"""
+
+    def __init__(self, response):
+        super().__init__()
+        self.response = response
+
+
+class BankVersionCacheMixin:
+    """
+    خلط لواجهات DRF: ETag و Last-Modified و Cache-Control حسب إصدار بنك الأسئلة
+    - conditional_actions: الإجراءات التي تعتمد نتيجتها على بنك الأسئلة فقط
+    - validate_query: التحقق من معاملات الطلب، فالطلب غير الصالح يأخذ 400 لا 304
+    """
+    conditional_actions = ('list', 'retrieve')
+    bank_validators = None
+
+    def is_conditional(self, request, action):
+        return request.method in ('GET', 'HEAD') and action in self.conditional_actions
+
+    def validate_query(self, request):
+        """التحقق من معاملات الطلب قبل الرد الشرطي (للواجهات التي تحتاجه)"""
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.validate_query(request)
+        if not self.is_conditional(request, self.action):
+            return
+
+        version, modified = get_pool_validators()
+        self.bank_validators = (quote_etag(str(version)), modified)
+        response = get_conditional_response(request, etag=self.bank_validators[0], last_modified=modified)
+        if response is not None:
+            raise NotModified(response)
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return exc.response
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if self.bank_validators is None or response.status_code not in (200, 304):
+            return response
+
+        etag, modified = self.bank_validators
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(modified)
+        patch_cache_control(
+            response,
+            public=True,
+            max_age=getattr(settings, 'QUESTION_BANK_CACHE_MAX_AGE', 0),
+            must_revalidate=True
+        )
+        # نفس الرابط قد يُعرض كـ JSON أو كواجهة DRF القابلة للتصفح
+        patch_vary_headers(response, ['Accept'])
+        return response
@@ -0,0 +1,343 @@
+"""
+استيراد بنك الأسئلة من ملفات JSON
+
+يدعم صيغتين:
+- الصيغة المتداخلة: {"swedish_driving_theory_test": {"sections": {...}}}
+- القائمة المسطحة: [{"question_id": "VKM001", ...}, ...] حيث يُستنتج القسم
+  من بادئة معرف السؤال (أو من الحقل section_id إن وجد)
+
+القائمة المسطحة تُقرأ تدريجياً عنصراً عنصراً دون تحميل الملف كاملاً.
+يتم حساب بصمة لمحتوى كل سؤال ومقارنتها بالصفوف الموجودة، ثم تطبيق
+الفروقات فقط عبر bulk_create و bulk_update على دفعات.
+
+الأسئلة شبه المكررة (duplicates.py) يمكن فحصها في الملف قبل الاستيراد
+(file_duplicates) أو في البنك كاملاً بعده (bank_duplicates).
+"""
+import hashlib
+import json
+
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .duplicates import DEFAULT_THRESHOLD, find_duplicates
+from .models import Section, Question
+from .normalization import SEARCH_SOURCE_FIELDS, build_search_text
+from .question_pool import bump_pool_version
+
+
+# ترتيب الأقسام
+SECTION_ORDER = {
+    'vehicle_knowledge_and_manoeuvring': 1,
+    'environment': 2,
+    'traffic_safety': 3,
+    'traffic_rules': 4,
+    'personal_conditions': 5
+}
+
+# الألوان للأقسام
+SECTION_COLORS = {
+    'vehicle_knowledge_and_manoeuvring': 'bg-purple-500',
+    'environment': 'bg-yellow-500',
+    'traffic_safety': 'bg-blue-500',
+    'traffic_rules': 'bg-green-500',
+    'personal_conditions': 'bg-red-500'
+}
+
+# بادئات معرفات الأسئلة في القائمة المسطحة
+QUESTION_ID_PREFIXES = {
+    'VKM': 'vehicle_knowledge_and_manoeuvring',
+    'ENV': 'environment',
+    'SAF': 'traffic_safety',
+    'TRF': 'traffic_rules',
+    'IND': 'personal_conditions'
+}
+
+# الحقول التي يكتبها الاستيراد (ومنها تُحسب بصمة المحتوى)
+IMPORTED_FIELDS = [
+    'section_id',
+    'text_ar',
+    'options_ar',
+    'correct_answer',
+    'explanation_ar',
+    'image_url',
+    'difficulty',
+    'is_active'
+]
+
+BATCH_SIZE = 1000
+
+
+class ImportFormatError(Exception):
+    """خطأ في صيغة ملف الاستيراد"""
+
+
+# ما يمكن أن يلي عنصراً كاملاً في مصفوفة JSON
+JSON_DELIMITERS = frozenset(', \t\r\n]')
+
+
+def iter_json_array(fp, chunk_size=1 << 16):
+    """قراءة عناصر مصفوفة JSON من ملف تدريجياً"""
+    decoder = json.JSONDecoder()
+    buffer = ''
+    started = False
+    eof = False
+
+    while True:
+        buffer = buffer.lstrip()
+        if started:
+            buffer = buffer.lstrip(',').lstrip()
+        elif buffer:
+            if buffer[0] != '[':
+                raise ImportFormatError('الملف لا يبدأ بمصفوفة JSON')
+            buffer = buffer[1:]
+            started = True
+            continue
+
+        if started and buffer.startswith(']'):
+            return
+
+        if buffer:
+            try:
+                item, end = decoder.raw_decode(buffer)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            else:
+                # الرقم المقطوع بنهاية الجزء المقروء يُفك كرقم آخر (12345 -> 12،
+                # -1.5e3 -> -1) فلا تُعتمد القيمة إلا إذا تبعها فاصل أو انتهى الملف
+                if eof or buffer[end:end + 1] in JSON_DELIMITERS:
+                    yield item
+                    buffer = buffer[end:]
+                    continue
+
+        if eof:
+            raise ImportFormatError('نهاية غير متوقعة للملف')
+
+        chunk = fp.read(chunk_size)
+        if not chunk:
+            eof = True
+        buffer += chunk
+
+
+def section_for_question(q_data):
+    """استنتاج معرف القسم لسؤال في القائمة المسطحة"""
+    section_key = q_data.get('section_id') or q_data.get('section')
+    if section_key:
+        return section_key
+    return QUESTION_ID_PREFIXES.get(str(q_data.get('question_id', ''))[:3].upper())
+
+
+def iter_records(json_file_path):
+    """
+    قراءة سجلات الأسئلة من الملف بأي من الصيغتين
+    يرجع مولداً من (معرف القسم، بيانات القسم أو None، بيانات السؤال)
+    """
+    with open(json_file_path, 'r', encoding='utf-8') as f:
+        first = f.read(1)
+        while first and first.isspace():
+            first = f.read(1)
+        f.seek(0)
+
+        if first == '[':
+            for q_data in iter_json_array(f):
+                yield section_for_question(q_data), None, q_data
+            return
+
+        # الصيغة المتداخلة مقسمة حسب الأقسام فتُقرأ كاملة
+        data = json.load(f)
+
+    sections_data = data['swedish_driving_theory_test']['sections']
+    for section_key, section_data in sections_data.items():
+        for q_data in section_data['questions']:
+            yield section_key, section_data, q_data
+
+
+def content_hash(values):
+    """بصمة محتوى السؤال لمقارنة الصفوف دون تحديثها"""
+    payload = json.dumps(
+        [values[field] for field in IMPORTED_FIELDS],
+        ensure_ascii=False,
+        sort_keys=True
+    )
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+class QuestionImporter:
+    """استيراد الأسئلة على دفعات مع تطبيق الفروقات فقط"""
+
+    def __init__(self, batch_size=BATCH_SIZE, stdout=print):
+        self.batch_size = batch_size
+        self.stdout = stdout
+        self.sections = {}
+        self.report = {
+            'inserted': 0,
+            'updated': 0,
+            'unchanged': 0,
+            'skipped': 0,
+        }
+
+    def get_section(self, section_key, section_data=None):
+        """جلب القسم أو إنشاؤه (مرة واحدة لكل قسم)"""
+        section = self.sections.get(section_key)
+        if section is not None:
+            return section
+
+        if section_data is not None:
+            section, created = Section.objects.update_or_create(
+                section_id=section_key,
+                defaults={
+                    'name_ar': section_data['section_name'],
+                    'description_ar': section_data['section_description'],
+                    'question_count': section_data['number_of_questions'],
+                    'color': SECTION_COLORS.get(section_key, 'bg-blue-500'),
+                    'order': SECTION_ORDER.get(section_key, 99)
+                }
+            )
+        else:
+            section, created = Section.objects.get_or_create(
+                section_id=section_key,
+                defaults={
+                    'name_ar': section_key,
+                    'description_ar': '',
+                    'color': SECTION_COLORS.get(section_key, 'bg-blue-500'),
+                    'order': SECTION_ORDER.get(section_key, 99)
+                }
+            )
+
+        action = "تم الإنشاء" if created else "تم التحديث"
+        self.stdout(f"   {action}: {section.name_ar}")
+        self.sections[section_key] = section
+        return section
+
+    def build_values(self, section, q_data):
+        return {
+            'section_id': section.pk,
+            'text_ar': q_data['question_text'],
+            'options_ar': q_data['options'],
+            'correct_answer': q_data['correct_answer'],
+            'explanation_ar': q_data['explanation'],
+            'image_url': q_data.get('image_url') or '',
+            'difficulty': 'medium',
+            'is_active': True
+        }
+
+    def apply_batch(self, batch):
+        """مقارنة دفعة من الأسئلة بالموجود وتطبيق الفروقات"""
+        existing = {
+            row['question_id']: row
+            for row in Question.objects.filter(
+                question_id__in=list(batch)
+            ).order_by().values('id', 'question_id', *dict.fromkeys(IMPORTED_FIELDS + SEARCH_SOURCE_FIELDS))
+        }
+
+        now = timezone.now()
+        to_create = []
+        to_update = []
+        for question_id, values in batch.items():
+            row = existing.get(question_id)
+            if row is None:
+                to_create.append(Question(
+                    question_id=question_id,
+                    search_text=build_search_text(values),
+                    **values
+                ))
+            elif content_hash(row) != content_hash(values):
+                # الترجمات غير المستوردة تبقى كما هي في نص البحث
+                to_update.append(Question(
+                    id=row['id'],
+                    question_id=question_id,
+                    updated_at=now,
+                    search_text=build_search_text({**row, **values}),
+                    **values
+                ))
+            else:
+                self.report['unchanged'] += 1
+
+        with transaction.atomic():
+            Question.objects.bulk_create(to_create, batch_size=self.batch_size)
+            Question.objects.bulk_update(
+                to_update,
+                IMPORTED_FIELDS + ['search_text', 'updated_at'],
+                batch_size=self.batch_size
+            )
+
+        self.report['inserted'] += len(to_create)
+        self.report['updated'] += len(to_update)
+
+    def run(self, records):
+        """استيراد كل السجلات على دفعات"""
+        batch = {}
+        for section_key, section_data, q_data in records:
+            if not section_key or 'question_id' not in q_data:
+                self.report['skipped'] += 1
+                continue
+
+            section = self.get_section(section_key, section_data)
+            batch[q_data['question_id']] = self.build_values(section, q_data)
+
+            if len(batch) >= self.batch_size:
+                self.apply_batch(batch)
+                batch = {}
+
+        if batch:
+            self.apply_batch(batch)
+
+        self.refresh_section_counts()
+
+        # العمليات المجمعة لا ترسل إشارات الحفظ، لذلك نحدّث الإصدار يدوياً
+        if self.report['inserted'] or self.report['updated']:
+            bump_pool_version()
+
+        return self.report
+
+    def refresh_section_counts(self):
+        """تحديث عدد الأسئلة النشطة لكل قسم تم استيراده"""
+        sections = Section.objects.filter(
+            pk__in=[section.pk for section in self.sections.values()]
+        ).annotate(active_count=Count('questions', filter=Q(questions__is_active=True)))
+
+        changed = []
+        for section in sections:
+            if section.question_count != section.active_count:
+                section.question_count = section.active_count
+                changed.append(section)
+        Section.objects.bulk_update(changed, ['question_count'])
+
+
+def file_duplicates(json_file_path, threshold=DEFAULT_THRESHOLD):
+    """مجموعات الأسئلة شبه المكررة في ملف (بمعرفات الأسئلة) دون استيراده"""
+    return find_duplicates(
+        (
+            (q_data['question_id'], q_data.get('question_text', ''), q_data.get('options'))
+            for section_key, section_data, q_data in iter_records(json_file_path)
+            if 'question_id' in q_data
+        ),
+        threshold
+    )
+
+
+def bank_duplicates(threshold=DEFAULT_THRESHOLD, section_id=None, include_inactive=False):
+    """مجموعات الأسئلة شبه المكررة في بنك الأسئلة (بمعرفات الأسئلة)"""
+    questions = Question.objects.order_by('question_id')
+    if not include_inactive:
+        questions = questions.filter(is_active=True)
+    if section_id:
+        questions = questions.filter(section__section_id=section_id)
+    return find_duplicates(
+        questions.values_list('question_id', 'text_ar', 'options_ar').iterator(chunk_size=2000),
+        threshold
+    )
+
+
+def import_questions(json_file_path, batch_size=BATCH_SIZE, stdout=print, check_duplicates=False):
+    """
+    استيراد ملف أسئلة وإرجاع تقرير بالأعداد
+    check_duplicates: فحص البنك كاملاً بعد الاستيراد وإضافة مجموعات
+    الأسئلة شبه المكررة إلى التقرير (duplicates)
+    """
+    importer = QuestionImporter(batch_size=batch_size, stdout=stdout)
+    report = importer.run(iter_records(json_file_path))
+    if check_duplicates:
+        report['duplicates'] = bank_duplicates()
+    return report
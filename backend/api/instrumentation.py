@@ -0,0 +1,266 @@
+"""
+قياس الاستعلامات والزمن لكل طلب
+
+- RequestMetricsMiddleware: يعدّ استعلامات SQL ويقيس زمن قاعدة البيانات
+  وزمن التحويل (serialization) والزمن الكلي لعينة من الطلبات، ويضيفها
+  في ترويسة Server-Timing ويسجلها في مدرجات تكرارية (histograms)
+- InstrumentedViewMixin: خلط اختياري لواجهات DRF لقياس زمن المُسلسِلات والعرض
+- metrics_view: عرض المدرجات بصيغة Prometheus النصية (للمشرفين فقط)
+
+نسبة العينة من REQUEST_METRICS_SAMPLE_RATE (بين 0 و 1). عند 0 لا يُحمّل
+الـ middleware أصلاً فلا توجد أي كلفة إضافية.
+المدرجات محفوظة داخل العملية، فكل عامل (worker) يعرض أرقامه الخاصة.
+"""
+import random
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import HttpResponse
+from rest_framework import permissions
+from rest_framework.decorators import api_view, permission_classes
+
+
+# حدود المدرجات بالثواني
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# حدود مدرج عدد الاستعلامات
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+_current_metrics = ContextVar('request_metrics', default=None)
+
+
+def current_metrics():
+    """مقاييس الطلب الحالي أو None إذا لم يكن ضمن العينة"""
+    return _current_metrics.get()
+
+
+class RequestMetrics:
+    """مقاييس طلب واحد"""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.serialize_time = 0.0
+        self._serialize_depth = 0
+
+    def execute_wrapper(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            self.queries += 1
+
+
+@contextmanager
+def timed_serialization():
+    """قياس زمن التحويل (يُحسب المستوى الخارجي فقط عند التداخل)"""
+    metrics = _current_metrics.get()
+    if metrics is None:
+        yield
+        return
+
+    metrics._serialize_depth += 1
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics._serialize_depth -= 1
+        if not metrics._serialize_depth:
+            metrics.serialize_time += time.perf_counter() - started
+
+
+class Histogram:
+    """مدرج تكراري تراكمي بنفس دلالات Prometheus"""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+    def cumulative(self):
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            yield bound, total
+
+
+class MetricsRegistry:
+    """سجل المدرجات لكل (عرض، طريقة) داخل العملية"""
+
+    metrics = {
+        'api_request_duration_seconds': ('الزمن الكلي للطلب', DURATION_BUCKETS),
+        'api_request_db_seconds': ('زمن استعلامات قاعدة البيانات', DURATION_BUCKETS),
+        'api_request_serialize_seconds': ('زمن التحويل والعرض', DURATION_BUCKETS),
+        'api_request_queries': ('عدد استعلامات SQL', QUERY_BUCKETS),
+    }
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+
+    def observe(self, labels, values):
+        with self._lock:
+            for name, value in values.items():
+                key = (name, labels)
+                histogram = self._histograms.get(key)
+                if histogram is None:
+                    histogram = self._histograms[key] = Histogram(self.metrics[name][1])
+                histogram.observe(value)
+
+    def render(self):
+        """تصدير المدرجات بصيغة Prometheus النصية"""
+        lines = []
+        with self._lock:
+            for name, (help_text, _) in self.metrics.items():
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} histogram')
+                for (metric, labels), histogram in sorted(self._histograms.items()):
+                    if metric != name:
+                        continue
+                    label_text = ','.join(f'{k}="{v}"' for k, v in labels)
+                    for bound, count in histogram.cumulative():
+                        lines.append(f'{name}_bucket{{{label_text},le="{bound}"}} {count}')
+                    lines.append(f'{name}_bucket{{{label_text},le="+Inf"}} {histogram.count}')
+                    lines.append(f'{name}_sum{{{label_text}}} {histogram.sum:.6f}')
+                    lines.append(f'{name}_count{{{label_text}}} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+    def clear(self):
+        with self._lock:
+            self._histograms.clear()
+
+
+registry = MetricsRegistry()
+
+
+def view_label(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unresolved'
+    return match.view_name or match.route or 'unresolved'
+
+
+class RequestMetricsMiddleware:
+    """
+    قياس عينة من الطلبات: عدد الاستعلامات وزمن قاعدة البيانات والتحويل والزمن الكلي
+    في العروض غير المتزامنة تعمل استعلامات ORM في خيوط منفصلة، فلا تظهر في
+    عدد الاستعلامات وزمن قاعدة البيانات ويبقى الزمن الكلي دقيقاً
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.sample_rate = float(getattr(settings, 'REQUEST_METRICS_SAMPLE_RATE', 0))
+        if self.sample_rate <= 0:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def _sampled(self):
+        return self.sample_rate >= 1 or random.random() < self.sample_rate
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not self._sampled():
+            return self.get_response(request)
+
+        metrics = RequestMetrics()
+        token = _current_metrics.set(metrics)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(metrics.execute_wrapper))
+                response = self.get_response(request)
+        finally:
+            _current_metrics.reset(token)
+        return self._record(request, response, metrics, time.perf_counter() - started)
+
+    async def __acall__(self, request):
+        if not self._sampled():
+            return await self.get_response(request)
+
+        metrics = RequestMetrics()
+        token = _current_metrics.set(metrics)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current_metrics.reset(token)
+        return self._record(request, response, metrics, time.perf_counter() - started)
+
+    def _record(self, request, response, metrics, total):
+        response['Server-Timing'] = ', '.join([
+            f'db;dur={metrics.db_time * 1000:.2f};desc="{metrics.queries} queries"',
+            f'serialize;dur={metrics.serialize_time * 1000:.2f}',
+            f'total;dur={total * 1000:.2f}',
+        ])
+        registry.observe((('method', request.method), ('view', view_label(request))), {
+            'api_request_duration_seconds': total,
+            'api_request_db_seconds': metrics.db_time,
+            'api_request_serialize_seconds': metrics.serialize_time,
+            'api_request_queries': metrics.queries,
+        })
+        return response
+
+
+_timed_serializers = {}
+
+
+def timed_serializer_class(serializer_class):
+    """نسخة من المُسلسِل تقيس زمن to_representation"""
+    timed = _timed_serializers.get(serializer_class)
+    if timed is None:
+        def to_representation(self, instance):
+            with timed_serialization():
+                return super(timed, self).to_representation(instance)
+
+        timed = type(serializer_class.__name__, (serializer_class,), {
+            '__module__': serializer_class.__module__,
+            'to_representation': to_representation,
+        })
+        _timed_serializers[serializer_class] = timed
+    return timed
+
+
+class InstrumentedViewMixin:
+    """خلط لواجهات DRF يضيف زمن المُسلسِلات وعرض الاستجابة إلى مقاييس الطلب"""
+
+    def get_serializer_class(self):
+        serializer_class = super().get_serializer_class()
+        if _current_metrics.get() is None:
+            return serializer_class
+        return timed_serializer_class(serializer_class)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if _current_metrics.get() is not None and hasattr(response, 'render'):
+            with timed_serialization():
+                response.render()
+        return response
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAdminUser])
+def metrics_view(request):
+    """عرض المقاييس بصيغة Prometheus (أسماء الواجهات وأزمنتها ليست للعموم)"""
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
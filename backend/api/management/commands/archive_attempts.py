@@ -0,0 +1,48 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from api.archive import ARCHIVE_FORMATS, archive_attempts
+from api.models import TestAttempt
+
+
+class Command(BaseCommand):
+    help = 'نقل المحاولات المكتملة القديمة وإجاباتها إلى الأرشيف (جدول مضغوط أو ملفات JSONL مضغوطة)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than',
+            type=int,
+            default=None,
+            help='عمر المحاولة بالأيام (الافتراضي ATTEMPT_ARCHIVE_AFTER_DAYS)'
+        )
+        parser.add_argument('--format', choices=ARCHIVE_FORMATS, default='table', help='مكان حفظ الإجابات')
+        parser.add_argument('--dir', default=None, help='مجلد ملفات JSONL (الافتراضي ATTEMPT_ARCHIVE_DIR)')
+        parser.add_argument('--batch-size', type=int, default=1000, help='عدد المحاولات في كل دفعة')
+        parser.add_argument('--dry-run', action='store_true', help='عرض عدد المحاولات فقط')
+
+    def handle(self, *args, **options):
+        days = options['older_than']
+        if days is None:
+            days = settings.ATTEMPT_ARCHIVE_AFTER_DAYS
+        if days <= 0:
+            raise CommandError('عدد الأيام يجب أن يكون رقماً موجباً')
+        cutoff = timezone.now() - timedelta(days=days)
+
+        if options['dry_run']:
+            count = TestAttempt.objects.filter(completed_at__lt=cutoff).count()
+            self.stdout.write(f'📦 {count} محاولة مكتملة قبل {cutoff:%Y-%m-%d}')
+            return
+
+        attempts, answers = archive_attempts(
+            cutoff,
+            batch_size=options['batch_size'],
+            archive_format=options['format'],
+            directory=options['dir'],
+            stdout=self.stdout.write
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ تمت أرشفة {attempts} محاولة و {answers} إجابة مكتملة قبل {cutoff:%Y-%m-%d}'
+        ))
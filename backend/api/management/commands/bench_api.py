@@ -0,0 +1,93 @@
+import json
+import os
+import tempfile
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from api.models import Question
+from api.benchmark import Benchmark, seed_dataset, reset_caches, environment_info
+
+
+class Command(BaseCommand):
+    help = 'قياس أداء نقاط النهاية الساخنة على قاعدة بيانات اختبار مؤقتة وإخراج النتائج بصيغة JSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--questions', type=int, default=5000, help='عدد الأسئلة الإجمالي')
+        parser.add_argument('--attempts', type=int, default=20000, help='عدد المحاولات المكتملة (يمكن رفعه إلى الملايين)')
+        parser.add_argument('--answers-per-attempt', type=int, default=65)
+        parser.add_argument('--iterations', type=int, default=50, help='عدد الطلبات المقاسة لكل سيناريو')
+        parser.add_argument('--warmup', type=int, default=5, help='عدد طلبات الإحماء غير المقاسة')
+        parser.add_argument('--scenario', action='append', dest='scenarios', help='تشغيل سيناريو محدد فقط (يمكن تكراره)')
+        parser.add_argument('--output', help='مسار ملف JSON للنتائج (الافتراضي: المخرجات القياسية)')
+        parser.add_argument(
+            '--connection-profiles',
+            type=int,
+            default=0,
+            metavar='N',
+            help='مقارنة إنتاجية submit (N طلب) بين اتصال جديد لكل طلب والاتصالات الدائمة'
+        )
+        parser.add_argument('--keepdb', action='store_true', help='الاحتفاظ بقاعدة بيانات الاختبار وإعادة استخدامها')
+
+    def handle(self, *args, **options):
+        log = self.stderr.write
+
+        setup_test_environment()
+        old_name = connection.settings_dict['NAME']
+        if connection.vendor == 'sqlite' and not connection.settings_dict['TEST']['NAME']:
+            # ملف بدلاً من قاعدة في الذاكرة: يسمح بـ keepdb وبإغلاق الاتصالات فعلياً
+            connection.settings_dict['TEST']['NAME'] = os.path.join(
+                tempfile.gettempdir(), 'bench_api.sqlite3'
+            )
+        connection.creation.create_test_db(
+            verbosity=0,
+            autoclobber=True,
+            serialize=False,
+            keepdb=options['keepdb']
+        )
+        try:
+            reset_caches()
+            if options['keepdb'] and Question.objects.exists():
+                log('♻️  استخدام البيانات الموجودة في قاعدة بيانات الاختبار')
+                dataset = None
+            else:
+                log('🌱 إنشاء البيانات...')
+                dataset = seed_dataset(
+                    questions=options['questions'],
+                    attempts=options['attempts'],
+                    answers_per_attempt=options['answers_per_attempt'],
+                    stdout=log
+                )
+
+            log('⏱️  تشغيل القياسات...')
+            benchmark = Benchmark(
+                iterations=options['iterations'],
+                warmup=options['warmup']
+            )
+            results = benchmark.run(only=options['scenarios'])
+
+            connection_profiles = None
+            if options['connection_profiles']:
+                log('🔌 مقارنة إعدادات الاتصال...')
+                connection_profiles = benchmark.connection_profiles(options['connection_profiles'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=options['keepdb'])
+            teardown_test_environment()
+
+        report = {
+            'environment': environment_info(),
+            'dataset': dataset,
+            'iterations': options['iterations'],
+            'results': results,
+        }
+        if connection_profiles is not None:
+            report['connection_profiles'] = connection_profiles
+        output = json.dumps(report, ensure_ascii=False, indent=2)
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                f.write(output)
+            log(f"✅ تم حفظ النتائج في {options['output']}")
+        else:
+            self.stdout.write(output)
@@ -0,0 +1,56 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.export import EXPORT_FORMATS, EXPORT_KINDS, ExportError, iter_export
+
+
+class Command(BaseCommand):
+    help = (
+        'تصدير المحاولات أو الإجابات بتدفق إلى ملف CSV أو JSONL (مع gzip اختياري). '
+        'المحاولات المنقولة بـ archive_attempts لا تُصدّر إلا مع --include-archived'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--kind', choices=EXPORT_KINDS, default='attempts', help='ما يتم تصديره')
+        parser.add_argument('--format', choices=EXPORT_FORMATS, default='csv', help='صيغة الملف')
+        parser.add_argument('--since', default=None, help='من تاريخ YYYY-MM-DD')
+        parser.add_argument('--until', default=None, help='حتى تاريخ YYYY-MM-DD (يشمل اليوم)')
+        parser.add_argument('--section', default=None, help='معرف القسم')
+        parser.add_argument('--gzip', action='store_true', help='ضغط الملف بـ gzip')
+        parser.add_argument(
+            '--include-archived',
+            action='store_true',
+            help='إضافة المحاولات المؤرشفة وإجاباتها (إجاباتها بلا معرف ووقت إجابة، وتُفلتر بوقت إنهاء المحاولة)'
+        )
+        parser.add_argument('--output', '-o', default='-', help='مسار الملف (- للمخرج القياسي)')
+
+    def handle(self, *args, **options):
+        try:
+            chunks = iter_export(
+                options['kind'],
+                options['format'],
+                options['gzip'],
+                since=options['since'],
+                until=options['until'],
+                section_id=options['section'],
+                include_archived=options['include_archived']
+            )
+        except ExportError as e:
+            raise CommandError(str(e))
+
+        to_stdout = options['output'] == '-'
+        output = sys.stdout.buffer if to_stdout else open(options['output'], 'wb')
+        written = 0
+        try:
+            for chunk in chunks:
+                output.write(chunk)
+                written += len(chunk)
+        finally:
+            if not to_stdout:
+                output.close()
+
+        if not to_stdout:
+            self.stdout.write(self.style.SUCCESS(
+                f"✅ تم تصدير {options['kind']} إلى {options['output']} ({written} بايت)"
+            ))
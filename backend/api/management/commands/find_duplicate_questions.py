@@ -0,0 +1,48 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.duplicates import DEFAULT_THRESHOLD
+from api.importer import ImportFormatError, bank_duplicates, file_duplicates
+
+
+class Command(BaseCommand):
+    help = 'كشف الأسئلة شبه المكررة (MinHash/LSH) في بنك الأسئلة أو في ملف قبل استيراده'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help='حد التشابه (0-1)')
+        parser.add_argument('--file', help='فحص ملف JSON بدلاً من قاعدة البيانات')
+        parser.add_argument('--section', help='فحص قسم واحد فقط من البنك')
+        parser.add_argument('--include-inactive', action='store_true', help='تضمين الأسئلة غير النشطة')
+        parser.add_argument('--json', action='store_true', help='طباعة المجموعات بصيغة JSON')
+        parser.add_argument('--limit', type=int, default=50, help='أقصى عدد مجموعات للطباعة')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        try:
+            if options['file']:
+                clusters = file_duplicates(options['file'], options['threshold'])
+            else:
+                clusters = bank_duplicates(
+                    options['threshold'],
+                    section_id=options['section'],
+                    include_inactive=options['include_inactive']
+                )
+        except (ValueError, OSError, ImportFormatError) as e:
+            raise CommandError(str(e))
+        elapsed = time.perf_counter() - started
+
+        if options['json']:
+            self.stdout.write(json.dumps([cluster.as_dict() for cluster in clusters], ensure_ascii=False))
+            return
+
+        for cluster in clusters[:options['limit']]:
+            self.stdout.write(f"🔁 {len(cluster)} أسئلة (تشابه ≥ {cluster.similarity:.2f}): {', '.join(cluster.keys)}")
+        if len(clusters) > options['limit']:
+            self.stdout.write(f'... و {len(clusters) - options["limit"]} مجموعة أخرى')
+
+        duplicates = sum(len(cluster) - 1 for cluster in clusters)
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ {len(clusters)} مجموعة ({duplicates} سؤال زائد) في {elapsed:.2f} ثانية'
+        ))
@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Q
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from api.models import TestAttempt, ArchivedAttempt, AttemptStatistics, DailyAttemptStatistics
+
+
+class Command(BaseCommand):
+    help = 'إعادة بناء جداول إحصائيات المحاولات المجمعة من جدول المحاولات والأرشيف'
+
+    def handle(self, *args, **options):
+        days = {}
+        for model in (TestAttempt, ArchivedAttempt):
+            rows = model.objects.filter(
+                completed_at__isnull=False
+            ).annotate(
+                day=TruncDate('completed_at', tzinfo=timezone.get_current_timezone())
+            ).values('day').annotate(
+                total_attempts=Count('id'),
+                passed_attempts=Count('id', filter=Q(passed=True)),
+                full_test_attempts=Count('id', filter=Q(test_type='full')),
+            ).order_by('day')
+            for row in rows:
+                stats = days.setdefault(row['day'], DailyAttemptStatistics(day=row['day']))
+                stats.total_attempts += row['total_attempts']
+                stats.passed_attempts += row['passed_attempts']
+                stats.full_test_attempts += row['full_test_attempts']
+
+        daily = [days[day] for day in sorted(days)]
+        totals = AttemptStatistics(
+            pk=AttemptStatistics.TOTALS_PK,
+            total_attempts=sum(row.total_attempts for row in daily),
+            passed_attempts=sum(row.passed_attempts for row in daily),
+            full_test_attempts=sum(row.full_test_attempts for row in daily),
+        )
+
+        with transaction.atomic():
+            DailyAttemptStatistics.objects.all().delete()
+            DailyAttemptStatistics.objects.bulk_create(daily, batch_size=1000)
+            AttemptStatistics.objects.all().delete()
+            totals.save()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ تمت إعادة بناء الإحصائيات: {totals.total_attempts} محاولة في {len(daily)} يوم'
+        ))
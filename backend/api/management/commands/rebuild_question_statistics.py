@@ -0,0 +1,73 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Case, Count, IntegerField, Q, Value, When
+
+from api.archive import iter_archived_answers
+from api.models import Question, TestAnswer, QuestionStatistics, ANSWER_TIME_BUCKETS, MAX_OPTIONS
+
+
+class Command(BaseCommand):
+    help = 'إعادة بناء إحصائيات الأسئلة (الإجابات، توزيع الخيارات، زمن الإجابة) من جدول الإجابات والأرشيف'
+
+    def handle(self, *args, **options):
+        statistics = {}
+
+        def row_for(question_id):
+            row = statistics.get(question_id)
+            if row is None:
+                row = statistics[question_id] = QuestionStatistics(
+                    question_id=question_id,
+                    option_counts=[],
+                    time_histogram=[]
+                )
+            return row
+
+        # توزيع الخيارات والإجابات الصحيحة: تجميع واحد حسب (السؤال، الخيار)
+        options = TestAnswer.objects.order_by().values('question_id', 'selected_answer').annotate(
+            answered=Count('id'),
+            correct=Count('id', filter=Q(is_correct=True)),
+        )
+        for item in options.iterator(chunk_size=5000):
+            row = row_for(item['question_id'])
+            row.answered_count += item['answered']
+            row.correct_count += item['correct']
+            selected = item['selected_answer']
+            # نفس قاعدة QuestionStatistics.add لأرقام الخيارات خارج النطاق
+            if not 0 <= selected < MAX_OPTIONS:
+                continue
+            if selected >= len(row.option_counts):
+                row.option_counts.extend([0] * (selected + 1 - len(row.option_counts)))
+            row.option_counts[selected] += item['answered']
+
+        # مدرج زمن الإجابة: تجميع واحد حسب (السؤال، خانة الزمن)
+        bucket = Case(
+            *[When(time_spent_seconds__lte=bound, then=Value(i)) for i, bound in enumerate(ANSWER_TIME_BUCKETS)],
+            default=Value(len(ANSWER_TIME_BUCKETS)),
+            output_field=IntegerField()
+        )
+        times = TestAnswer.objects.order_by().filter(time_spent_seconds__isnull=False).annotate(
+            bucket=bucket
+        ).values('question_id', 'bucket').annotate(count=Count('id'))
+        for item in times.iterator(chunk_size=5000):
+            row = row_for(item['question_id'])
+            if not row.time_histogram:
+                row.time_histogram = [0] * (len(ANSWER_TIME_BUCKETS) + 1)
+            row.time_histogram[item['bucket']] += item['count']
+
+        # الإجابات المؤرشفة تُضاف واحدة واحدة
+        for question_id, selected, is_correct, seconds in iter_archived_answers():
+            row_for(question_id).add(selected, is_correct, seconds)
+
+        # الأرشيف قد يحتوي على إجابات أسئلة محذوفة
+        existing = set(Question.objects.filter(pk__in=list(statistics)).values_list('pk', flat=True))
+        statistics = {pk: row for pk, row in statistics.items() if pk in existing}
+        for row in statistics.values():
+            row.update_summary()
+
+        with transaction.atomic():
+            QuestionStatistics.objects.all().delete()
+            QuestionStatistics.objects.bulk_create(statistics.values(), batch_size=1000)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ تمت إعادة بناء إحصائيات {len(statistics)} سؤال'
+        ))
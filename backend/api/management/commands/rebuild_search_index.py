@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from api.models import Question
+from api.normalization import SEARCH_SOURCE_FIELDS, build_search_text
+from api.question_pool import bump_pool_version
+
+
+class Command(BaseCommand):
+    help = 'إعادة حساب نص البحث المُطبّع لكل الأسئلة (بعد تعديلات مباشرة على قاعدة البيانات أو تغيير التطبيع)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='عدد الأسئلة في كل دفعة')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        questions = Question.objects.order_by('pk').only('id', 'search_text', *SEARCH_SOURCE_FIELDS)
+
+        changed = []
+        updated = 0
+        for question in questions.iterator(chunk_size=batch_size):
+            search_text = build_search_text(question)
+            if search_text != question.search_text:
+                question.search_text = search_text
+                changed.append(question)
+            if len(changed) >= batch_size:
+                with transaction.atomic():
+                    Question.objects.bulk_update(changed, ['search_text'])
+                updated += len(changed)
+                changed = []
+
+        with transaction.atomic():
+            Question.objects.bulk_update(changed, ['search_text'])
+        updated += len(changed)
+
+        if updated:
+            # فهارس البحث داخل العمليات تُبنى من جديد
+            bump_pool_version()
+
+        self.stdout.write(self.style.SUCCESS(f'✅ تم تحديث نص البحث لـ {updated} سؤال'))
@@ -0,0 +1,26 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.exam_pool import exam_pool
+
+
+class Command(BaseCommand):
+    help = 'ملء مجمّع الاختبارات الجاهزة (مرة واحدة أو بشكل مستمر مع --loop)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help='العمل بشكل مستمر كعامل خلفي')
+        parser.add_argument('--interval', type=float, default=2.0, help='الفاصل بين الفحوصات بالثواني')
+
+    def handle(self, *args, **options):
+        if exam_pool.size <= 0:
+            raise CommandError('المجمّع معطّل: اضبط EXAM_POOL_SIZE على قيمة موجبة')
+
+        while True:
+            if exam_pool.available() < exam_pool.low_water or not options['loop']:
+                added = exam_pool.refill()
+                if added:
+                    self.stdout.write(f'✅ تمت إضافة {added} اختبار (المتاح: {exam_pool.available()})')
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
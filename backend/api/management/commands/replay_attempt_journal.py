@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from api.write_behind import journal_files, replay_journal
+
+
+class Command(BaseCommand):
+    help = 'كتابة المحاولات المتبقية في ملفات سجل الكتابة المؤجلة (بعد توقف مفاجئ وقبل تشغيل الخادم)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dir',
+            default=None,
+            help='مجلد ملفات السجل (الافتراضي ATTEMPT_WRITE_BEHIND_JOURNAL_DIR)'
+        )
+
+    def handle(self, *args, **options):
+        total = 0
+        files = journal_files(options['dir'])
+        for path in files:
+            count = replay_journal(path)
+            total += count
+            self.stdout.write(f'   {path}: {count}')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ تمت كتابة {total} محاولة من {len(files)} ملف سجل'
+        ))
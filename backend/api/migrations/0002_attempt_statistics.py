@@ -0,0 +1,41 @@
+# Generated by Django 5.0 on 2026-10-18 08:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttemptStatistics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_attempts', models.IntegerField(default=0, verbose_name='إجمالي المحاولات')),
+                ('passed_attempts', models.IntegerField(default=0, verbose_name='المحاولات الناجحة')),
+                ('full_test_attempts', models.IntegerField(default=0, verbose_name='محاولات الاختبار الكامل')),
+            ],
+            options={
+                'verbose_name': 'إحصائيات المحاولات',
+                'verbose_name_plural': 'إحصائيات المحاولات',
+            },
+        ),
+        migrations.CreateModel(
+            name='DailyAttemptStatistics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_attempts', models.IntegerField(default=0, verbose_name='إجمالي المحاولات')),
+                ('passed_attempts', models.IntegerField(default=0, verbose_name='المحاولات الناجحة')),
+                ('full_test_attempts', models.IntegerField(default=0, verbose_name='محاولات الاختبار الكامل')),
+                ('day', models.DateField(unique=True, verbose_name='اليوم')),
+            ],
+            options={
+                'verbose_name': 'إحصائيات يومية',
+                'verbose_name_plural': 'الإحصائيات اليومية',
+                'ordering': ['-day'],
+            },
+        ),
+    ]
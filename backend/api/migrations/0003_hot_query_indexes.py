@@ -0,0 +1,33 @@
+# Generated by Django 5.0 on 2026-10-18 08:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0002_attempt_statistics'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['section', 'question_id'], name='question_active_section_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['section', 'difficulty'], name='question_active_diff_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='testattempt',
+            index=models.Index(fields=['-started_at'], name='attempt_started_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='testattempt',
+            index=models.Index(condition=models.Q(('completed_at__isnull', False)), fields=['completed_at'], name='attempt_completed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='testattempt',
+            index=models.Index(condition=models.Q(('completed_at__isnull', False)), fields=['test_type', 'passed'], name='attempt_completed_type_idx'),
+        ),
+    ]
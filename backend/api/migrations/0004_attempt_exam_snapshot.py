@@ -0,0 +1,33 @@
+# Generated by Django 5.0 on 2026-10-18 08:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='testattempt',
+            name='exam_seed',
+            field=models.BigIntegerField(blank=True, null=True, verbose_name='بذرة توليد الاختبار'),
+        ),
+        migrations.AddField(
+            model_name='testattempt',
+            name='pool_version',
+            field=models.BigIntegerField(blank=True, null=True, verbose_name='إصدار بنك الأسئلة'),
+        ),
+        migrations.AddField(
+            model_name='testattempt',
+            name='snapshot_answer_keys',
+            field=models.BinaryField(blank=True, null=True, verbose_name='مفاتيح الإجابات'),
+        ),
+        migrations.AddField(
+            model_name='testattempt',
+            name='snapshot_question_ids',
+            field=models.BinaryField(blank=True, null=True, verbose_name='معرفات أسئلة الاختبار'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.0 on 2026-10-18 16:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_attempt_exam_snapshot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuestionStatistics',
+            fields=[
+                ('question', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='statistics', serialize=False, to='api.question', verbose_name='السؤال')),
+                ('answered_count', models.IntegerField(default=0, verbose_name='عدد الإجابات')),
+                ('correct_count', models.IntegerField(default=0, verbose_name='الإجابات الصحيحة')),
+            ],
+            options={
+                'verbose_name': 'إحصائيات سؤال',
+                'verbose_name_plural': 'إحصائيات الأسئلة',
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.0 on 2026-10-18 09:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_question_statistics'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='questionstatistics',
+            name='median_time_seconds',
+            field=models.FloatField(blank=True, null=True, verbose_name='الوسيط التقريبي لزمن الإجابة'),
+        ),
+        migrations.AddField(
+            model_name='questionstatistics',
+            name='option_counts',
+            field=models.JSONField(default=list, verbose_name='عدد مرات اختيار كل خيار'),
+        ),
+        migrations.AddField(
+            model_name='questionstatistics',
+            name='percent_correct',
+            field=models.FloatField(blank=True, db_index=True, null=True, verbose_name='نسبة الإجابات الصحيحة'),
+        ),
+        migrations.AddField(
+            model_name='questionstatistics',
+            name='time_histogram',
+            field=models.JSONField(default=list, verbose_name='مدرج زمن الإجابة'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.0 on 2026-10-18 09:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0006_question_analytics'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedAttempt',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False, verbose_name='معرف المحاولة الأصلي')),
+                ('test_type', models.CharField(choices=[('full', 'اختبار كامل (65 سؤال)'), ('section', 'اختبار قسم محدد')], max_length=20, verbose_name='نوع الاختبار')),
+                ('with_timer', models.BooleanField(default=False, verbose_name='مع مؤقت')),
+                ('started_at', models.DateTimeField(verbose_name='وقت البدء')),
+                ('completed_at', models.DateTimeField(db_index=True, verbose_name='وقت الإنهاء')),
+                ('total_questions', models.IntegerField(verbose_name='إجمالي الأسئلة')),
+                ('answered_questions', models.IntegerField(default=0, verbose_name='الأسئلة المجابة')),
+                ('correct_answers', models.IntegerField(default=0, verbose_name='الإجابات الصحيحة')),
+                ('score_percentage', models.FloatField(default=0.0, verbose_name='النسبة المئوية')),
+                ('passed', models.BooleanField(default=False, verbose_name='ناجح')),
+                ('time_taken_seconds', models.IntegerField(blank=True, null=True, verbose_name='الوقت المستغرق (بالثواني)')),
+                ('exam_seed', models.BigIntegerField(blank=True, null=True, verbose_name='بذرة توليد الاختبار')),
+                ('answers', models.BinaryField(blank=True, null=True, verbose_name='الإجابات المضغوطة')),
+                ('archive_file', models.CharField(blank=True, max_length=255, verbose_name='ملف الأرشيف')),
+                ('archived_at', models.DateTimeField(auto_now_add=True, verbose_name='وقت الأرشفة')),
+                ('section', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='api.section', verbose_name='القسم (إن وجد)')),
+            ],
+            options={
+                'verbose_name': 'محاولة مؤرشفة',
+                'verbose_name_plural': 'المحاولات المؤرشفة',
+                'ordering': ['-completed_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,112 @@
+# Generated by Django 5.0 on 2026-10-18 10:02
+
+import re
+
+from django.db import migrations, models
+
+
+# نسخة ثابتة من api/normalization.py وقت إنشاء هذا الترحيل: الترحيلات لا
+# تستورد كود التطبيق حتى لا يتغير ناتجها إذا تغيّر التطبيع لاحقاً
+DIACRITICS_RE = re.compile('[\u064B-\u065F\u0670\u0640]')
+
+ARABIC_FOLDING = (
+    ('أ', 'ا'),
+    ('إ', 'ا'),
+    ('آ', 'ا'),
+    ('ٱ', 'ا'),
+    ('ى', 'ي'),
+    ('ئ', 'ي'),
+    ('ؤ', 'و'),
+    ('ة', 'ه'),
+)
+
+ARTICLE_PREFIXES = ('وال', 'بال', 'كال', 'فال', 'لل', 'ال')
+
+TOKEN_RE = re.compile(r'(?:(?:%s)(?=[^\W_]{2}))?([^\W_]+)' % '|'.join(ARTICLE_PREFIXES))
+
+SEARCH_SOURCE_FIELDS = [
+    'text_ar',
+    'text_en',
+    'text_sv',
+    'options_ar',
+    'options_en',
+    'options_sv',
+    'explanation_ar',
+    'explanation_en',
+    'explanation_sv',
+]
+
+
+def normalize_text(text):
+    text = DIACRITICS_RE.sub('', text or '')
+    for letter, replacement in ARABIC_FOLDING:
+        if letter in text:
+            text = text.replace(letter, replacement)
+    return text.casefold()
+
+
+def field_text(value):
+    if isinstance(value, (list, tuple)):
+        return ' '.join(str(item) for item in value if item)
+    return value or ''
+
+
+def build_search_text(question):
+    values = [getattr(question, field, None) for field in SEARCH_SOURCE_FIELDS]
+    return ' '.join(TOKEN_RE.findall(normalize_text(' '.join(field_text(value) for value in values))))
+
+
+SEARCH_VECTOR_SQL = [
+    # عمود tsvector مولّد من النص المُطبّع (لا يكتبه Django)
+    "ALTER TABLE api_question ADD COLUMN search_vector tsvector "
+    "GENERATED ALWAYS AS (to_tsvector('simple', search_text)) STORED",
+    "CREATE INDEX question_search_vector_idx ON api_question USING GIN (search_vector)",
+]
+
+DROP_SEARCH_VECTOR_SQL = [
+    "DROP INDEX IF EXISTS question_search_vector_idx",
+    "ALTER TABLE api_question DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def fill_search_text(apps, schema_editor):
+    Question = apps.get_model('api', 'Question')
+    batch = []
+    for question in Question.objects.order_by('pk').iterator(chunk_size=1000):
+        question.search_text = build_search_text(question)
+        batch.append(question)
+        if len(batch) >= 1000:
+            Question.objects.bulk_update(batch, ['search_text'])
+            batch = []
+    Question.objects.bulk_update(batch, ['search_text'])
+
+
+def add_search_vector(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for sql in SEARCH_VECTOR_SQL:
+        schema_editor.execute(sql)
+
+
+def drop_search_vector(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for sql in DROP_SEARCH_VECTOR_SQL:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_archived_attempt'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='question',
+            name='search_text',
+            field=models.TextField(blank=True, default='', editable=False, verbose_name='نص البحث'),
+        ),
+        migrations.RunPython(fill_search_text, migrations.RunPython.noop),
+        migrations.RunPython(add_search_vector, drop_search_vector),
+    ]
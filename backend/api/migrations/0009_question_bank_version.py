@@ -0,0 +1,25 @@
+# Generated by Django 5.0 on 2026-10-18 11:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0008_question_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuestionBankVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.BigIntegerField(verbose_name='رقم الإصدار')),
+                ('modified_at', models.DateTimeField(verbose_name='وقت آخر تعديل')),
+            ],
+            options={
+                'verbose_name': 'إصدار بنك الأسئلة',
+                'verbose_name_plural': 'إصدار بنك الأسئلة',
+            },
+        ),
+    ]
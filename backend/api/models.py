@@ -1,289 +1,895 @@
-from django.db import models
-from django.utils import timezone
-
-
-class Section(models.Model):
-    """نموذج الأقسام (السلامة المرورية، قواعد المرور، إلخ)"""
-
-    section_id = models.CharField(
-        max_length=100,
-        unique=True,
-        verbose_name="معرف القسم"
-    )
-    name_ar = models.CharField(
-        max_length=200,
-        verbose_name="الاسم بالعربية"
-    )
-    name_en = models.CharField(
-        max_length=200,
-        blank=True,
-        verbose_name="الاسم بالإنجليزية"
-    )
-    description_ar = models.TextField(
-        verbose_name="الوصف بالعربية"
-    )
-    description_en = models.TextField(
-        blank=True,
-        verbose_name="الوصف بالإنجليزية"
-    )
-    question_count = models.IntegerField(
-        default=0,
-        verbose_name="عدد الأسئلة"
-    )
-    color = models.CharField(
-        max_length=50,
-        default='bg-blue-500',
-        verbose_name="اللون"
-    )
-    order = models.IntegerField(
-        default=0,
-        verbose_name="الترتيب"
-    )
-    created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
-
-    class Meta:
-        verbose_name = "قسم"
-        verbose_name_plural = "الأقسام"
-        ordering = ['order', 'section_id']
-
-    def __str__(self):
-        return self.name_ar
-
-
-class Question(models.Model):
-    """نموذج الأسئلة"""
-
-    section = models.ForeignKey(
-        Section,
-        on_delete=models.CASCADE,
-        related_name='questions',
-        verbose_name="القسم"
-    )
-    question_id = models.CharField(
-        max_length=50,
-        unique=True,
-        verbose_name="معرف السؤال"
-    )
-    text_ar = models.TextField(
-        verbose_name="نص السؤال بالعربية"
-    )
-    text_en = models.TextField(
-        blank=True,
-        verbose_name="نص السؤال بالإنجليزية"
-    )
-    text_sv = models.TextField(
-        blank=True,
-        verbose_name="نص السؤال بالسويدية"
-    )
-
-    # الخيارات كـ JSON
-    options_ar = models.JSONField(
-        verbose_name="الخيارات بالعربية"
-    )
-    options_en = models.JSONField(
-        blank=True,
-        null=True,
-        verbose_name="الخيارات بالإنجليزية"
-    )
-    options_sv = models.JSONField(
-        blank=True,
-        null=True,
-        verbose_name="الخيارات بالسويدية"
-    )
-
-    correct_answer = models.IntegerField(
-        verbose_name="رقم الإجابة الصحيحة (0-3)"
-    )
-
-    explanation_ar = models.TextField(
-        verbose_name="الشرح بالعربية"
-    )
-    explanation_en = models.TextField(
-        blank=True,
-        verbose_name="الشرح بالإنجليزية"
-    )
-    explanation_sv = models.TextField(
-        blank=True,
-        verbose_name="الشرح بالسويدية"
-    )
-
-    image_url = models.URLField(
-        blank=True,
-        verbose_name="رابط الصورة"
-    )
-    image = models.ImageField(
-        upload_to='questions/',
-        blank=True,
-        null=True,
-        verbose_name="صورة السؤال"
-    )
-
-    difficulty = models.CharField(
-        max_length=20,
-        choices=[
-            ('easy', 'سهل'),
-            ('medium', 'متوسط'),
-            ('hard', 'صعب'),
-        ],
-        default='medium',
-        verbose_name="مستوى الصعوبة"
-    )
-
-    is_active = models.BooleanField(
-        default=True,
-        verbose_name="نشط"
-    )
-
-    created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
-
-    class Meta:
-        verbose_name = "سؤال"
-        verbose_name_plural = "الأسئلة"
-        ordering = ['section', 'question_id']
-
-    def __str__(self):
-        return f"{self.question_id} - {self.text_ar[:50]}"
-
-
-class TestAttempt(models.Model):
-    """محاولات الاختبار"""
-
-    TEST_TYPES = [
-        ('full', 'اختبار كامل (65 سؤال)'),
-        ('section', 'اختبار قسم محدد'),
-    ]
-
-    test_type = models.CharField(
-        max_length=20,
-        choices=TEST_TYPES,
-        verbose_name="نوع الاختبار"
-    )
-    section = models.ForeignKey(
-        Section,
-        on_delete=models.SET_NULL,
-        null=True,
-        blank=True,
-        verbose_name="القسم (إن وجد)"
-    )
-    with_timer = models.BooleanField(
-        default=False,
-        verbose_name="مع مؤقت"
-    )
-
-    started_at = models.DateTimeField(
-        default=timezone.now,
-        verbose_name="وقت البدء"
-    )
-    completed_at = models.DateTimeField(
-        null=True,
-        blank=True,
-        verbose_name="وقت الإنهاء"
-    )
-
-    total_questions = models.IntegerField(
-        verbose_name="إجمالي الأسئلة"
-    )
-    answered_questions = models.IntegerField(
-        default=0,
-        verbose_name="الأسئلة المجابة"
-    )
-    correct_answers = models.IntegerField(
-        default=0,
-        verbose_name="الإجابات الصحيحة"
-    )
-
-    score_percentage = models.FloatField(
-        default=0.0,
-        verbose_name="النسبة المئوية"
-    )
-    passed = models.BooleanField(
-        default=False,
-        verbose_name="ناجح"
-    )
-
-    time_taken_seconds = models.IntegerField(
-        null=True,
-        blank=True,
-        verbose_name="الوقت المستغرق (بالثواني)"
-    )
-
-    # معلومات إضافية
-    user_ip = models.GenericIPAddressField(
-        null=True,
-        blank=True,
-        verbose_name="IP المستخدم"
-    )
-    user_agent = models.TextField(
-        blank=True,
-        verbose_name="معلومات المتصفح"
-    )
-
-    class Meta:
-        verbose_name = "محاولة اختبار"
-        verbose_name_plural = "محاولات الاختبار"
-        ordering = ['-started_at']
-
-    def __str__(self):
-        return f"محاولة #{self.id} - {self.get_test_type_display()}"
-
-    def calculate_results(self):
-        """حساب النتائج"""
-        self.answered_questions = self.answers.count()
-        self.correct_answers = self.answers.filter(is_correct=True).count()
-        self.score_percentage = (self.correct_answers / self.total_questions) * 100
-
-        # تحديد النجاح
-        if self.test_type == 'full':
-            self.passed = self.correct_answers >= 52
-        else:
-            self.passed = self.correct_answers >= (self.total_questions * 0.8)
-
-        # حساب الوقت المستغرق
-        if self.completed_at and self.started_at:
-            time_delta = self.completed_at - self.started_at
-            self.time_taken_seconds = int(time_delta.total_seconds())
-
-        self.save()
-
-
-class TestAnswer(models.Model):
-    """إجابات الأسئلة"""
-
-    attempt = models.ForeignKey(
-        TestAttempt,
-        on_delete=models.CASCADE,
-        related_name='answers',
-        verbose_name="المحاولة"
-    )
-    question = models.ForeignKey(
-        Question,
-        on_delete=models.CASCADE,
-        verbose_name="السؤال"
-    )
-    selected_answer = models.IntegerField(
-        verbose_name="الإجابة المختارة"
-    )
-    is_correct = models.BooleanField(
-        verbose_name="صحيحة"
-    )
-    answered_at = models.DateTimeField(
-        auto_now_add=True,
-        verbose_name="وقت الإجابة"
-    )
-    time_spent_seconds = models.IntegerField(
-        null=True,
-        blank=True,
-        verbose_name="الوقت المستغرق (بالثواني)"
-    )
-
-    class Meta:
-        verbose_name = "إجابة"
-        verbose_name_plural = "الإجابات"
-        ordering = ['answered_at']
-        unique_together = ['attempt', 'question']
-
-    def __str__(self):
-        return f"{self.attempt.id} - {self.question.question_id}"
-
+import sys
+from array import array
+from itertools import chain
+from datetime import timedelta
+
+from django.db import models, transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from .normalization import SEARCH_SOURCE_FIELDS, build_search_text
+
+
+class Section(models.Model):
+    """نموذج الأقسام (السلامة المرورية، قواعد المرور، إلخ)"""
+
+    section_id = models.CharField(
+        max_length=100,
+        unique=True,
+        verbose_name="معرف القسم"
+    )
+    name_ar = models.CharField(
+        max_length=200,
+        verbose_name="الاسم بالعربية"
+    )
+    name_en = models.CharField(
+        max_length=200,
+        blank=True,
+        verbose_name="الاسم بالإنجليزية"
+    )
+    description_ar = models.TextField(
+        verbose_name="الوصف بالعربية"
+    )
+    description_en = models.TextField(
+        blank=True,
+        verbose_name="الوصف بالإنجليزية"
+    )
+    question_count = models.IntegerField(
+        default=0,
+        verbose_name="عدد الأسئلة"
+    )
+    color = models.CharField(
+        max_length=50,
+        default='bg-blue-500',
+        verbose_name="اللون"
+    )
+    order = models.IntegerField(
+        default=0,
+        verbose_name="الترتيب"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "قسم"
+        verbose_name_plural = "الأقسام"
+        ordering = ['order', 'section_id']
+
+    def __str__(self):
+        return self.name_ar
+
+
+class Question(models.Model):
+    """نموذج الأسئلة"""
+
+    section = models.ForeignKey(
+        Section,
+        on_delete=models.CASCADE,
+        related_name='questions',
+        verbose_name="القسم"
+    )
+    question_id = models.CharField(
+        max_length=50,
+        unique=True,
+        verbose_name="معرف السؤال"
+    )
+    text_ar = models.TextField(
+        verbose_name="نص السؤال بالعربية"
+    )
+    text_en = models.TextField(
+        blank=True,
+        verbose_name="نص السؤال بالإنجليزية"
+    )
+    text_sv = models.TextField(
+        blank=True,
+        verbose_name="نص السؤال بالسويدية"
+    )
+
+    # الخيارات كـ JSON
+    options_ar = models.JSONField(
+        verbose_name="الخيارات بالعربية"
+    )
+    options_en = models.JSONField(
+        blank=True,
+        null=True,
+        verbose_name="الخيارات بالإنجليزية"
+    )
+    options_sv = models.JSONField(
+        blank=True,
+        null=True,
+        verbose_name="الخيارات بالسويدية"
+    )
+
+    correct_answer = models.IntegerField(
+        verbose_name="رقم الإجابة الصحيحة (0-3)"
+    )
+
+    explanation_ar = models.TextField(
+        verbose_name="الشرح بالعربية"
+    )
+    explanation_en = models.TextField(
+        blank=True,
+        verbose_name="الشرح بالإنجليزية"
+    )
+    explanation_sv = models.TextField(
+        blank=True,
+        verbose_name="الشرح بالسويدية"
+    )
+
+    image_url = models.URLField(
+        blank=True,
+        verbose_name="رابط الصورة"
+    )
+    image = models.ImageField(
+        upload_to='questions/',
+        blank=True,
+        null=True,
+        verbose_name="صورة السؤال"
+    )
+
+    difficulty = models.CharField(
+        max_length=20,
+        choices=[
+            ('easy', 'سهل'),
+            ('medium', 'متوسط'),
+            ('hard', 'صعب'),
+        ],
+        default='medium',
+        verbose_name="مستوى الصعوبة"
+    )
+
+    is_active = models.BooleanField(
+        default=True,
+        verbose_name="نشط"
+    )
+
+    # نص مُطبّع لكل الحقول النصية (يُحدّث عند الحفظ والاستيراد)
+    # في PostgreSQL يُولّد منه عمود search_vector مع فهرس GIN
+    search_text = models.TextField(
+        blank=True,
+        default='',
+        editable=False,
+        verbose_name="نص البحث"
+    )
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "سؤال"
+        verbose_name_plural = "الأسئلة"
+        ordering = ['section', 'question_id']
+        indexes = [
+            # أسئلة القسم النشطة (by_section، إنشاء المحاولات، فهرس المجمّع)
+            models.Index(
+                fields=['section', 'question_id'],
+                condition=models.Q(is_active=True),
+                name='question_active_section_idx'
+            ),
+            # إحصائيات الأقسام حسب الصعوبة
+            models.Index(
+                fields=['section', 'difficulty'],
+                condition=models.Q(is_active=True),
+                name='question_active_diff_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.question_id} - {self.text_ar[:50]}"
+
+    def save(self, *args, **kwargs):
+        self.search_text = build_search_text(self)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and set(update_fields) & set(SEARCH_SOURCE_FIELDS):
+            kwargs['update_fields'] = {*update_fields, 'search_text'}
+        super().save(*args, **kwargs)
+
+
+class QuestionBankVersion(models.Model):
+    """رقم إصدار بنك الأسئلة (صف واحد) المشترك بين كل العمليات"""
+
+    SINGLETON_PK = 1
+
+    version = models.BigIntegerField(
+        verbose_name="رقم الإصدار"
+    )
+    modified_at = models.DateTimeField(
+        verbose_name="وقت آخر تعديل"
+    )
+
+    class Meta:
+        verbose_name = "إصدار بنك الأسئلة"
+        verbose_name_plural = "إصدار بنك الأسئلة"
+
+    def __str__(self):
+        return f"الإصدار {self.version}"
+
+
+def pack_ids(ids):
+    """ضغط قائمة معرفات في مصفوفة int64 (little-endian)"""
+    packed = array('q', ids)
+    if sys.byteorder == 'big':
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def unpack_ids(data):
+    """فك ضغط مصفوفة معرفات int64"""
+    ids = array('q')
+    ids.frombytes(bytes(data))
+    if sys.byteorder == 'big':
+        ids.byteswap()
+    return ids.tolist()
+
+
+class TestAttempt(models.Model):
+    """محاولات الاختبار"""
+
+    TEST_TYPES = [
+        ('full', 'اختبار كامل (65 سؤال)'),
+        ('section', 'اختبار قسم محدد'),
+    ]
+
+    test_type = models.CharField(
+        max_length=20,
+        choices=TEST_TYPES,
+        verbose_name="نوع الاختبار"
+    )
+    section = models.ForeignKey(
+        Section,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        verbose_name="القسم (إن وجد)"
+    )
+    with_timer = models.BooleanField(
+        default=False,
+        verbose_name="مع مؤقت"
+    )
+
+    started_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name="وقت البدء"
+    )
+    completed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="وقت الإنهاء"
+    )
+
+    total_questions = models.IntegerField(
+        verbose_name="إجمالي الأسئلة"
+    )
+    answered_questions = models.IntegerField(
+        default=0,
+        verbose_name="الأسئلة المجابة"
+    )
+    correct_answers = models.IntegerField(
+        default=0,
+        verbose_name="الإجابات الصحيحة"
+    )
+
+    score_percentage = models.FloatField(
+        default=0.0,
+        verbose_name="النسبة المئوية"
+    )
+    passed = models.BooleanField(
+        default=False,
+        verbose_name="ناجح"
+    )
+
+    time_taken_seconds = models.IntegerField(
+        null=True,
+        blank=True,
+        verbose_name="الوقت المستغرق (بالثواني)"
+    )
+
+    # نسخة الاختبار الصادرة: معرفات الأسئلة (int64 مضغوطة) ومفاتيح الإجابات (بايت لكل سؤال)
+    snapshot_question_ids = models.BinaryField(
+        null=True,
+        blank=True,
+        verbose_name="معرفات أسئلة الاختبار"
+    )
+    snapshot_answer_keys = models.BinaryField(
+        null=True,
+        blank=True,
+        verbose_name="مفاتيح الإجابات"
+    )
+    exam_seed = models.BigIntegerField(
+        null=True,
+        blank=True,
+        verbose_name="بذرة توليد الاختبار"
+    )
+    pool_version = models.BigIntegerField(
+        null=True,
+        blank=True,
+        verbose_name="إصدار بنك الأسئلة"
+    )
+
+    # معلومات إضافية
+    user_ip = models.GenericIPAddressField(
+        null=True,
+        blank=True,
+        verbose_name="IP المستخدم"
+    )
+    user_agent = models.TextField(
+        blank=True,
+        verbose_name="معلومات المتصفح"
+    )
+
+    class Meta:
+        verbose_name = "محاولة اختبار"
+        verbose_name_plural = "محاولات الاختبار"
+        ordering = ['-started_at']
+        indexes = [
+            # قائمة المحاولات مرتبة من الأحدث
+            models.Index(fields=['-started_at'], name='attempt_started_idx'),
+            # المحاولات المكتملة حسب التاريخ (إعادة بناء الإحصائيات والتصدير)
+            models.Index(
+                fields=['completed_at'],
+                condition=models.Q(completed_at__isnull=False),
+                name='attempt_completed_idx'
+            ),
+            # المحاولات المكتملة حسب النوع والنجاح
+            models.Index(
+                fields=['test_type', 'passed'],
+                condition=models.Q(completed_at__isnull=False),
+                name='attempt_completed_type_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f"محاولة #{self.id} - {self.get_test_type_display()}"
+
+    def calculate_results(self, answered_questions=None, correct_answers=None):
+        """حساب النتائج (يمكن تمرير الأعداد المحسوبة مسبقاً لتجنب الاستعلامات)"""
+        if answered_questions is None:
+            answered_questions = self.answers.count()
+        if correct_answers is None:
+            correct_answers = self.answers.filter(is_correct=True).count()
+
+        self.answered_questions = answered_questions
+        self.correct_answers = correct_answers
+        self.score_percentage = (self.correct_answers / self.total_questions) * 100
+
+        # تحديد النجاح
+        if self.test_type == 'full':
+            self.passed = self.correct_answers >= 52
+        else:
+            self.passed = self.correct_answers >= (self.total_questions * 0.8)
+
+        # حساب الوقت المستغرق
+        if self.completed_at and self.started_at:
+            time_delta = self.completed_at - self.started_at
+            self.time_taken_seconds = int(time_delta.total_seconds())
+
+        self.save()
+
+    def set_snapshot(self, question_ids, answer_keys, seed=None, pool_version=None):
+        """حفظ نسخة مضغوطة من أسئلة الاختبار الصادرة ومفاتيح إجاباتها"""
+        self.snapshot_question_ids = pack_ids(question_ids)
+        self.snapshot_answer_keys = bytes(answer_keys)
+        self.exam_seed = seed
+        self.pool_version = pool_version
+        self.total_questions = len(question_ids)
+
+    @property
+    def has_snapshot(self):
+        return self.snapshot_question_ids is not None
+
+    def get_question_ids(self):
+        """معرفات أسئلة الاختبار بالترتيب الذي صدرت به"""
+        if not self.has_snapshot:
+            return []
+        return unpack_ids(self.snapshot_question_ids)
+
+    def get_answer_keys(self, question_ids):
+        """
+        الإجابات الصحيحة للأسئلة المطلوبة {معرف السؤال: الإجابة}
+        من النسخة المحفوظة دون استعلام، أو من جدول الأسئلة للمحاولات القديمة
+        الأسئلة غير الموجودة في الاختبار لا تظهر في النتيجة
+        """
+        if not self.has_snapshot:
+            return dict(
+                Question.objects.filter(id__in=list(question_ids)).order_by().values_list(
+                    'id', 'correct_answer'
+                )
+            )
+        keys = dict(zip(self.get_question_ids(), bytes(self.snapshot_answer_keys)))
+        return {pk: keys[pk] for pk in question_ids if pk in keys}
+
+    def record_answers(self, selected_answers, time_spent=None):
+        """
+        تسجيل مجموعة من الإجابات وتحديث العدادات الجارية
+        - selected_answers: قاموس {معرف السؤال: الإجابة المختارة}
+        - time_spent: قاموس {معرف السؤال: الوقت المستغرق بالثواني} (اختياري)
+        الإجابة على سؤال سبق تسجيله تستبدل الإجابة السابقة.
+        يُرجع None (دون حفظ أي إجابة) إذا كانت المحاولة مكتملة مسبقاً
+        """
+        time_spent = time_spent or {}
+
+        with transaction.atomic():
+            # قفل المحاولة وإعادة التحقق بعده، فقد يُنهيها طلب آخر بعد قراءتها
+            counters = TestAttempt.objects.select_for_update().only(
+                'completed_at', 'answered_questions', 'correct_answers'
+            ).get(pk=self.pk)
+            if counters.completed_at is not None:
+                return None
+
+            answer_keys = self.get_answer_keys(selected_answers)
+            existing = {
+                answer.question_id: answer
+                for answer in self.answers.filter(question_id__in=list(answer_keys)).order_by()
+            }
+
+            new_answers = []
+            changed_answers = []
+            answered_delta = 0
+            correct_delta = 0
+            # إجابات تُضاف إلى إحصائيات الأسئلة وإجابات سابقة تُطرح منها
+            added_answers = []
+            removed_answers = []
+
+            for question_id, selected_answer in selected_answers.items():
+                correct_answer = answer_keys.get(question_id)
+                if correct_answer is None:
+                    continue
+
+                is_correct = correct_answer == selected_answer
+                answer = existing.get(question_id)
+
+                if answer is None:
+                    new_answers.append(TestAnswer(
+                        attempt=self,
+                        question_id=question_id,
+                        selected_answer=selected_answer,
+                        is_correct=is_correct,
+                        time_spent_seconds=time_spent.get(question_id)
+                    ))
+                    answered_delta += 1
+                    correct_delta += int(is_correct)
+                    added_answers.append(new_answers[-1])
+                else:
+                    correct_delta += int(is_correct) - int(answer.is_correct)
+                    removed_answers.append(TestAnswer(
+                        question_id=question_id,
+                        selected_answer=answer.selected_answer,
+                        is_correct=answer.is_correct,
+                        time_spent_seconds=answer.time_spent_seconds
+                    ))
+                    answer.selected_answer = selected_answer
+                    answer.is_correct = is_correct
+                    if question_id in time_spent:
+                        answer.time_spent_seconds = time_spent[question_id]
+                    changed_answers.append(answer)
+                    added_answers.append(answer)
+
+            TestAnswer.objects.bulk_create(new_answers)
+            if changed_answers:
+                TestAnswer.objects.bulk_update(
+                    changed_answers,
+                    ['selected_answer', 'is_correct', 'time_spent_seconds']
+                )
+            QuestionStatistics.record(added_answers, removed_answers)
+
+            self.answered_questions = counters.answered_questions + answered_delta
+            self.correct_answers = counters.correct_answers + correct_delta
+            if answered_delta or correct_delta:
+                self.save(update_fields=['answered_questions', 'correct_answers'])
+
+        return new_answers + changed_answers
+
+    def finalize(self):
+        """
+        إنهاء المحاولة باستخدام العدادات الجارية دون إعادة التصحيح
+        يُرجع False إذا أنهاها طلب آخر قبل ذلك (فلا تُحسب مرتين في الإحصائيات)
+        """
+        with transaction.atomic():
+            # قفل المحاولة وإعادة التحقق بعده لتسلسل طلبات الإنهاء المتزامنة
+            current = TestAttempt.objects.select_for_update().only(
+                'completed_at', 'answered_questions', 'correct_answers'
+            ).get(pk=self.pk)
+            if current.completed_at is not None:
+                return False
+
+            self.completed_at = timezone.now()
+            self.calculate_results(
+                answered_questions=current.answered_questions,
+                correct_answers=current.correct_answers
+            )
+            AttemptStatistics.record(self)
+        return True
+
+    def submit_answers(self, selected_answers):
+        """
+        تصحيح الإجابات وحفظها وإنهاء المحاولة في معاملة واحدة
+        يُرجع False (دون حفظ أي إجابة) إذا كانت المحاولة مكتملة مسبقاً
+        """
+        with transaction.atomic():
+            if self.record_answers(selected_answers) is None or not self.finalize():
+                transaction.set_rollback(True)
+                return False
+        return True
+
+
+class TestAnswer(models.Model):
+    """إجابات الأسئلة"""
+
+    attempt = models.ForeignKey(
+        TestAttempt,
+        on_delete=models.CASCADE,
+        related_name='answers',
+        verbose_name="المحاولة"
+    )
+    question = models.ForeignKey(
+        Question,
+        on_delete=models.CASCADE,
+        verbose_name="السؤال"
+    )
+    selected_answer = models.IntegerField(
+        verbose_name="الإجابة المختارة"
+    )
+    is_correct = models.BooleanField(
+        verbose_name="صحيحة"
+    )
+    answered_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name="وقت الإجابة"
+    )
+    time_spent_seconds = models.IntegerField(
+        null=True,
+        blank=True,
+        verbose_name="الوقت المستغرق (بالثواني)"
+    )
+
+    class Meta:
+        verbose_name = "إجابة"
+        verbose_name_plural = "الإجابات"
+        ordering = ['answered_at']
+        unique_together = ['attempt', 'question']
+
+    def __str__(self):
+        return f"{self.attempt.id} - {self.question.question_id}"
+
+
+class AttemptCounters(models.Model):
+    """عدادات مجمعة لمحاولات الاختبار المكتملة"""
+
+    total_attempts = models.IntegerField(
+        default=0,
+        verbose_name="إجمالي المحاولات"
+    )
+    passed_attempts = models.IntegerField(
+        default=0,
+        verbose_name="المحاولات الناجحة"
+    )
+    full_test_attempts = models.IntegerField(
+        default=0,
+        verbose_name="محاولات الاختبار الكامل"
+    )
+
+    class Meta:
+        abstract = True
+
+    def as_dict(self):
+        total = self.total_attempts
+        return {
+            'total_attempts': total,
+            'passed_attempts': self.passed_attempts,
+            'failed_attempts': total - self.passed_attempts,
+            'pass_rate': (self.passed_attempts / total * 100) if total > 0 else 0,
+            'full_test_attempts': self.full_test_attempts,
+        }
+
+
+class AttemptStatistics(AttemptCounters):
+    """الإحصائيات العامة المجمعة (صف واحد)"""
+
+    TOTALS_PK = 1
+
+    class Meta:
+        verbose_name = "إحصائيات المحاولات"
+        verbose_name_plural = "إحصائيات المحاولات"
+
+    def __str__(self):
+        return f"إجمالي المحاولات: {self.total_attempts}"
+
+    @classmethod
+    def get_totals(cls):
+        """الإحصائيات العامة باستعلام واحد بالمفتاح الأساسي"""
+        return cls.objects.filter(pk=cls.TOTALS_PK).first() or cls(pk=cls.TOTALS_PK)
+
+    @classmethod
+    def record(cls, attempt):
+        """إضافة محاولة مكتملة إلى الإحصائيات العامة واليومية"""
+        values = {
+            'total_attempts': F('total_attempts') + 1,
+            'passed_attempts': F('passed_attempts') + int(attempt.passed),
+            'full_test_attempts': F('full_test_attempts') + int(attempt.test_type == 'full'),
+        }
+        day = timezone.localdate(attempt.completed_at)
+
+        for model, lookup in ((cls, {'pk': cls.TOTALS_PK}), (DailyAttemptStatistics, {'day': day})):
+            # في الغالب يكفي تحديث واحد؛ يُنشأ الصف عند أول محاولة فقط
+            if not model.objects.filter(**lookup).update(**values):
+                model.objects.get_or_create(**lookup)
+                model.objects.filter(**lookup).update(**values)
+
+
+class DailyAttemptStatistics(AttemptCounters):
+    """الإحصائيات اليومية المجمعة للمحاولات المكتملة"""
+
+    day = models.DateField(
+        unique=True,
+        verbose_name="اليوم"
+    )
+
+    class Meta:
+        verbose_name = "إحصائيات يومية"
+        verbose_name_plural = "الإحصائيات اليومية"
+        ordering = ['-day']
+
+    def __str__(self):
+        return f"{self.day} - {self.total_attempts}"
+
+    @classmethod
+    def get_window(cls, days):
+        """مجموع إحصائيات آخر عدد من الأيام"""
+        since = timezone.localdate() - timedelta(days=days - 1)
+        totals = cls.objects.filter(day__gte=since).aggregate(
+            total_attempts=Sum('total_attempts'),
+            passed_attempts=Sum('passed_attempts'),
+            full_test_attempts=Sum('full_test_attempts'),
+        )
+        return cls(**{key: value or 0 for key, value in totals.items()})
+
+
+# أقصى عدد خيارات للسؤال (حد أرقام الخيارات المقبولة في الإجابات وتوزيعها)
+MAX_OPTIONS = 16
+
+# حدود مدرج زمن الإجابة بالثواني (الخانة الأخيرة لما بعد آخر حد)
+ANSWER_TIME_BUCKETS = (5, 10, 15, 20, 30, 45, 60, 90, 120, 180, 300)
+
+
+def histogram_median(counts, bounds=ANSWER_TIME_BUCKETS):
+    """الوسيط التقريبي من مدرج تكراري (استيفاء خطي داخل الخانة)"""
+    total = sum(counts)
+    if not total:
+        return None
+    half = total / 2
+    cumulative = 0
+    for i, count in enumerate(counts):
+        if cumulative + count >= half and count:
+            if i >= len(bounds):
+                return float(bounds[-1])
+            lower = bounds[i - 1] if i else 0
+            return lower + (bounds[i] - lower) * (half - cumulative) / count
+        cumulative += count
+    return float(bounds[-1])
+
+
+def time_bucket(seconds, bounds=ANSWER_TIME_BUCKETS):
+    """رقم خانة المدرج لزمن إجابة"""
+    for i, bound in enumerate(bounds):
+        if seconds <= bound:
+            return i
+    return len(bounds)
+
+
+class QuestionStatistics(models.Model):
+    """
+    إحصائيات مجمعة لكل سؤال تُحدّث مع كل إجابة:
+    عدد الإجابات والصحيحة منها، توزيع الخيارات المختارة، ومدرج زمن الإجابة
+    """
+
+    question = models.OneToOneField(
+        Question,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='statistics',
+        verbose_name="السؤال"
+    )
+    answered_count = models.IntegerField(
+        default=0,
+        verbose_name="عدد الإجابات"
+    )
+    correct_count = models.IntegerField(
+        default=0,
+        verbose_name="الإجابات الصحيحة"
+    )
+    option_counts = models.JSONField(
+        default=list,
+        verbose_name="عدد مرات اختيار كل خيار"
+    )
+    time_histogram = models.JSONField(
+        default=list,
+        verbose_name="مدرج زمن الإجابة"
+    )
+    percent_correct = models.FloatField(
+        null=True,
+        blank=True,
+        db_index=True,
+        verbose_name="نسبة الإجابات الصحيحة"
+    )
+    median_time_seconds = models.FloatField(
+        null=True,
+        blank=True,
+        verbose_name="الوسيط التقريبي لزمن الإجابة"
+    )
+
+    class Meta:
+        verbose_name = "إحصائيات سؤال"
+        verbose_name_plural = "إحصائيات الأسئلة"
+
+    def __str__(self):
+        return f"{self.question_id} - {self.correct_count}/{self.answered_count}"
+
+    @property
+    def error_rate(self):
+        if not self.answered_count:
+            return None
+        return 1 - self.correct_count / self.answered_count
+
+    def add(self, selected_answer, is_correct, time_spent_seconds=None, sign=1):
+        """إضافة إجابة (أو طرحها مع sign=-1) دون حفظ"""
+        self.answered_count += sign
+        self.correct_count += sign * int(is_correct)
+
+        option_counts = list(self.option_counts or [])
+        # رقم خيار خارج النطاق (إجابات قديمة) يُحسب في العدد دون التوزيع
+        if 0 <= selected_answer < MAX_OPTIONS:
+            if selected_answer >= len(option_counts):
+                option_counts.extend([0] * (selected_answer + 1 - len(option_counts)))
+            option_counts[selected_answer] += sign
+        # بدون أصفار في النهاية حتى يطابق الناتج إعادة البناء من الإجابات
+        while option_counts and not option_counts[-1]:
+            option_counts.pop()
+        self.option_counts = option_counts
+
+        if time_spent_seconds is not None:
+            histogram = list(self.time_histogram or [0] * (len(ANSWER_TIME_BUCKETS) + 1))
+            histogram[time_bucket(time_spent_seconds)] += sign
+            self.time_histogram = histogram
+
+    def update_summary(self):
+        """تحديث الأعمدة المشتقة المستخدمة في الترتيب"""
+        self.percent_correct = (
+            self.correct_count / self.answered_count * 100 if self.answered_count > 0 else None
+        )
+        self.median_time_seconds = histogram_median(self.time_histogram or [])
+
+    def as_dict(self):
+        return {
+            'answered_count': self.answered_count,
+            'correct_count': self.correct_count,
+            'percent_correct': self.percent_correct,
+            'option_distribution': list(self.option_counts or []),
+            'median_time_seconds': self.median_time_seconds,
+        }
+
+    @classmethod
+    def record(cls, added, removed=()):
+        """
+        إضافة إجابات (TestAnswer) وطرح إجابات سابقة مستبدلة
+        تُقفل صفوف الأسئلة بترتيب المعرف ثم تُحفظ باستعلام واحد
+        """
+        question_ids = sorted({answer.question_id for answer in chain(added, removed)})
+        if not question_ids:
+            return
+
+        def locked(ids):
+            return cls.objects.select_for_update().filter(question_id__in=ids).order_by('question_id')
+
+        rows = {row.question_id: row for row in locked(question_ids)}
+        missing = [pk for pk in question_ids if pk not in rows]
+        if missing:
+            # أول إجابة على بعض الأسئلة
+            cls.objects.bulk_create([cls(question_id=pk) for pk in missing], ignore_conflicts=True)
+            rows.update((row.question_id, row) for row in locked(missing))
+
+        for sign, answers in ((-1, removed), (1, added)):
+            for answer in answers:
+                rows[answer.question_id].add(
+                    answer.selected_answer,
+                    answer.is_correct,
+                    answer.time_spent_seconds,
+                    sign
+                )
+        for row in rows.values():
+            row.update_summary()
+
+        cls.objects.bulk_update(rows.values(), [
+            'answered_count',
+            'correct_count',
+            'option_counts',
+            'time_histogram',
+            'percent_correct',
+            'median_time_seconds',
+        ])
+
+
+class ArchivedAttempt(models.Model):
+    """
+    محاولة مكتملة قديمة منقولة من الجداول الساخنة
+    الإجابات مضغوطة في حقل واحد (أو في ملف JSONL مضغوط عند archive_file)
+    """
+
+    id = models.BigIntegerField(
+        primary_key=True,
+        verbose_name="معرف المحاولة الأصلي"
+    )
+    test_type = models.CharField(
+        max_length=20,
+        choices=TestAttempt.TEST_TYPES,
+        verbose_name="نوع الاختبار"
+    )
+    section = models.ForeignKey(
+        Section,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        verbose_name="القسم (إن وجد)"
+    )
+    with_timer = models.BooleanField(
+        default=False,
+        verbose_name="مع مؤقت"
+    )
+    started_at = models.DateTimeField(
+        verbose_name="وقت البدء"
+    )
+    completed_at = models.DateTimeField(
+        db_index=True,
+        verbose_name="وقت الإنهاء"
+    )
+    total_questions = models.IntegerField(
+        verbose_name="إجمالي الأسئلة"
+    )
+    answered_questions = models.IntegerField(
+        default=0,
+        verbose_name="الأسئلة المجابة"
+    )
+    correct_answers = models.IntegerField(
+        default=0,
+        verbose_name="الإجابات الصحيحة"
+    )
+    score_percentage = models.FloatField(
+        default=0.0,
+        verbose_name="النسبة المئوية"
+    )
+    passed = models.BooleanField(
+        default=False,
+        verbose_name="ناجح"
+    )
+    time_taken_seconds = models.IntegerField(
+        null=True,
+        blank=True,
+        verbose_name="الوقت المستغرق (بالثواني)"
+    )
+    exam_seed = models.BigIntegerField(
+        null=True,
+        blank=True,
+        verbose_name="بذرة توليد الاختبار"
+    )
+    # (معرف السؤال int64، الإجابة int8، صحيحة int8، الوقت int32) لكل إجابة
+    answers = models.BinaryField(
+        null=True,
+        blank=True,
+        verbose_name="الإجابات المضغوطة"
+    )
+    archive_file = models.CharField(
+        max_length=255,
+        blank=True,
+        verbose_name="ملف الأرشيف"
+    )
+    archived_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name="وقت الأرشفة"
+    )
+
+    class Meta:
+        verbose_name = "محاولة مؤرشفة"
+        verbose_name_plural = "المحاولات المؤرشفة"
+        ordering = ['-completed_at']
+
+    def __str__(self):
+        return f"محاولة مؤرشفة #{self.id}"
@@ -0,0 +1,106 @@
+"""
+تفاوض شكل بيانات الأسئلة
+
+- lang=ar|en|sv: إرجاع لغة واحدة فقط من الحقول متعددة اللغات
+  (text_* و options_* و explanation_*)
+- fields=id,text_ar,...: إرجاع الحقول المطلوبة فقط
+- layout=columnar: قائمة الأسئلة كأعمدة {"columns": [...], "rows": [[...], ...]}
+  بدلاً من تكرار أسماء الحقول في كل عنصر
+- MessagePack (application/msgpack أو format=msgpack) إذا كانت مكتبة msgpack مثبتة
+"""
+from rest_framework.exceptions import ValidationError
+from rest_framework.renderers import BaseRenderer
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+LANGUAGES = ('ar', 'en', 'sv')
+LOCALIZED_FIELDS = ('text', 'options', 'explanation')
+COLUMNAR = 'columnar'
+
+
+class QuestionShape:
+    """اللغة والحقول والتخطيط المطلوبة لبيانات الأسئلة"""
+
+    __slots__ = ('lang', 'fields', 'layout')
+
+    def __init__(self, lang=None, fields=None, layout=None):
+        self.lang = lang
+        self.fields = fields
+        self.layout = layout
+
+    @property
+    def is_default(self):
+        return self.lang is None and self.fields is None
+
+    @property
+    def key(self):
+        """جزء من مفتاح الذاكرة المؤقتة يميز هذا الشكل"""
+        if self.is_default:
+            return 'default'
+        return f"{self.lang or '*'}:{','.join(self.fields or ('*',))}"
+
+    @classmethod
+    def from_request(cls, request):
+        params = request.query_params
+
+        lang = params.get('lang') or None
+        if lang is not None and lang not in LANGUAGES:
+            raise ValidationError({'lang': f"اللغة غير مدعومة، المتاح: {', '.join(LANGUAGES)}"})
+
+        fields = params.get('fields') or None
+        if fields is not None:
+            fields = tuple(dict.fromkeys(name.strip() for name in fields.split(',') if name.strip()))
+
+        layout = params.get('layout') or None
+        if layout is not None and layout != COLUMNAR:
+            raise ValidationError({'layout': f'التخطيط المدعوم: {COLUMNAR}'})
+
+        return cls(lang, fields, layout)
+
+
+def select_fields(serializer_fields, shape):
+    """حذف الحقول غير المطلوبة من قاموس حقول المُسلسِل حسب اللغة والحقول"""
+    if shape.lang is not None:
+        for base in LOCALIZED_FIELDS:
+            for other in LANGUAGES:
+                if other != shape.lang:
+                    serializer_fields.pop(f'{base}_{other}', None)
+
+    if shape.fields is not None:
+        unknown = [name for name in shape.fields if name not in serializer_fields]
+        if unknown:
+            raise ValidationError({'fields': f"حقول غير معروفة: {', '.join(unknown)}"})
+        for name in list(serializer_fields):
+            if name not in shape.fields:
+                serializer_fields.pop(name)
+
+
+def to_columnar(items):
+    """تحويل قائمة كائنات متشابهة إلى أعمدة وصفوف"""
+    columns = list(items[0]) if items else []
+    return {
+        'columns': columns,
+        'rows': [[item.get(column) for column in columns] for item in items],
+    }
+
+
+class MessagePackRenderer(BaseRenderer):
+    """ترميز MessagePack (يتطلب مكتبة msgpack)"""
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, use_bin_type=True, default=str)
+
+
+def compact_renderer_classes():
+    """المُرمّزات الإضافية المتاحة حسب المكتبات المثبتة"""
+    return [MessagePackRenderer] if msgpack is not None else []
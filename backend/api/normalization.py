@@ -0,0 +1,77 @@
+"""
+تطبيع نصوص الأسئلة للبحث والمقارنة
+
+- حذف التشكيل (الحركات والشدة والسكون والألف الخنجرية) والتطويل
+- توحيد أشكال الألف (أ إ آ ٱ -> ا) والياء (ى ئ -> ي) والواو (ؤ -> و)
+  والتاء المربوطة (ة -> ه)
+- تحويل الأحرف اللاتينية إلى صغيرة (casefold)
+- الكلمات هي تتابعات الحروف والأرقام فقط، وتُحذف منها أداة التعريف
+  (ال، وال، بال، كال، فال، لل) إذا بقي حرفان على الأقل
+"""
+import re
+
+
+DIACRITICS_RE = re.compile('[\u064B-\u065F\u0670\u0640]')
+
+# (الحرف، بديله)؛ str.replace أسرع بكثير من translate مع الحروف العربية
+ARABIC_FOLDING = (
+    ('أ', 'ا'),
+    ('إ', 'ا'),
+    ('آ', 'ا'),
+    ('ٱ', 'ا'),
+    ('ى', 'ي'),
+    ('ئ', 'ي'),
+    ('ؤ', 'و'),
+    ('ة', 'ه'),
+)
+
+# أدوات التعريف المتصلة (الأطول أولاً)
+ARTICLE_PREFIXES = ('وال', 'بال', 'كال', 'فال', 'لل', 'ال')
+
+# كلمة (حروف وأرقام) مع حذف أداة التعريف إذا تبعها حرفان على الأقل
+TOKEN_RE = re.compile(r'(?:(?:%s)(?=[^\W_]{2}))?([^\W_]+)' % '|'.join(ARTICLE_PREFIXES))
+
+# الحقول النصية للسؤال بكل اللغات (الخيارات قوائم نصوص)
+SEARCH_SOURCE_FIELDS = [
+    'text_ar',
+    'text_en',
+    'text_sv',
+    'options_ar',
+    'options_en',
+    'options_sv',
+    'explanation_ar',
+    'explanation_en',
+    'explanation_sv',
+]
+
+
+def normalize_text(text):
+    """تطبيع نص واحد (التشكيل وأشكال الحروف وحالة الأحرف)"""
+    text = DIACRITICS_RE.sub('', text or '')
+    for letter, replacement in ARABIC_FOLDING:
+        if letter in text:
+            text = text.replace(letter, replacement)
+    return text.casefold()
+
+
+def tokenize(text):
+    """كلمات النص بعد التطبيع (التوقف، للتوقف -> توقف)"""
+    return TOKEN_RE.findall(normalize_text(text))
+
+
+def _field_text(value):
+    if isinstance(value, (list, tuple)):
+        return ' '.join(str(item) for item in value if item)
+    return value or ''
+
+
+def build_search_text(question):
+    """
+    النص المُطبّع لكل حقول السؤال النصية (كلمات مفصولة بمسافة)
+    question: كائن Question أو قاموس بأسماء الحقول
+    """
+    if isinstance(question, dict):
+        values = [question.get(field) for field in SEARCH_SOURCE_FIELDS]
+    else:
+        values = [getattr(question, field, None) for field in SEARCH_SOURCE_FIELDS]
+    return ' '.join(tokenize(' '.join(_field_text(value) for value in values)))
@@ -0,0 +1,72 @@
+import json
+
+from django.db import connections
+from rest_framework.pagination import CursorPagination
+
+
+TRUE_VALUES = ('1', 'true', 'yes', 'on')
+
+
+def estimate_count(queryset):
+    """
+    عدد تقريبي لصفوف الاستعلام دون COUNT(*) كامل
+    - PostgreSQL بدون شروط: reltuples من pg_class
+    - PostgreSQL مع شروط: تقدير المخطط من EXPLAIN
+    - غير ذلك: العدد الفعلي
+    يرجع (العدد، هل هو تقريبي)
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return queryset.count(), False
+
+    if not queryset.query.where:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+                [queryset.model._meta.db_table]
+            )
+            row = cursor.fetchone()
+        if row and row[0] >= 0:
+            return row[0], True
+    else:
+        plan = json.loads(queryset.order_by().explain(format='json'))
+        return int(plan[0]['Plan']['Plan Rows']), True
+
+    return queryset.count(), False
+
+
+class KeysetPagination(CursorPagination):
+    """
+    ترقيم بالمؤشر (keyset) بدلاً من OFFSET، بزمن ثابت لكل صفحة
+    - include_count=1: إضافة عدد تقريبي للنتائج (اختياري)
+    """
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+    include_count_query_param = 'include_count'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.count = None
+        self.count_is_approximate = False
+
+        include_count = request.query_params.get(self.include_count_query_param, '')
+        if include_count.lower() in TRUE_VALUES:
+            self.count, self.count_is_approximate = estimate_count(queryset)
+
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        if self.count is not None:
+            response.data['count'] = self.count
+            response.data['count_is_approximate'] = self.count_is_approximate
+        return response
+
+
+class AttemptPagination(KeysetPagination):
+    """ترقيم المحاولات من الأحدث إلى الأقدم"""
+    ordering = ('-started_at', '-id')
+
+
+class QuestionPagination(KeysetPagination):
+    """ترقيم الأسئلة حسب معرف السؤال"""
+    ordering = ('question_id',)
@@ -0,0 +1,155 @@
+"""
+مخزن مؤقت لبيانات الأسئلة المحوّلة مسبقاً
+
+يحتفظ بنص JSON الجاهز لكل سؤال (بدون الإجابة الصحيحة) مفهرساً بمعرف
+السؤال ورقم إصدار بنك الأسئلة، مع طبقة LRU داخل العملية وطبقة ثانية
+قابلة للتبديل عبر إعداد CACHES في Django (locmem أو ملفات أو Redis).
+"""
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.renderers import JSONRenderer
+
+from .instrumentation import timed_serialization
+from .question_pool import (
+    get_pool_version,
+    aget_pool_version,
+    fetch_questions,
+    afetch_questions
+)
+from .serializers import QuestionWithoutAnswerSerializer
+
+
+renderer = JSONRenderer()
+
+
+def render_json(data):
+    """تحويل البيانات إلى JSON بنفس إعدادات DRF"""
+    return renderer.render(data)
+
+
+def render_with_fragments(envelope, key, fragments):
+    """دمج قائمة أجزاء JSON جاهزة داخل كائن JSON دون إعادة تحويلها"""
+    body = render_json(envelope)
+    separator = b',' if len(body) > 2 else b''
+    return b''.join([
+        body[:-1],
+        separator,
+        render_json(key),
+        b':[',
+        b','.join(fragments),
+        b']}',
+    ])
+
+
+class QuestionPayloadCache:
+    """ذاكرة مؤقتة لأجزاء JSON الخاصة بالأسئلة"""
+
+    key_prefix = 'question-payload'
+
+    def __init__(self, max_entries=None, backend_alias=None):
+        self.max_entries = max_entries or getattr(
+            settings, 'QUESTION_PAYLOAD_LRU_SIZE', 5000
+        )
+        self.backend_alias = backend_alias or getattr(
+            settings, 'QUESTION_PAYLOAD_CACHE_ALIAS', None
+        )
+        self.timeout = getattr(settings, 'QUESTION_PAYLOAD_CACHE_TIMEOUT', 24 * 60 * 60)
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    @property
+    def backend(self):
+        if not self.backend_alias:
+            return None
+        return caches[self.backend_alias]
+
+    def _make_key(self, version, pk, shape=None):
+        if shape is None or shape.is_default:
+            return f'{self.key_prefix}:{version}:{pk}'
+        return f'{self.key_prefix}:{version}:{shape.key}:{pk}'
+
+    def _get_local(self, keys):
+        found = {}
+        with self._lock:
+            for key in keys:
+                fragment = self._entries.get(key)
+                if fragment is not None:
+                    self._entries.move_to_end(key)
+                    found[key] = fragment
+        return found
+
+    def _set_local(self, items):
+        with self._lock:
+            for key, fragment in items.items():
+                self._entries[key] = fragment
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _render_fragments(self, questions, keys, shape=None):
+        rendered = {}
+        context = {'question_shape': shape}
+        with timed_serialization():
+            for question in questions:
+                data = QuestionWithoutAnswerSerializer(question, context=context).data
+                rendered[keys[question.pk]] = render_json(data)
+        return rendered
+
+    def render(self, question_ids, shape=None):
+        """إرجاع أجزاء JSON للأسئلة المطلوبة بنفس ترتيب المعرفات (shape: اللغة والحقول)"""
+        version = get_pool_version()
+        keys = {pk: self._make_key(version, pk, shape) for pk in question_ids}
+
+        found = self._get_local(keys.values())
+        missing = [key for key in keys.values() if key not in found]
+
+        backend = self.backend
+        if missing and backend is not None:
+            remote = backend.get_many(missing)
+            self._set_local(remote)
+            found.update(remote)
+
+        missing_ids = [pk for pk, key in keys.items() if key not in found]
+        if missing_ids:
+            rendered = self._render_fragments(fetch_questions(missing_ids), keys, shape)
+            self._set_local(rendered)
+            if backend is not None:
+                backend.set_many(rendered, timeout=self.timeout)
+            found.update(rendered)
+
+        return [found[keys[pk]] for pk in question_ids if keys[pk] in found]
+
+    async def arender(self, question_ids, shape=None):
+        """النسخة غير المتزامنة من render"""
+        version = await aget_pool_version()
+        keys = {pk: self._make_key(version, pk, shape) for pk in question_ids}
+
+        found = self._get_local(keys.values())
+        missing = [key for key in keys.values() if key not in found]
+
+        backend = self.backend
+        if missing and backend is not None:
+            remote = await backend.aget_many(missing)
+            self._set_local(remote)
+            found.update(remote)
+
+        missing_ids = [pk for pk, key in keys.items() if key not in found]
+        if missing_ids:
+            rendered = self._render_fragments(await afetch_questions(missing_ids), keys, shape)
+            self._set_local(rendered)
+            if backend is not None:
+                await backend.aset_many(rendered, timeout=self.timeout)
+            found.update(rendered)
+
+        return [found[keys[pk]] for pk in question_ids if keys[pk] in found]
+
+    def clear(self):
+        """مسح الطبقة المحلية"""
+        with self._lock:
+            self._entries.clear()
+
+
+question_payload_cache = QuestionPayloadCache()
@@ -0,0 +1,229 @@
+"""
+فهرس مجمّع الأسئلة داخل العملية
+
+يحتفظ بمصفوفة مضغوطة من معرفات الأسئلة النشطة لكل قسم، بحيث يتم
+السحب العشوائي على المعرفات فقط ثم جلب الأسئلة المختارة باستعلام واحد.
+يُعاد بناء الفهرس تلقائياً عند تغيّر رقم إصدار بنك الأسئلة.
+"""
+import random
+import threading
+import time
+from array import array
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Question, QuestionBankVersion
+
+
+# توزيع أسئلة الاختبار الكامل (65 سؤال) حسب القسم
+FULL_TEST_DISTRIBUTION = {
+    'traffic_safety': 16,
+    'traffic_rules': 32,
+    'environment': 5,
+    'vehicle_knowledge_and_manoeuvring': 7,
+    'personal_conditions': 5
+}
+
+
+class PoolVersion:
+    """
+    رقم إصدار بنك الأسئلة من الصف QuestionBankVersion في قاعدة البيانات،
+    فيراه كل العمليات والخوادم بغض النظر عن خلفية الذاكرة المؤقتة.
+    القيمة تُحفظ محلياً وتُعاد قراءتها بعد QUESTION_POOL_VERSION_TTL ثانية،
+    والعملية التي ترفع الإصدار ترى القيمة الجديدة فوراً.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._value = None
+        self._checked_at = 0.0
+
+    def _current(self):
+        ttl = getattr(settings, 'QUESTION_POOL_VERSION_TTL', 1.0)
+        if self._value is not None and time.monotonic() - self._checked_at < ttl:
+            return self._value
+        return None
+
+    def _store(self, version, modified_at):
+        value = (version, int(modified_at.timestamp()))
+        with self._lock:
+            self._value = value
+            self._checked_at = time.monotonic()
+        return value
+
+    def _queryset(self):
+        return QuestionBankVersion.objects.filter(pk=QuestionBankVersion.SINGLETON_PK)
+
+    def _defaults(self):
+        # قيمة ابتدائية فريدة حتى لا تتكرر أرقام إصدارات قديمة بعد حذف الصف
+        return {'version': time.time_ns(), 'modified_at': timezone.now()}
+
+    def get(self):
+        """(رقم الإصدار، وقت آخر تعديل بالثواني)"""
+        value = self._current()
+        if value is None:
+            row = self._queryset().values_list('version', 'modified_at').first()
+            if row is None:
+                obj, _ = QuestionBankVersion.objects.get_or_create(
+                    pk=QuestionBankVersion.SINGLETON_PK, defaults=self._defaults()
+                )
+                row = (obj.version, obj.modified_at)
+            value = self._store(*row)
+        return value
+
+    async def aget(self):
+        """النسخة غير المتزامنة من get"""
+        value = self._current()
+        if value is None:
+            row = await self._queryset().values_list('version', 'modified_at').afirst()
+            if row is None:
+                obj, _ = await QuestionBankVersion.objects.aget_or_create(
+                    pk=QuestionBankVersion.SINGLETON_PK, defaults=self._defaults()
+                )
+                row = (obj.version, obj.modified_at)
+            value = self._store(*row)
+        return value
+
+    def bump(self):
+        """رفع رقم الإصدار (ضمن معاملة التعديل إن وُجدت) وإرجاع الرقم الجديد"""
+        if not self._queryset().update(version=F('version') + 1, modified_at=timezone.now()):
+            QuestionBankVersion.objects.get_or_create(
+                pk=QuestionBankVersion.SINGLETON_PK, defaults=self._defaults()
+            )
+        row = self._queryset().values_list('version', 'modified_at').get()
+        return self._store(*row)[0]
+
+    def invalidate(self):
+        """إلغاء القيمة المحلية (القراءة التالية من قاعدة البيانات)"""
+        with self._lock:
+            self._value = None
+
+
+pool_version = PoolVersion()
+
+
+def get_pool_version():
+    """رقم إصدار بنك الأسئلة المشترك بين العمليات"""
+    return pool_version.get()[0]
+
+
+async def aget_pool_version():
+    """النسخة غير المتزامنة من get_pool_version"""
+    return (await pool_version.aget())[0]
+
+
+def get_pool_validators():
+    """(رقم الإصدار، وقت آخر تعديل بالثواني) لبنك الأسئلة بقراءة واحدة"""
+    return pool_version.get()
+
+
+def bump_pool_version():
+    """رفع رقم الإصدار لإجبار كل العمليات على إعادة بناء الفهرس"""
+    return pool_version.bump()
+
+
+class PoolState:
+    """
+    نسخة ثابتة من الفهرس: الإصدار، معرفات كل قسم، الإجابات الصحيحة،
+    قسم كل سؤال، وعدد خياراته
+    """
+
+    __slots__ = ('version', 'index', 'answer_keys', 'sections', 'option_counts')
+
+    def __init__(self, version=None, index=None, answer_keys=None, sections=None, option_counts=None):
+        self.version = version
+        self.index = index or {}
+        self.answer_keys = answer_keys or {}
+        self.sections = sections or {}
+        self.option_counts = option_counts or {}
+
+
+class QuestionPool:
+    """فهرس: معرف القسم -> مصفوفة معرفات الأسئلة النشطة"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._state = PoolState()
+
+    def _rows(self):
+        return Question.objects.filter(is_active=True).order_by('question_id').values_list(
+            'section__section_id', 'id', 'correct_answer', 'options_ar'
+        )
+
+    def _make_state(self, version, rows):
+        index = {}
+        answer_keys = {}
+        sections = {}
+        option_counts = {}
+        for section_id, pk, correct_answer, options in rows:
+            index.setdefault(section_id, array('q')).append(pk)
+            answer_keys[pk] = correct_answer
+            sections[pk] = section_id
+            option_counts[pk] = len(options or ())
+        return PoolState(version, index, answer_keys, sections, option_counts)
+
+    def get_state(self):
+        """إرجاع الحالة الحالية مع إعادة بنائها (باستعلام واحد) إذا تغيّر الإصدار"""
+        version = get_pool_version()
+        if self._state.version != version:
+            with self._lock:
+                if self._state.version != version:
+                    self._state = self._make_state(version, self._rows())
+        return self._state
+
+    async def aget_state(self):
+        """
+        النسخة غير المتزامنة من get_state: إعادة البناء تمر في خيط بنفس القفل،
+        فيُبنى الفهرس مرة واحدة مهما تزامنت الطلبات
+        """
+        version = await aget_pool_version()
+        if self._state.version != version:
+            return await sync_to_async(self.get_state)()
+        return self._state
+
+    def get_index(self):
+        """إرجاع الفهرس الحالي مع إعادة بنائه إذا تغيّر الإصدار"""
+        return self.get_state().index
+
+    async def aget_index(self):
+        return (await self.aget_state()).index
+
+    def get_ids(self, section_id):
+        """معرفات الأسئلة النشطة في قسم معين"""
+        return self.get_index().get(section_id, array('q'))
+
+    def sample_ids(self, section_id, count, rng=random):
+        """سحب عدد محدد من المعرفات العشوائية من قسم معين"""
+        return self._sample(self.get_ids(section_id), count, rng)
+
+    async def asample_ids(self, section_id, count, rng=random):
+        index = await self.aget_index()
+        return self._sample(index.get(section_id, array('q')), count, rng)
+
+    def _sample(self, ids, count, rng):
+        if len(ids) <= count:
+            return list(ids)
+        return rng.sample(ids, count)
+
+    def invalidate(self):
+        """إلغاء الفهرس المحلي"""
+        with self._lock:
+            self._state = PoolState()
+
+
+question_pool = QuestionPool()
+
+
+def fetch_questions(ids):
+    """جلب الأسئلة المختارة باستعلام واحد مع الحفاظ على ترتيب المعرفات"""
+    questions = Question.objects.select_related('section').order_by().in_bulk(ids)
+    return [questions[pk] for pk in ids if pk in questions]
+
+
+async def afetch_questions(ids):
+    """النسخة غير المتزامنة من fetch_questions"""
+    questions = await Question.objects.select_related('section').order_by().ain_bulk(ids)
+    return [questions[pk] for pk in ids if pk in questions]
@@ -0,0 +1,185 @@
+"""
+سحب أسئلة موزون حسب الصعوبة ونسبة الخطأ (وضع "تدرّب على نقاط الضعف")
+
+وزن كل سؤال = وزن الصعوبة × نسبة الخطأ المُنعّمة (wrong + 1) / (answered + 2)
+فالسؤال الذي لم يُجب عليه بعد يأخذ نسبة 0.5. نسب الخطأ تُقرأ من جدول
+QuestionStatistics المحدّث مع كل إجابة، فلا يُفحص جدول الإجابات عند الطلب.
+
+لكل قسم جدول alias (طريقة Vose) يسمح بسحب سؤال موزون بزمن ثابت. تُبنى
+الجداول باستعلام واحد وتُعاد عند تغيّر إصدار بنك الأسئلة أو بعد مرور
+ADAPTIVE_SAMPLER_REFRESH ثانية (نسب الخطأ تتغير ببطء).
+
+- ADAPTIVE_SAMPLER_DIFFICULTY_WEIGHTS: أوزان الصعوبة
+- ADAPTIVE_SAMPLER_REFRESH: أقصى عمر للجداول بالثواني
+"""
+import random
+import threading
+import time
+from array import array
+
+from django.conf import settings
+
+from .models import Question
+from .question_pool import get_pool_version, FULL_TEST_DISTRIBUTION
+
+
+DEFAULT_DIFFICULTY_WEIGHTS = {'easy': 1.0, 'medium': 1.5, 'hard': 2.0}
+
+# أقصى عدد محاولات السحب لكل سؤال مطلوب قبل إكمال الباقي بطريقة أخرى
+MAX_DRAWS_PER_ITEM = 8
+
+
+def question_weight(difficulty_weight, answered, correct):
+    """وزن السؤال من وزن صعوبته ونسبة الخطأ المُنعّمة"""
+    answered = answered or 0
+    correct = correct or 0
+    return difficulty_weight * (answered - correct + 1) / (answered + 2)
+
+
+class AliasTable:
+    """جدول alias للسحب الموزون بزمن ثابت"""
+
+    __slots__ = ('weights', 'prob', 'alias')
+
+    def __init__(self, weights):
+        n = len(weights)
+        total = sum(weights)
+        self.weights = weights
+        self.prob = [1.0] * n
+        self.alias = list(range(n))
+        if not n or total <= 0:
+            return
+
+        scaled = [w * n / total for w in weights]
+        small = [i for i, p in enumerate(scaled) if p < 1]
+        large = [i for i, p in enumerate(scaled) if p >= 1]
+        while small and large:
+            s = small.pop()
+            l = large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] += scaled[s] - 1
+            (small if scaled[l] < 1 else large).append(l)
+        # البواقي (أخطاء التقريب) احتمالها 1
+
+    def __len__(self):
+        return len(self.prob)
+
+    def draw(self, rng=random):
+        """سحب موضع واحد حسب الأوزان"""
+        i = rng.randrange(len(self.prob))
+        return i if rng.random() < self.prob[i] else self.alias[i]
+
+    def draw_distinct(self, count, rng=random):
+        """
+        سحب count موضعاً مختلفاً (دون إرجاع)
+        التكرارات تُرفض؛ إذا طال الرفض (عدد كبير مقارنة بالحجم) يُكمل الباقي
+        بمفاتيح Efraimidis-Spirakis على المواضع المتبقية
+        """
+        n = len(self.prob)
+        if count >= n:
+            positions = list(range(n))
+            rng.shuffle(positions)
+            return positions
+
+        chosen = {}
+        for _ in range(count * MAX_DRAWS_PER_ITEM):
+            chosen[self.draw(rng)] = None
+            if len(chosen) == count:
+                return list(chosen)
+
+        def key(i):
+            weight = self.weights[i]
+            return rng.random() ** (1 / weight) if weight > 0 else 0
+
+        remaining = sorted((i for i in range(n) if i not in chosen), key=key, reverse=True)
+        return list(chosen) + remaining[:count - len(chosen)]
+
+
+class SamplerState:
+    """جداول السحب لكل قسم: (معرفات الأسئلة، جدول alias)"""
+
+    __slots__ = ('version', 'built_at', 'tables')
+
+    def __init__(self, version=None, built_at=0.0, tables=None):
+        self.version = version
+        self.built_at = built_at
+        self.tables = tables or {}
+
+
+class AdaptiveSampler:
+    """سحب أسئلة موزون من فهرس داخل العملية"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._state = SamplerState()
+
+    @property
+    def refresh(self):
+        return getattr(settings, 'ADAPTIVE_SAMPLER_REFRESH', 300)
+
+    @property
+    def difficulty_weights(self):
+        return getattr(settings, 'ADAPTIVE_SAMPLER_DIFFICULTY_WEIGHTS', DEFAULT_DIFFICULTY_WEIGHTS)
+
+    def _rows(self):
+        return Question.objects.filter(is_active=True).order_by('question_id').values_list(
+            'section__section_id',
+            'id',
+            'difficulty',
+            'statistics__answered_count',
+            'statistics__correct_count'
+        )
+
+    def _make_state(self, version, rows):
+        difficulty_weights = self.difficulty_weights
+        ids = {}
+        weights = {}
+        for section_id, pk, difficulty, answered, correct in rows:
+            ids.setdefault(section_id, array('q')).append(pk)
+            weights.setdefault(section_id, []).append(
+                question_weight(difficulty_weights.get(difficulty, 1.0), answered, correct)
+            )
+        tables = {
+            section_id: (ids[section_id], AliasTable(section_weights))
+            for section_id, section_weights in weights.items()
+        }
+        return SamplerState(version, time.monotonic(), tables)
+
+    def _is_stale(self, state, version):
+        return state.version != version or time.monotonic() - state.built_at > self.refresh
+
+    def get_tables(self):
+        """جداول السحب الحالية مع إعادة بنائها (باستعلام واحد) عند الحاجة"""
+        version = get_pool_version()
+        if self._is_stale(self._state, version):
+            with self._lock:
+                if self._is_stale(self._state, version):
+                    self._state = self._make_state(version, self._rows())
+        return self._state.tables
+
+    def sample_ids(self, section_id, count, rng=random, tables=None):
+        """سحب عدد من معرفات أسئلة قسم معين مع ترجيح الأسئلة الصعبة وكثيرة الخطأ"""
+        if tables is None:
+            tables = self.get_tables()
+        if section_id not in tables:
+            return []
+        ids, table = tables[section_id]
+        return [ids[i] for i in table.draw_distinct(count, rng)]
+
+    def generate_exam_ids(self, rng=random):
+        """اختبار كامل بنفس توزيع الأقسام مع ترجيح نقاط الضعف"""
+        tables = self.get_tables()
+        question_ids = []
+        for section_id, count in FULL_TEST_DISTRIBUTION.items():
+            question_ids.extend(self.sample_ids(section_id, count, rng, tables))
+        rng.shuffle(question_ids)
+        return question_ids
+
+    def invalidate(self):
+        """إلغاء الجداول المحلية"""
+        with self._lock:
+            self._state = SamplerState()
+
+
+adaptive_sampler = AdaptiveSampler()
@@ -0,0 +1,208 @@
+"""
+البحث النصي في بنك الأسئلة (النص والخيارات والشرح بكل اللغات)
+
+كل سؤال يحمل الحقل search_text: كلمات حقوله النصية بعد التطبيع
+(normalization.py: حذف التشكيل وتوحيد أشكال الألف والياء...)، ونص
+البحث يُطبّع بنفس الطريقة، فلا يؤثر التشكيل أو شكل الألف على النتائج.
+
+- PostgreSQL: عمود search_vector (tsvector مولّد من search_text) مع
+  فهرس GIN، والترتيب بـ ts_rank
+- غير ذلك (SQLite): فهرس مقلوب داخل العملية (كلمة -> الأسئلة) يُبنى
+  باستعلام واحد ويُعاد عند تغيّر إصدار بنك الأسئلة، والترتيب بـ BM25
+
+كل كلمات البحث مطلوبة، والكلمة الأخيرة تطابق البادئة أيضاً (البحث أثناء
+الكتابة) إذا كان طولها MIN_PREFIX_LENGTH أو أكثر.
+"""
+import heapq
+import math
+import threading
+from array import array
+from bisect import bisect_left
+from collections import Counter
+
+from django.db import connection
+from django.db.models import BooleanField, FloatField
+from django.db.models.expressions import RawSQL
+
+from .models import Question
+from .normalization import tokenize
+from .question_pool import get_pool_version
+
+
+MAX_QUERY_TOKENS = 8
+MIN_PREFIX_LENGTH = 2
+
+# ثوابت BM25
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def parse_query(query):
+    """كلمات نص البحث بعد التطبيع (بدون تكرار)"""
+    return list(dict.fromkeys(tokenize(query)))[:MAX_QUERY_TOKENS]
+
+
+def to_tsquery(tokens):
+    """
+    تعبير to_tsquery من كلمات مُطبّعة (حروف وأرقام فقط فلا تحتاج تهريباً)
+    """
+    terms = list(tokens)
+    if len(terms[-1]) >= MIN_PREFIX_LENGTH:
+        terms[-1] += ':*'
+    return ' & '.join(terms)
+
+
+class SearchIndex:
+    """فهرس مقلوب: لكل كلمة مواضع الأسئلة وتكرار الكلمة فيها"""
+
+    __slots__ = ('version', 'ids', 'sections', 'active', 'lengths', 'avg_length', 'postings', 'terms')
+
+    def __init__(self, version=None, rows=()):
+        self.version = version
+        self.ids = array('q')
+        self.sections = []
+        self.active = []
+        self.lengths = array('I')
+        self.postings = {}
+
+        for pk, section_id, is_active, search_text in rows:
+            doc = len(self.ids)
+            tokens = search_text.split()
+            self.ids.append(pk)
+            self.sections.append(section_id)
+            self.active.append(is_active)
+            self.lengths.append(len(tokens))
+            for term, count in Counter(tokens).items():
+                posting = self.postings.get(term)
+                if posting is None:
+                    posting = self.postings[term] = (array('I'), array('H'))
+                posting[0].append(doc)
+                posting[1].append(min(count, 0xFFFF))
+
+        self.avg_length = (sum(self.lengths) / len(self.lengths)) if self.lengths else 0.0
+        # الكلمات مرتبة لمطابقة البادئة بالبحث الثنائي
+        self.terms = sorted(self.postings)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def expand(self, token, prefix):
+        """الكلمات المفهرسة المطابقة لكلمة البحث (أو لبادئتها)"""
+        if not prefix:
+            return [token] if token in self.postings else []
+        terms = []
+        for i in range(bisect_left(self.terms, token), len(self.terms)):
+            if not self.terms[i].startswith(token):
+                break
+            terms.append(self.terms[i])
+        return terms
+
+    def _term_scores(self, terms):
+        """درجة BM25 لكل سؤال يحتوي إحدى الكلمات (أعلى درجة بينها)"""
+        total = len(self.ids)
+        avg_length = self.avg_length or 1.0
+        scores = {}
+        for term in terms:
+            docs, counts = self.postings[term]
+            idf = math.log(1 + (total - len(docs) + 0.5) / (len(docs) + 0.5))
+            for doc, count in zip(docs, counts):
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self.lengths[doc] / avg_length)
+                score = idf * count * (BM25_K1 + 1) / (count + norm)
+                if score > scores.get(doc, 0.0):
+                    scores[doc] = score
+        return scores
+
+    def search(self, tokens, section_id=None, include_inactive=False, limit=20):
+        """أفضل limit نتيجة كقائمة (معرف السؤال، الدرجة)"""
+        expanded = []
+        for i, token in enumerate(tokens):
+            prefix = i == len(tokens) - 1 and len(token) >= MIN_PREFIX_LENGTH
+            terms = self.expand(token, prefix)
+            if not terms:
+                return []
+            expanded.append(terms)
+
+        # البدء بالكلمة الأندر لتصغير مجموعة المرشحين
+        expanded.sort(key=lambda terms: sum(len(self.postings[term][0]) for term in terms))
+        scores = None
+        for terms in expanded:
+            term_scores = self._term_scores(terms)
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {
+                    doc: score + term_scores[doc]
+                    for doc, score in scores.items()
+                    if doc in term_scores
+                }
+            if not scores:
+                return []
+
+        matches = (
+            (doc, score) for doc, score in scores.items()
+            if (include_inactive or self.active[doc])
+            and (section_id is None or self.sections[doc] == section_id)
+        )
+        best = heapq.nlargest(limit, matches, key=lambda item: (item[1], -self.ids[item[0]]))
+        return [(self.ids[doc], score) for doc, score in best]
+
+
+class QuestionSearch:
+    """البحث في الأسئلة حسب قاعدة البيانات (tsvector أو فهرس داخل العملية)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._index = SearchIndex()
+
+    @staticmethod
+    def uses_database():
+        return connection.vendor == 'postgresql'
+
+    def _rows(self):
+        return Question.objects.order_by('pk').values_list(
+            'id',
+            'section__section_id',
+            'is_active',
+            'search_text'
+        ).iterator(chunk_size=2000)
+
+    def get_index(self):
+        """الفهرس الحالي مع إعادة بنائه (باستعلام واحد) عند تغيّر إصدار البنك"""
+        version = get_pool_version()
+        if self._index.version != version:
+            with self._lock:
+                if self._index.version != version:
+                    self._index = SearchIndex(version, self._rows())
+        return self._index
+
+    def search(self, query, section_id=None, limit=20, include_inactive=False):
+        """أفضل limit سؤالاً مطابقاً لنص البحث كقائمة (معرف السؤال، الدرجة)"""
+        tokens = parse_query(query)
+        if not tokens or limit <= 0:
+            return []
+        if self.uses_database():
+            return self._search_database(tokens, section_id, limit, include_inactive)
+        return self.get_index().search(tokens, section_id, include_inactive, limit)
+
+    def _search_database(self, tokens, section_id, limit, include_inactive):
+        tsquery = to_tsquery(tokens)
+        column = f'{connection.ops.quote_name(Question._meta.db_table)}.search_vector'
+        queryset = Question.objects.filter(
+            RawSQL(f"{column} @@ to_tsquery('simple', %s)", [tsquery], output_field=BooleanField())
+        )
+        if not include_inactive:
+            queryset = queryset.filter(is_active=True)
+        if section_id is not None:
+            queryset = queryset.filter(section__section_id=section_id)
+        rank = RawSQL(f"ts_rank({column}, to_tsquery('simple', %s))", [tsquery], output_field=FloatField())
+        return list(
+            queryset.annotate(rank=rank).order_by('-rank', 'pk').values_list('id', 'rank')[:limit]
+        )
+
+    def invalidate(self):
+        """إلغاء الفهرس المحلي"""
+        with self._lock:
+            self._index = SearchIndex()
+
+
+question_search = QuestionSearch()
@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Section, Question
+from .question_pool import bump_pool_version
+
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+@receiver(post_save, sender=Section)
+@receiver(post_delete, sender=Section)
+def invalidate_question_pool(sender, **kwargs):
+    """تحديث إصدار بنك الأسئلة عند تعديل سؤال أو قسم"""
+    bump_pool_version()
+
+
+@receiver(connection_created)
+def configure_sqlite_connection(sender, connection, **kwargs):
+    """تطبيق إعدادات SQLITE_PRAGMAS على كل اتصال SQLite جديد"""
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = getattr(settings, 'SQLITE_PRAGMAS', {})
+    if not pragmas:
+        return
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
@@ -1,3 +1,1471 @@
-from django.test import TestCase
-
-# Create your tests here.
+import asyncio
+import csv
+import gzip
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import tempfile
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Count, F, Q
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from .models import (
+    Section,
+    Question,
+    TestAttempt,
+    TestAnswer,
+    ArchivedAttempt,
+    QuestionStatistics,
+    AttemptStatistics,
+    DailyAttemptStatistics,
+    QuestionBankVersion
+)
+from .exam_pool import exam_pool
+from .instrumentation import registry
+from .question_pool import bump_pool_version, get_pool_version, pool_version
+from .payload_cache import question_payload_cache
+from .question_pool import question_pool
+from .sampling import AliasTable, adaptive_sampler
+from .write_behind import attempt_buffer, dead_letter_files, journal_files
+from .archive import iter_archived_answers, unpack_answers
+from .duplicates import DuplicateDetector, find_duplicates
+from .importer import ImportFormatError, import_questions, iter_json_array
+from .normalization import normalize_text, tokenize
+from .search import question_search
+
+
+def seed_question_bank(sections=5, questions_per_section=2000):
+    """إنشاء بنك أسئلة بحجم واقعي"""
+    difficulties = ['easy', 'medium', 'hard']
+    created = []
+    for s in range(sections):
+        section = Section.objects.create(
+            section_id=f'section_{s}',
+            name_ar=f'القسم {s}',
+            description_ar='وصف',
+            order=s
+        )
+        created.append(section)
+        Question.objects.bulk_create([
+            Question(
+                section=section,
+                question_id=f'S{s}Q{q:05d}',
+                text_ar=f'سؤال {q}',
+                options_ar=['أ', 'ب', 'ج', 'د'],
+                correct_answer=q % 4,
+                explanation_ar='شرح',
+                difficulty=difficulties[q % 3],
+                is_active=q % 10 != 0
+            )
+            for q in range(questions_per_section)
+        ], batch_size=1000)
+    return created
+
+
+def seed_attempts(count=20000):
+    """إنشاء محاولات اختبار مكتملة وغير مكتملة"""
+    now = timezone.now()
+    TestAttempt.objects.bulk_create([
+        TestAttempt(
+            test_type='full' if i % 3 else 'section',
+            started_at=now - timedelta(minutes=i),
+            completed_at=(now - timedelta(minutes=i) + timedelta(minutes=20)) if i % 50 == 0 else None,
+            total_questions=65,
+            passed=i % 7 == 0
+        )
+        for i in range(count)
+    ], batch_size=1000)
+
+
+class HotQueryPlanTests(TestCase):
+    """التأكد من أن الاستعلامات الساخنة تستخدم الفهارس ولا تمسح الجدول بالكامل"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.sections = seed_question_bank()
+        seed_attempts()
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def assertNoSequentialScan(self, queryset, ordered_index=None):
+        """
+        فشل الاختبار إذا احتوت خطة التنفيذ على مسح كامل لجدول
+        ordered_index: فهرس يُسمح بالمرور عليه بالترتيب (مع LIMIT)
+        """
+        if connection.vendor == 'postgresql':
+            # على الجداول الصغيرة قد يفضّل المخطط المسح التسلسلي رغم وجود الفهرس،
+            # لذلك نعطّله: إن بقي Seq Scan في الخطة فلا يوجد فهرس صالح للاستعلام
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+            plan = queryset.explain()
+            scans = re.findall(r'Seq Scan on (\w+)', plan)
+        else:
+            plan = queryset.explain()
+            scans = [
+                table for table, index in re.findall(
+                    r'SCAN (\w+)(?: USING (?:COVERING )?INDEX (\w+))?', plan
+                )
+                if index != ordered_index
+            ]
+        self.assertEqual(scans, [], f'مسح تسلسلي في الخطة:\n{plan}')
+
+    def test_active_questions_by_section(self):
+        section = self.sections[0]
+        self.assertNoSequentialScan(
+            Question.objects.filter(section=section, is_active=True)
+        )
+
+    def test_active_questions_by_section_and_difficulty(self):
+        section = self.sections[0]
+        self.assertNoSequentialScan(
+            Question.objects.filter(section=section, difficulty='hard', is_active=True)
+        )
+
+    def test_section_statistics_aggregate(self):
+        active = Q(questions__is_active=True)
+        self.assertNoSequentialScan(
+            Section.objects.filter(pk=self.sections[0].pk).annotate(
+                total_questions=Count('questions', filter=active),
+                hard_questions=Count('questions', filter=active & Q(questions__difficulty='hard')),
+            )
+        )
+
+    def test_latest_attempts_page(self):
+        self.assertNoSequentialScan(
+            TestAttempt.objects.all()[:100],
+            ordered_index='attempt_started_idx'
+        )
+
+    def test_completed_attempts_by_type(self):
+        self.assertNoSequentialScan(
+            TestAttempt.objects.filter(
+                completed_at__isnull=False,
+                test_type='full',
+                passed=True
+            ).values('id')
+        )
+
+    def test_completed_attempts_in_date_range(self):
+        since = timezone.now() - timedelta(days=7)
+        self.assertNoSequentialScan(
+            TestAttempt.objects.filter(
+                completed_at__isnull=False,
+                completed_at__gte=since
+            )
+        )
+
+
+EXAM_DISTRIBUTION = {
+    'traffic_safety': 16,
+    'traffic_rules': 32,
+    'environment': 5,
+    'vehicle_knowledge_and_manoeuvring': 7,
+    'personal_conditions': 5
+}
+
+
+def seed_exam_bank(multiplier=2):
+    """إنشاء أقسام الاختبار الكامل مع أسئلة كافية لكل قسم"""
+    for order, (section_id, count) in enumerate(EXAM_DISTRIBUTION.items()):
+        section = Section.objects.create(
+            section_id=section_id,
+            name_ar=section_id,
+            description_ar='وصف',
+            order=order
+        )
+        Question.objects.bulk_create([
+            Question(
+                section=section,
+                question_id=f'E{order}Q{q:03d}',
+                text_ar=f'سؤال {q}',
+                options_ar=['أ', 'ب', 'ج', 'د'],
+                correct_answer=q % 4,
+                explanation_ar='شرح',
+                difficulty=['easy', 'medium', 'hard'][q % 3]
+            )
+            for q in range(count * multiplier)
+        ])
+
+
+def exam_questions():
+    """أسئلة اختبار كامل بنفس التوزيع (أول أسئلة كل قسم)"""
+    questions = []
+    for section_id, count in EXAM_DISTRIBUTION.items():
+        questions.extend(Question.objects.filter(section__section_id=section_id).order_by('id')[:count])
+    return questions
+
+
+@override_settings(QUESTION_POOL_VERSION_TTL=3600)
+class APITestCase(TestCase):
+    """أساس اختبارات الواجهة: مسح الذاكرة المؤقتة بين الاختبارات"""
+
+    def setUp(self):
+        cache.clear()
+        # قراءة الإصدار مسبقاً حتى لا تدخل في عدد استعلامات الطلبات
+        pool_version.invalidate()
+        get_pool_version()
+        question_pool.invalidate()
+        adaptive_sampler.invalidate()
+        question_search.invalidate()
+        question_payload_cache.clear()
+
+    def post_json(self, url, data=None):
+        return self.client.post(url, json.dumps(data or {}), content_type='application/json')
+
+
+class EndpointQueryCountTests(APITestCase):
+    """عدد الاستعلامات لكل نقطة نهاية يجب ألا يعتمد على عدد الصفوف"""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_exam_bank()
+        questions = exam_questions()
+        cls.attempts = []
+        for i in range(5):
+            attempt = TestAttempt.objects.create(
+                test_type='section' if i % 2 else 'full',
+                section=questions[0].section if i % 2 else None,
+                total_questions=65
+            )
+            attempt.record_answers({q.id: i % 4 for q in questions})
+            cls.attempts.append(attempt)
+        cls.questions = questions
+
+        # صفوف الإحصائيات موجودة مسبقاً كما في بيئة الإنتاج
+        AttemptStatistics.objects.create(pk=AttemptStatistics.TOTALS_PK)
+        DailyAttemptStatistics.objects.create(day=timezone.localdate())
+
+    def test_sections(self):
+        with self.assertNumQueries(2):
+            self.client.get('/api/sections/')
+        with self.assertNumQueries(1):
+            self.client.get('/api/sections/traffic_rules/')
+        with self.assertNumQueries(1):
+            self.client.get('/api/sections/traffic_rules/statistics/')
+        with self.assertNumQueries(1):
+            self.client.get('/api/sections/statistics/')
+
+    def test_questions(self):
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/questions/')
+        self.assertEqual(len(response.json()['results']), 100)
+        self.assertNotIn('count', response.json())
+        with self.assertNumQueries(1):
+            self.client.get(f'/api/questions/{self.questions[0].id}/')
+
+    def test_random_full_test(self):
+        # بناء الفهرس + جلب الأسئلة المختارة
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/questions/random_full_test/')
+        self.assertEqual(response.json()['total'], 65)
+
+    def test_by_section(self):
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/questions/by_section/?section_id=traffic_rules')
+        self.assertEqual(response.json()['total'], 64)
+        with self.assertNumQueries(1):
+            self.client.get('/api/questions/by_section/?section_id=traffic_rules&random=10')
+
+    def test_attempt_list_and_detail(self):
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/attempts/')
+        self.assertNotIn('answers', response.json()['results'][0])
+        with self.assertNumQueries(2):
+            response = self.client.get(f'/api/attempts/{self.attempts[0].id}/')
+        self.assertEqual(len(response.json()['answers']), 65)
+
+    def test_attempt_update(self):
+        attempt = self.attempts[1]
+        with self.assertNumQueries(3):
+            self.client.patch(
+                f'/api/attempts/{attempt.id}/',
+                json.dumps({'with_timer': True}),
+                content_type='application/json'
+            )
+        with self.assertNumQueries(3):
+            self.client.put(
+                f'/api/attempts/{attempt.id}/',
+                json.dumps({'test_type': 'full', 'total_questions': 65}),
+                content_type='application/json'
+            )
+
+    def test_destroy(self):
+        with self.assertNumQueries(3):
+            response = self.client.delete(f'/api/attempts/{self.attempts[2].id}/')
+        self.assertEqual(response.status_code, 204)
+
+    def test_submit_query_count_is_flat(self):
+        counts = []
+        for size in (1, 65):
+            attempt = self.create_attempt()
+            answers = {str(q.id): 0 for q in self.questions[:size]}
+            with CaptureQueriesContext(connection) as queries:
+                self.post_json(f'/api/attempts/{attempt["id"]}/submit/', {'answers': answers})
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
+
+    def create_attempt(self):
+        return self.post_json('/api/attempts/', {
+            'test_type': 'full',
+            'question_ids': [q.id for q in self.questions],
+        }).json()
+
+    def test_create_and_submit(self):
+        # بناء الفهرس + إنشاء المحاولة + جلب الإجابات
+        with self.assertNumQueries(3):
+            attempt = self.create_attempt()
+        with self.assertNumQueries(2):
+            self.create_attempt()
+        answers = {str(q.id): 0 for q in self.questions}
+        # التصحيح من نسخة المحاولة دون جدول الأسئلة
+        # + قفل صفوف إحصائيات الأسئلة وتحديثها + قفل المحاولة عند الإنهاء
+        with self.assertNumQueries(18):
+            response = self.post_json(f'/api/attempts/{attempt["id"]}/submit/', {'answers': answers})
+        self.assertEqual(response.json()['answered_questions'], 65)
+
+    def test_streamed_answers_and_finalize(self):
+        attempt = self.create_attempt()
+        url = f'/api/attempts/{attempt["id"]}'
+        with self.assertNumQueries(9):
+            self.post_json(f'{url}/answer/', {
+                'question': self.questions[0].id,
+                'selected_answer': 0,
+                'time_spent_seconds': 5
+            })
+        with self.assertNumQueries(10):
+            self.post_json(f'{url}/answer/batch/', {'answers': [
+                {'question': q.id, 'selected_answer': 1} for q in self.questions
+            ]})
+        with self.assertNumQueries(8):
+            response = self.post_json(f'{url}/finalize/')
+        self.assertEqual(response.json()['answered_questions'], 65)
+
+    def test_concurrent_finalize_is_recorded_once(self):
+        attempt_id = self.create_attempt()['id']
+        # طلبان قرأ كل منهما المحاولة قبل أن ينهيها الآخر
+        first = TestAttempt.objects.get(pk=attempt_id)
+        second = TestAttempt.objects.get(pk=attempt_id)
+        self.assertTrue(first.finalize())
+        self.assertFalse(second.finalize())
+        self.assertFalse(second.submit_answers({self.questions[0].id: 0}))
+
+        self.assertEqual(AttemptStatistics.get_totals().total_attempts, 1)
+        self.assertFalse(TestAnswer.objects.filter(attempt_id=attempt_id).exists())
+
+    def test_answers_after_concurrent_finalize_are_refused(self):
+        attempt_id = self.create_attempt()['id']
+        stale = TestAttempt.objects.get(pk=attempt_id)
+        self.assertTrue(TestAttempt.objects.get(pk=attempt_id).finalize())
+        answered = QuestionStatistics.objects.filter(question=self.questions[0]).values_list('answered_count', flat=True)
+        before = list(answered)
+
+        self.assertIsNone(stale.record_answers({self.questions[0].id: 0}))
+        self.assertFalse(TestAnswer.objects.filter(attempt_id=attempt_id).exists())
+        self.assertEqual(list(answered), before)
+        self.assertEqual(TestAttempt.objects.get(pk=attempt_id).answered_questions, 0)
+
+    def test_attempt_statistics(self):
+        with self.assertNumQueries(1):
+            self.client.get('/api/attempts/statistics/')
+        with self.assertNumQueries(1):
+            self.client.get('/api/attempts/statistics/?days=7')
+
+
+class KeysetPaginationTests(APITestCase):
+    """الترقيم بالمؤشر للمحاولات والأسئلة"""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_exam_bank()
+        now = timezone.now()
+        TestAttempt.objects.bulk_create([
+            TestAttempt(
+                test_type='full',
+                total_questions=65,
+                started_at=now - timedelta(minutes=i // 2)
+            )
+            for i in range(25)
+        ])
+
+    def collect_pages(self, url):
+        ids = []
+        while url:
+            data = self.client.get(url).json()
+            ids.extend(item['id'] for item in data['results'])
+            url = data['next']
+        return ids
+
+    def test_attempts_walk_every_row_once_newest_first(self):
+        ids = self.collect_pages('/api/attempts/?page_size=4')
+        expected = list(TestAttempt.objects.order_by('-started_at', '-id').values_list('id', flat=True))
+        self.assertEqual(ids, expected)
+
+    def test_questions_walk_every_row_once(self):
+        ids = self.collect_pages('/api/questions/?page_size=50')
+        self.assertEqual(len(ids), Question.objects.filter(is_active=True).count())
+        self.assertEqual(len(set(ids)), len(ids))
+
+    def test_include_count_is_opt_in(self):
+        data = self.client.get('/api/attempts/?page_size=5&include_count=1').json()
+        self.assertEqual(data['count'], 25)
+        self.assertEqual(len(data['results']), 5)
+
+
+class RequestMetricsTests(APITestCase):
+    """ترويسة Server-Timing ونقطة نهاية المقاييس"""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_exam_bank()
+
+    def setUp(self):
+        super().setUp()
+        registry.clear()
+
+    def test_disabled_by_default(self):
+        response = self.client.get('/api/questions/random_full_test/')
+        self.assertNotIn('Server-Timing', response)
+
+    @override_settings(REQUEST_METRICS_SAMPLE_RATE=1.0)
+    def test_server_timing_and_histograms(self):
+        response = self.client.get('/api/questions/random_full_test/')
+        timing = response['Server-Timing']
+        self.assertIn('db;dur=', timing)
+        self.assertIn('desc="2 queries"', timing)
+        self.assertIn('serialize;dur=', timing)
+
+        self.client.get('/api/attempts/')
+        self.assertEqual(self.client.get('/api/metrics/').status_code, 403)
+        staff = get_user_model().objects.create_user('monitor', password='x', is_staff=True)
+        self.client.force_login(staff)
+        metrics = self.client.get('/api/metrics/').content.decode()
+        self.assertIn(
+            'api_request_queries_bucket{method="GET",view="question-random-full-test",le="2"} 1',
+            metrics
+        )
+        self.assertIn('api_request_duration_seconds_count{method="GET",view="attempt-list"} 1', metrics)
+        self.assertIn('# TYPE api_request_serialize_seconds histogram', metrics)
+
+
+class AsyncEndpointTests(APITestCase):
+    """النسخ غير المتزامنة تعطي نفس نتائج نقاط النهاية المتزامنة"""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_exam_bank()
+        cls.questions = exam_questions()
+
+    async def apost_json(self, url, data=None):
+        return await self.async_client.post(url, json.dumps(data or {}), content_type='application/json')
+
+    async def test_random_full_test(self):
+        response = await self.async_client.get('/api/async/questions/random_full_test/')
+        data = response.json()
+        self.assertEqual(data['total'], 65)
+        self.assertEqual(len({q['id'] for q in data['questions']}), 65)
+        self.assertNotIn('correct_answer', data['questions'][0])
+
+    async def test_concurrent_state_rebuild_runs_once(self):
+        states = await asyncio.gather(*(question_pool.aget_state() for _ in range(5)))
+        self.assertEqual(len({id(state) for state in states}), 1)
+        self.assertEqual(len(states[0].answer_keys), await Question.objects.filter(is_active=True).acount())
+
+    async def test_by_section(self):
+        response = await self.async_client.get('/api/async/questions/by_section/?section_id=environment')
+        self.assertEqual(response.json()['total'], 10)
+        response = await self.async_client.get('/api/async/questions/by_section/?section_id=environment&random=3')
+        self.assertEqual(response.json()['total'], 3)
+        response = await self.async_client.get('/api/async/questions/by_section/?section_id=missing')
+        self.assertEqual(response.status_code, 404)
+
+    async def test_create_and_submit(self):
+        response = await self.apost_json('/api/async/attempts/', {
+            'test_type': 'full',
+            'question_ids': [q.id for q in self.questions],
+        })
+        self.assertEqual(response.status_code, 201)
+        attempt = response.json()
+        self.assertEqual(attempt['answers'], [])
+
+        answers = {str(q.id): 4 for q in self.questions}
+        response = await self.apost_json(f'/api/async/attempts/{attempt["id"]}/submit/', {'answers': answers})
+        self.assertEqual(response.status_code, 400)
+
+        answers = {str(q.id): q.correct_answer for q in self.questions}
+        response = await self.apost_json(f'/api/async/attempts/{attempt["id"]}/submit/', {'answers': answers})
+        result = response.json()
+        self.assertEqual(result['correct_answers'], 65)
+        self.assertTrue(result['passed'])
+        self.assertEqual(len(result['answers']), 65)
+
+        response = await self.apost_json(f'/api/async/attempts/{attempt["id"]}/submit/', {'answers': answers})
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(EXAM_POOL_SIZE=4, EXAM_POOL_LOW_WATER=2, EXAM_POOL_REFILL_THREAD=False)
+class ExamPoolTests(APITestCase):
+    """مجمّع الاختبارات الجاهزة"""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_exam_bank()
+
+    def test_refill_and_pop(self):
+        self.assertEqual(exam_pool.refill(), 4)
+        self.assertEqual(exam_pool.available(), 4)
+
+        # بدء الاختبار من المجمّع دون أي استعلام
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/questions/random_full_test/')
+        data = response.json()
+        self.assertEqual(data['total'], 65)
+        self.assertEqual(len({q['id'] for q in data['questions']}), 65)
+        self.assertEqual(exam_pool.available(), 3)
+
+        # الإكمال حتى الحجم المطلوب فقط
+        self.assertEqual(exam_pool.refill(), 1)
+
+    def test_empty_pool_falls_back(self):
+        response = self.client.get('/api/questions/random_full_test/')
+        self.assertEqual(response.json()['total'], 65)
+        self.assertEqual(exam_pool.refill(), 4)
+        self.assertEqual(exam_pool.available(), 4)
+
+    def test_pool_version_is_shared_through_database(self):
+        version = get_pool_version()
+        # عملية أخرى ترفع الإصدار مباشرة في قاعدة البيانات
+        QuestionBankVersion.objects.update(version=F('version') + 1)
+        self.assertEqual(get_pool_version(), version)
+        with override_settings(QUESTION_POOL_VERSION_TTL=0):
+            self.assertEqual(get_pool_version(), version + 1)
+
+        self.assertEqual(bump_pool_version(), version + 2)
+        self.assertEqual(get_pool_version(), version + 2)
+
+    def test_stale_exams_are_discarded(self):
+        exam_pool.refill()
+        Question.objects.filter(section__section_id='environment').update(is_active=False)
+        bump_pool_version()
+
+        data = self.client.get('/api/questions/random_full_test/').json()
+        sections = {q['section_name'] for q in data['questions']}
+        self.assertEqual(data['total'], 60)
+        self.assertNotIn('environment', sections)
+
+    def test_refill_replaces_stale_exams(self):
+        exam_pool.refill()
+        bump_pool_version()
+        get_pool_version()
+        self.client.get('/api/questions/random_full_test/')
+
+        # ثلاث خانات قديمة تُستبدل في مكانها وخانة جديدة تكمل الحجم
+        self.assertEqual(exam_pool.refill(), 4)
+        self.assertEqual(exam_pool.available(), 4)
+        with self.assertNumQueries(0):
+            data = self.client.get('/api/questions/random_full_test/').json()
+        self.assertEqual(data['total'], 65)
+        self.assertEqual(exam_pool.refill(), 1)
+
+
+class BenchmarkCommandTests(SimpleTestCase):
+    """تشغيل bench_api على بنك صغير في عملية منفصلة (ينشئ قاعدة الاختبار الخاصة به)"""
+
+    def test_bench_api_runs_every_scenario(self):
+        manage = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'manage.py')
+        with tempfile.TemporaryDirectory() as tmp:
+            output = os.path.join(tmp, 'bench.json')
+            subprocess.run([
+                sys.executable, manage, 'bench_api',
+                '--questions', '130',
+                '--attempts', '3',
+                '--answers-per-attempt', '5',
+                '--iterations', '1',
+                '--warmup', '0',
+                '--connection-profiles', '2',
+                '--output', output,
+            ], check=True, capture_output=True)
+            with open(output, encoding='utf-8') as f:
+                report = json.load(f)
+
+        self.assertEqual(report['dataset']['attempts'], 3)
+        self.assertEqual(report['results']['attempts_submit']['requests'], 1)
+        self.assertEqual(len(report['connection_profiles']), 3)
+
+
+class ExamSnapshotTests(APITestCase):
+    """نسخة أسئلة المحاولة: التصحيح منها والاستئناف وإعادة التوليد بالبذرة"""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_exam_bank()
+
+    def snapshot_ids(self, attempt):
+        return TestAttempt.objects.get(pk=attempt['id']).get_question_ids()
+
+    def test_issued_questions_are_stored(self):
+        exam = self.client.get('/api/questions/random_full_test/').json()
+        issued = [q['id'] for q in exam['questions']]
+        attempt = self.post_json('/api/attempts/', {'test_type': 'full', 'question_ids': issued}).json()
+        self.assertEqual(self.snapshot_ids(attempt), issued)
+        self.assertEqual(attempt['total_questions'], 65)
+
+    def test_same_seed_same_exam(self):
+        first = self.post_json('/api/attempts/', {'test_type': 'full', 'seed': 42}).json()
+        second = self.post_json('/api/attempts/', {'test_type': 'full', 'seed': 42}).json()
+        other = self.post_json('/api/attempts/', {'test_type': 'full', 'seed': 43}).json()
+        self.assertEqual(self.snapshot_ids(first), self.snapshot_ids(second))
+        self.assertNotEqual(self.snapshot_ids(first), self.snapshot_ids(other))
+        self.assertEqual(len(self.snapshot_ids(first)), 65)
+
+    def test_section_snapshot_uses_every_active_question(self):
+        attempt = self.post_json('/api/attempts/', {
+            'test_type': 'section',
+            'section_id': 'environment'
+        }).json()
+        self.assertEqual(attempt['total_questions'], 10)
+
+    def test_rejects_questions_outside_the_test(self):
+        other = Question.objects.exclude(section__section_id='environment').first()
+        response = self.post_json('/api/attempts/', {
+            'test_type': 'section',
+            'section_id': 'environment',
+            'question_ids': [other.id]
+        })
+        self.assertEqual(response.status_code, 400)
+
+    def test_rejects_full_exams_smaller_than_the_test(self):
+        # اختبار كامل بسؤال واحد كان ينجح بحد 52 إجابة صحيحة لا يمكن بلوغه
+        section_ids = list(
+            Question.objects.filter(section__section_id='environment').order_by('id').values_list('id', flat=True)
+        )
+        exam = [q.id for q in exam_questions()]
+        for question_ids in (exam[:1], exam[:-1], exam[:-1] + section_ids[-1:]):
+            response = self.post_json('/api/attempts/', {'test_type': 'full', 'question_ids': question_ids})
+            self.assertEqual(response.status_code, 400)
+
+        response = self.post_json('/api/attempts/', {
+            'test_type': 'section',
+            'section_id': 'environment',
+            'question_ids': list(reversed(section_ids))
+        })
+        self.assertEqual(response.json()['total_questions'], 10)
+
+    def test_section_subsets_pass_from_snapshot_size(self):
+        # أسئلة by_section?random و weak_areas جزء من القسم فقط
+        issued = [
+            q['id'] for q in
+            self.client.get('/api/questions/by_section/?section_id=environment&random=5').json()['questions']
+        ]
+        for url in ('/api/attempts/', '/api/async/attempts/'):
+            attempt = self.post_json(url, {
+                'test_type': 'section',
+                'section_id': 'environment',
+                'question_ids': issued
+            })
+            self.assertEqual(attempt.status_code, 201)
+            self.assertEqual(attempt.json()['total_questions'], 5)
+
+        keys = dict(Question.objects.filter(id__in=issued).values_list('id', 'correct_answer'))
+        answers = {str(pk): keys[pk] if i < 4 else (keys[pk] + 1) % 4 for i, pk in enumerate(issued)}
+        result = self.post_json(f'/api/attempts/{attempt.json()["id"]}/submit/', {'answers': answers}).json()
+        self.assertEqual(result['correct_answers'], 4)
+        self.assertTrue(result['passed'])
+
+    def test_grading_uses_snapshot_keys(self):
+        attempt = self.post_json('/api/attempts/', {'test_type': 'full', 'seed': 7}).json()
+        ids = self.snapshot_ids(attempt)
+        keys = dict(Question.objects.filter(id__in=ids).values_list('id', 'correct_answer'))
+
+        # تعديل الإجابة الصحيحة بعد بدء الاختبار لا يغيّر تصحيحه
+        Question.objects.filter(id__in=ids).update(correct_answer=3)
+        outside = Question.objects.exclude(id__in=ids).first()
+        answers = {str(pk): keys[pk] for pk in ids}
+        answers[str(outside.id)] = outside.correct_answer
+
+        with CaptureQueriesContext(connection) as queries:
+            result = self.post_json(f'/api/attempts/{attempt["id"]}/submit/', {'answers': answers}).json()
+        self.assertEqual(result['correct_answers'], 65)
+        self.assertEqual(result['answered_questions'], 65)
+        self.assertFalse([q for q in queries if 'FROM "api_question"' in q['sql']])
+
+    def test_resume_returns_same_questions_and_answers(self):
+        attempt = self.post_json('/api/attempts/', {'test_type': 'full', 'seed': 1}).json()
+        ids = self.snapshot_ids(attempt)
+        self.post_json(f'/api/attempts/{attempt["id"]}/answer/', {
+            'question': ids[0],
+            'selected_answer': 2
+        })
+
+        resumed = self.client.get(f'/api/attempts/{attempt["id"]}/questions/').json()
+        self.assertEqual([q['id'] for q in resumed['questions']], ids)
+        self.assertEqual(resumed['answers'], {str(ids[0]): 2})
+        self.assertEqual(resumed['seed'], 1)
+        self.assertNotIn('correct_answer', resumed['questions'][0])
+
+
+class ConditionalGetTests(APITestCase):
+    """ETag و Last-Modified والرد بـ 304 حسب إصدار بنك الأسئلة"""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_exam_bank()
+
+    def test_not_modified_without_queries(self):
+        response = self.client.get('/api/sections/')
+        etag = response['ETag']
+        self.assertIn('must-revalidate', response['Cache-Control'])
+        self.assertIn('Last-Modified', response)
+
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/sections/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+        response = self.client.get(
+            '/api/questions/by_section/?section_id=environment',
+            HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_invalid_query_is_not_answered_with_304(self):
+        etag = self.client.get('/api/questions/').headers['ETag']
+        response = self.client.get('/api/questions/?fields=id,missing', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('fields', response.json())
+        response = self.client.get('/api/questions/?fields=id', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_edit_changes_etag(self):
+        etag = self.client.get('/api/sections/traffic_rules/').headers['ETag']
+        Section.objects.filter(section_id='traffic_rules').first().save()
+
+        response = self.client.get('/api/sections/traffic_rules/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_random_questions_are_not_cached(self):
+        response = self.client.get('/api/questions/by_section/?section_id=environment&random=3')
+        self.assertNotIn('ETag', response)
+        response = self.client.get('/api/questions/random_full_test/')
+        self.assertNotIn('ETag', response)
+
+
+class CompactPayloadTests(APITestCase):
+    """اختيار اللغة والحقول والتخطيط العمودي وضغط الاستجابات"""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_exam_bank()
+
+    def test_lang_keeps_single_language(self):
+        results = self.client.get('/api/questions/?lang=en').json()['results']
+        self.assertIn('text_en', results[0])
+        self.assertIn('explanation_en', results[0])
+        self.assertFalse({'text_ar', 'options_sv', 'explanation_ar'} & set(results[0]))
+
+        questions = self.client.get('/api/questions/random_full_test/?lang=sv').json()['questions']
+        self.assertEqual(len(questions), 65)
+        self.assertIn('options_sv', questions[0])
+        self.assertNotIn('options_ar', questions[0])
+
+    def test_default_fragments_unchanged(self):
+        # دون lang أو fields تبقى الاستجابة بكل اللغات كما كانت
+        every_language = {
+            f'{base}_{lang}' for base in ('text', 'options') for lang in ('ar', 'en', 'sv')
+        }
+        question = self.client.get('/api/questions/by_section/?section_id=environment').json()['questions'][0]
+        self.assertLessEqual(every_language, set(question))
+        self.assertNotIn('correct_answer', question)
+
+        question = self.client.get('/api/questions/random_full_test/').json()['questions'][0]
+        self.assertLessEqual(every_language, set(question))
+
+    def test_fields_selection(self):
+        response = self.client.get('/api/questions/by_section/?section_id=environment&fields=id,text_ar')
+        questions = response.json()['questions']
+        self.assertEqual(set(questions[0]), {'id', 'text_ar'})
+
+        response = self.client.get('/api/questions/?fields=id,correct_answer')
+        self.assertEqual(set(response.json()['results'][0]), {'id', 'correct_answer'})
+
+    def test_invalid_shape(self):
+        response = self.client.get('/api/questions/by_section/?section_id=environment&fields=id,correct_answer')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('fields', response.json())
+        self.assertEqual(self.client.get('/api/questions/?lang=fr').status_code, 400)
+        self.assertEqual(self.client.get('/api/questions/?layout=rows').status_code, 400)
+
+    def test_columnar_layout(self):
+        data = self.client.get(
+            '/api/questions/by_section/?section_id=environment&fields=id,text_ar&layout=columnar'
+        ).json()
+        self.assertEqual(data['questions']['columns'], ['id', 'text_ar'])
+        self.assertEqual(len(data['questions']['rows']), data['total'])
+
+        results = self.client.get('/api/questions/?layout=columnar').json()['results']
+        self.assertIn('correct_answer', results['columns'])
+        self.assertEqual(len(results['rows'][0]), len(results['columns']))
+
+    def test_gzip_full_test(self):
+        plain = self.client.get('/api/questions/random_full_test/')
+        compressed = self.client.get('/api/questions/random_full_test/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(compressed['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', compressed['Vary'])
+        self.assertGreater(len(plain.content), 3 * len(compressed.content))
+
+
+class AdaptiveSamplerTests(APITestCase):
+    """السحب الموزون حسب الصعوبة ونسبة الخطأ"""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_exam_bank()
+
+    def test_alias_table_distribution(self):
+        rng = random.Random(0)
+        table = AliasTable([1.0, 3.0, 0.0])
+        draws = [table.draw(rng) for _ in range(8000)]
+        self.assertEqual(draws.count(2), 0)
+        self.assertAlmostEqual(draws.count(1) / len(draws), 0.75, delta=0.02)
+
+        positions = table.draw_distinct(2, rng)
+        self.assertEqual(sorted(positions), [0, 1])
+        self.assertEqual(len(set(AliasTable([1.0] * 10).draw_distinct(9, rng))), 9)
+
+    def test_submit_updates_question_statistics(self):
+        ids = list(Question.objects.filter(section__section_id='environment').values_list('id', 'correct_answer'))
+        attempt_id = self.post_json('/api/attempts/', {
+            'test_type': 'section',
+            'section_id': 'environment',
+        }).json()['id']
+        (first, first_key), (second, second_key) = ids[:2]
+        self.post_json(f'/api/attempts/{attempt_id}/answer/', {
+            'question': first,
+            'selected_answer': (first_key + 1) % 4,
+        })
+        self.post_json(f'/api/attempts/{attempt_id}/submit/', {
+            'answers': {str(first): first_key, str(second): second_key},
+        })
+
+        statistics = QuestionStatistics.objects.in_bulk([first, second])
+        self.assertEqual((statistics[first].answered_count, statistics[first].correct_count), (1, 1))
+        self.assertEqual((statistics[second].answered_count, statistics[second].correct_count), (1, 1))
+
+    def test_weak_questions_preferred(self):
+        ids = list(Question.objects.filter(section__section_id='environment').values_list('id', flat=True))
+        weak = set(ids[:2])
+        QuestionStatistics.objects.bulk_create([
+            QuestionStatistics(question_id=pk, answered_count=200, correct_count=0 if pk in weak else 200)
+            for pk in ids
+        ])
+
+        rng = random.Random(1)
+        hits = sum(
+            len(weak & set(adaptive_sampler.sample_ids('environment', 2, rng)))
+            for _ in range(50)
+        )
+        self.assertGreater(hits, 90)
+
+        data = self.client.get('/api/questions/weak_areas/?section_id=environment&count=3').json()
+        self.assertEqual(data['total'], 3)
+        self.assertNotIn('correct_answer', data['questions'][0])
+        self.assertEqual(self.client.get('/api/questions/weak_areas/').json()['total'], 65)
+
+
+class QuestionAnalyticsTests(APITestCase):
+    """إحصائيات الأسئلة المجمعة وإعادة بنائها"""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_exam_bank()
+        cls.questions = list(Question.objects.filter(section__section_id='environment').order_by('id')[:3])
+
+    def answer(self, answers, times):
+        attempt_id = self.post_json('/api/attempts/', {
+            'test_type': 'section',
+            'section_id': 'environment',
+        }).json()['id']
+        self.post_json(f'/api/attempts/{attempt_id}/answer/batch/', {'answers': [
+            {'question': question.id, 'selected_answer': selected, 'time_spent_seconds': seconds}
+            for question, selected, seconds in zip(self.questions, answers, times)
+        ]})
+        return attempt_id
+
+    def test_rollup_and_rebuild(self):
+        first = self.questions[0]
+        key = first.correct_answer
+        self.answer([key, 0, 0], [4, 12, 100])
+        self.answer([(key + 1) % 4, 0], [8, 40])
+        attempt_id = self.answer([(key + 2) % 4], [50])
+        # استبدال الإجابة يطرح السابقة من الإحصائيات
+        self.post_json(f'/api/attempts/{attempt_id}/answer/', {
+            'question': first.id,
+            'selected_answer': key,
+            'time_spent_seconds': 6
+        })
+
+        data = self.client.get(f'/api/questions/{first.id}/analytics/').json()
+        self.assertEqual(data['answered_count'], 3)
+        self.assertEqual(data['correct_count'], 2)
+        self.assertAlmostEqual(data['percent_correct'], 200 / 3)
+        self.assertEqual(sum(data['option_distribution']), 3)
+        self.assertEqual(data['option_distribution'][key], 2)
+        self.assertTrue(5 < data['median_time_seconds'] <= 10)
+
+        incremental = {
+            row.question_id: row.as_dict() for row in QuestionStatistics.objects.all()
+        }
+        call_command('rebuild_question_statistics', stdout=StringIO())
+        rebuilt = {
+            row.question_id: row.as_dict() for row in QuestionStatistics.objects.all()
+        }
+        self.assertEqual(incremental, rebuilt)
+
+    def test_rejects_out_of_range_answers(self):
+        attempt_id = self.answer([], [])
+        question = self.questions[0]
+        # -1 كان خطأ 500 و 5000000 كان يضخم option_counts، و 4 خارج خيارات السؤال الأربعة
+        for selected in (-1, 5000000, 4):
+            response = self.post_json(f'/api/attempts/{attempt_id}/answer/', {
+                'question': question.id,
+                'selected_answer': selected,
+            })
+            self.assertEqual(response.status_code, 400)
+            response = self.post_json(f'/api/attempts/{attempt_id}/answer/batch/', {'answers': [
+                {'question': question.id, 'selected_answer': selected},
+            ]})
+            self.assertEqual(response.status_code, 400)
+            response = self.post_json(f'/api/attempts/{attempt_id}/submit/', {
+                'answers': {str(question.id): selected},
+            })
+            self.assertEqual(response.status_code, 400)
+
+        self.assertFalse(TestAnswer.objects.filter(attempt_id=attempt_id).exists())
+        self.assertFalse(QuestionStatistics.objects.filter(question=question).exists())
+        self.assertIsNone(TestAttempt.objects.get(pk=attempt_id).completed_at)
+
+        # إجابات قديمة خارج النطاق لا توسّع التوزيع
+        statistics = QuestionStatistics(question=question)
+        statistics.add(5000000, False)
+        statistics.add(-1, False)
+        statistics.add(2, True)
+        self.assertEqual((statistics.answered_count, statistics.correct_count), (3, 1))
+        self.assertEqual(statistics.option_counts, [0, 0, 1])
+
+    def test_bulk_analytics(self):
+        self.answer([question.correct_answer for question in self.questions[:2]], [5, 5])
+        ids = ','.join(str(question.id) for question in self.questions)
+        with self.assertNumQueries(1):
+            data = self.client.get(f'/api/questions/analytics/?ids={ids}&ordering=-percent_correct').json()
+        self.assertEqual([row['id'] for row in data], [question.id for question in self.questions])
+        self.assertEqual(data[2]['answered_count'], 0)
+        self.assertIsNone(data[2]['percent_correct'])
+
+        section = self.client.get('/api/questions/analytics/?section_id=environment').json()
+        self.assertEqual(len(section), 10)
+        self.assertEqual(self.client.get('/api/questions/analytics/').status_code, 400)
+        self.assertEqual(self.client.get(f'/api/questions/analytics/?ids={ids}&ordering=text').status_code, 400)
+
+
+@override_settings(
+    ATTEMPT_WRITE_BEHIND=True,
+    ATTEMPT_WRITE_BEHIND_THREAD=False,
+    ATTEMPT_WRITE_BEHIND_MAX_ROWS=3,
+    ATTEMPT_WRITE_BEHIND_ID_BLOCK=2,
+)
+class WriteBehindTests(APITestCase):
+    """الكتابة المؤجلة لمحاولات الاختبار ومستويات الحفظ"""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_exam_bank()
+
+    def setUp(self):
+        super().setUp()
+        journal_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(journal_dir.cleanup)
+        self.journal_dir = journal_dir.name
+        settings_override = override_settings(ATTEMPT_WRITE_BEHIND_JOURNAL_DIR=self.journal_dir)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.addCleanup(attempt_buffer.discard)
+        attempt_buffer.discard()
+
+    def create(self):
+        response = self.post_json('/api/attempts/', {'test_type': 'section', 'section_id': 'environment'})
+        self.assertEqual(response.status_code, 201)
+        return response.json()['id']
+
+    def test_buffered_until_max_rows(self):
+        before = TestAttempt.objects.count()
+        ids = [self.create(), self.create()]
+        self.assertEqual(len(set(ids)), 2)
+        self.assertEqual(TestAttempt.objects.count(), before)
+        self.assertEqual(len(journal_files(self.journal_dir)), 1)
+
+        ids.append(self.create())
+        self.assertEqual(sorted(TestAttempt.objects.filter(pk__in=ids).values_list('pk', flat=True)), sorted(ids))
+        self.assertEqual(len(attempt_buffer), 0)
+        self.assertEqual(journal_files(self.journal_dir), [])
+
+        # المعرفات المحجوزة لا تتعارض مع الإدراج العادي
+        with override_settings(ATTEMPT_WRITE_BEHIND=False):
+            self.assertGreater(self.create(), max(ids))
+
+    def test_pending_attempt_flushed_on_access(self):
+        attempt_id = self.create()
+        question = Question.objects.filter(section__section_id='environment').first()
+        response = self.post_json(f'/api/attempts/{attempt_id}/submit/', {
+            'answers': {str(question.id): question.correct_answer},
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['correct_answers'], 1)
+        self.assertFalse(attempt_buffer.is_pending(attempt_id))
+
+    def test_journal_survives_crash(self):
+        ids = [self.create(), self.create()]
+        attempt_buffer.discard()
+        self.assertFalse(TestAttempt.objects.filter(pk__in=ids).exists())
+
+        call_command('replay_attempt_journal', dir=self.journal_dir, stdout=StringIO())
+        self.assertEqual(TestAttempt.objects.filter(pk__in=ids).count(), 2)
+        self.assertEqual(journal_files(self.journal_dir), [])
+        # إعادة التشغيل مرة ثانية لا تكرر المحاولات
+        call_command('replay_attempt_journal', dir=self.journal_dir, stdout=StringIO())
+
+    def test_rejected_rows_go_to_dead_letter(self):
+        ids = [self.create(), self.create()]
+        # صف مرفوض دائماً لا يوقف بقية الدفعة ولا يُعاد تجربته
+        attempt_buffer._rows[0].test_type = None
+        self.assertEqual(attempt_buffer.flush(), 1)
+        self.assertEqual(len(attempt_buffer), 0)
+        self.assertFalse(TestAttempt.objects.filter(pk=ids[0]).exists())
+        self.assertTrue(TestAttempt.objects.filter(pk=ids[1]).exists())
+        self.assertFalse(attempt_buffer.is_pending(ids[0]))
+        self.assertEqual(journal_files(self.journal_dir), [])
+
+        dead = dead_letter_files(self.journal_dir)
+        self.assertEqual(len(dead), 1)
+        with open(dead[0], encoding='utf-8') as dead_file:
+            self.assertEqual([json.loads(line)[0]['pk'] for line in dead_file], [ids[0]])
+        self.assertEqual(attempt_buffer.flush(), 0)
+
+    @override_settings(ATTEMPT_WRITE_BEHIND_DURABILITY='memory')
+    def test_memory_durability_loses_unflushed(self):
+        attempt_id = self.create()
+        self.assertEqual(journal_files(self.journal_dir), [])
+        attempt_buffer.discard()
+        self.assertEqual(self.client.get(f'/api/attempts/{attempt_id}/').status_code, 404)
+
+
+class ArchiveTests(APITestCase):
+    """أرشفة المحاولات القديمة مع الحفاظ على الإحصائيات"""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_exam_bank()
+        questions = list(Question.objects.order_by('id')[:10])
+        now = timezone.now()
+        for i, age in enumerate([400, 500, 10]):
+            attempt = TestAttempt.objects.create(test_type='full', total_questions=65)
+            attempt.record_answers(
+                {q.id: (q.correct_answer + i) % 4 for q in questions},
+                {q.id: 7 for q in questions}
+            )
+            attempt.finalize()
+            TestAttempt.objects.filter(pk=attempt.pk).update(completed_at=now - timedelta(days=age))
+        cls.questions = questions
+
+    def setUp(self):
+        super().setUp()
+        archive_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(archive_dir.cleanup)
+        self.archive_dir = archive_dir.name
+
+    def snapshot(self):
+        call_command('rebuild_attempt_statistics', stdout=StringIO())
+        call_command('rebuild_question_statistics', stdout=StringIO())
+        return (
+            self.client.get('/api/attempts/statistics/').json(),
+            {row.question_id: row.as_dict() for row in QuestionStatistics.objects.all()},
+        )
+
+    def archive(self, archive_format):
+        call_command(
+            'archive_attempts',
+            older_than=365,
+            format=archive_format,
+            dir=self.archive_dir,
+            batch_size=1,
+            stdout=StringIO()
+        )
+
+    def test_table_archive(self):
+        before = self.snapshot()
+        self.archive('table')
+
+        self.assertEqual(TestAttempt.objects.count(), 1)
+        self.assertEqual(TestAnswer.objects.count(), 10)
+        archived = ArchivedAttempt.objects.order_by('id')
+        self.assertEqual(archived.count(), 2)
+        answers = unpack_answers(archived[0].answers)
+        self.assertEqual(len(answers), 10)
+        self.assertEqual(answers[0][3], 7)
+        self.assertTrue(all(is_correct for _, _, is_correct, _ in answers))
+
+        self.assertEqual(self.snapshot(), before)
+
+    def test_out_of_range_answers_are_archived(self):
+        # إجابات قديمة قبل التحقق من رقم الخيار والوقت لا تكسر ضغط السجلات
+        attempt = TestAttempt.objects.filter(answers__isnull=False).order_by('completed_at').distinct().first()
+        first, second = attempt.answers.order_by('id')[:2]
+        TestAnswer.objects.filter(pk=first.pk).update(selected_answer=5000000)
+        TestAnswer.objects.filter(pk=second.pk).update(selected_answer=-1, time_spent_seconds=3000000000)
+        before = self.snapshot()
+        self.archive('table')
+
+        answers = {
+            question_id: (selected, seconds)
+            for question_id, selected, _, seconds in unpack_answers(ArchivedAttempt.objects.get(pk=attempt.pk).answers)
+        }
+        self.assertEqual(len(answers), 10)
+        self.assertEqual(answers[first.question_id], (-1, 7))
+        self.assertEqual(answers[second.question_id], (-1, 2 ** 31 - 1))
+        self.assertEqual(self.snapshot(), before)
+
+    def test_jsonl_archive(self):
+        before = self.snapshot()
+        self.archive('jsonl')
+
+        archived = ArchivedAttempt.objects.all()
+        self.assertTrue(all(row.answers is None and row.archive_file for row in archived))
+        with override_settings(ATTEMPT_ARCHIVE_DIR=self.archive_dir):
+            self.assertEqual(len(list(iter_archived_answers())), 20)
+            self.assertEqual(self.snapshot(), before)
+
+
+class ExportTests(APITestCase):
+    """تصدير المحاولات والإجابات بتدفق"""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_exam_bank()
+        section = Section.objects.get(section_id='environment')
+        questions = list(section.questions.order_by('id')[:5])
+        for i in range(3):
+            attempt = TestAttempt.objects.create(
+                test_type='section' if i else 'full',
+                section=section if i else None,
+                total_questions=5
+            )
+            attempt.record_answers({q.id: 0 for q in questions})
+        cls.staff = get_user_model().objects.create_user('analyst', password='x', is_staff=True)
+
+    def export(self, query):
+        response = self.client.get(f'/api/attempts/export/?{query}')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content)
+
+    def test_requires_staff(self):
+        self.assertEqual(self.client.get('/api/attempts/export/').status_code, 403)
+
+    def test_csv_and_filters(self):
+        self.client.force_login(self.staff)
+        rows = list(csv.reader(self.export('kind=attempts').decode().splitlines()))
+        self.assertEqual(rows[0][:3], ['id', 'test_type', 'section_section_id'])
+        self.assertEqual(len(rows), 4)
+        self.assertNotIn('user_ip', rows[0])
+
+        rows = list(csv.reader(self.export('kind=attempts&section_id=environment').decode().splitlines()))
+        self.assertEqual(len(rows), 3)
+        tomorrow = (timezone.localdate() + timedelta(days=1)).isoformat()
+        self.assertEqual(len(self.export(f'since={tomorrow}').decode().splitlines()), 1)
+        today = timezone.localdate().isoformat()
+        self.assertEqual(len(self.export(f'until={today}').decode().splitlines()), 4)
+
+        response = self.client.get('/api/attempts/export/?since=2026-13-01')
+        self.assertEqual(response.status_code, 400)
+
+    def test_jsonl_gzip(self):
+        self.client.force_login(self.staff)
+        plain = self.export('kind=answers&output=jsonl')
+        lines = [json.loads(line) for line in plain.decode().splitlines()]
+        self.assertEqual(len(lines), 15)
+        self.assertEqual(lines[0]['question_section_section_id'], 'environment')
+
+        response = self.client.get('/api/attempts/export/?kind=answers&output=jsonl&compress=gzip')
+        self.assertEqual(response['Content-Type'], 'application/gzip')
+        self.assertIn('.jsonl.gz', response['Content-Disposition'])
+        self.assertEqual(gzip.decompress(b''.join(response.streaming_content)), plain)
+
+    def test_command(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'answers.csv.gz')
+            call_command('export_attempts', kind='answers', gzip=True, output=path, stdout=StringIO())
+            with gzip.open(path, 'rt', encoding='utf-8') as exported:
+                self.assertEqual(len(exported.read().splitlines()), 16)
+
+    def test_include_archived(self):
+        attempt = TestAttempt.objects.order_by('id').first()
+        TestAttempt.objects.filter(pk=attempt.pk).update(completed_at=timezone.now() - timedelta(days=400))
+        with tempfile.TemporaryDirectory() as directory:
+            call_command('archive_attempts', older_than=365, format='jsonl', dir=directory, stdout=StringIO())
+
+            self.client.force_login(self.staff)
+            # المحاولات المؤرشفة لا تُصدّر إلا عند طلبها
+            self.assertEqual(len(self.export('kind=attempts').decode().splitlines()), 3)
+            rows = list(csv.reader(self.export('kind=attempts&include_archived=1').decode().splitlines()))
+            self.assertEqual(len(rows), 4)
+            self.assertEqual(rows[-1][0], str(attempt.pk))
+
+            with override_settings(ATTEMPT_ARCHIVE_DIR=directory):
+                path = os.path.join(directory, 'answers.jsonl')
+                call_command(
+                    'export_attempts', kind='answers', format='jsonl', include_archived=True,
+                    section='environment', output=path, stdout=StringIO()
+                )
+                with open(path, encoding='utf-8') as exported:
+                    lines = [json.loads(line) for line in exported]
+        self.assertEqual(len(lines), 15)
+        archived = [line for line in lines if line['attempt_id'] == attempt.pk]
+        self.assertEqual(len(archived), 5)
+        self.assertIsNone(archived[0]['answered_at'])
+        self.assertEqual(archived[0]['question_section_section_id'], 'environment')
+
+
+
+class QuestionSearchTests(APITestCase):
+    """البحث النصي في الأسئلة مع تطبيع العربية"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.signs = Section.objects.create(section_id='traffic_rules', name_ar='قواعد', description_ar='وصف')
+        cls.safety = Section.objects.create(section_id='traffic_safety', name_ar='سلامة', description_ar='وصف')
+        questions = [
+            (cls.signs, 'S1', 'ماذا تعني إِشَارَةُ التوقف؟', ['توقف تام', 'أبطئ'], 'Stoppskylt', 'يجب التوقف تماماً'),
+            (cls.signs, 'S2', 'ما معنى الإشارة الضوئية الصفراء؟', ['استعد للتوقف', 'أسرع'], '', 'الضوء الأصفر'),
+            (cls.safety, 'S3', 'متى تستخدم حزام الأمان؟', ['دائماً', 'أحياناً'], 'Säkerhetsbälte', 'شرح'),
+            (cls.signs, 'S4', 'اشارة قديمة', ['أ', 'ب'], '', 'شرح'),
+        ]
+        for section, question_id, text, options, text_sv, explanation in questions:
+            Question.objects.create(
+                section=section,
+                question_id=question_id,
+                text_ar=text,
+                text_sv=text_sv,
+                options_ar=options,
+                correct_answer=0,
+                explanation_ar=explanation,
+                is_active=question_id != 'S4'
+            )
+
+    def search(self, query):
+        response = self.client.get(f'/api/questions/search/?{query}')
+        self.assertEqual(response.status_code, 200)
+        return [question['question_id'] for question in response.json()['questions']]
+
+    def test_normalization(self):
+        self.assertEqual(normalize_text('إِشَارَةُ'), 'اشاره')
+        self.assertEqual(tokenize('الإشارة للتوقف آلة'), ['اشاره', 'توقف', 'اله'])
+        self.assertEqual(normalize_text('آلـــة مُستشفى'), 'اله مستشفي')
+        self.assertEqual(tokenize('Säkerhets-BÄLTE ١٢'), ['säkerhets', 'bälte', '١٢'])
+        self.assertEqual(Question.objects.get(question_id='S1').search_text.split()[:3], ['ماذا', 'تعني', 'اشاره'])
+
+    def test_search_endpoint(self):
+        # التشكيل وأشكال الألف والتاء المربوطة لا تؤثر، والأسئلة غير النشطة مستبعدة
+        self.assertEqual(sorted(self.search('q=أشارة')), ['S1', 'S2'])
+        # كل الكلمات مطلوبة، والكلمة الأخيرة تطابق البادئة
+        self.assertEqual(self.search('q=الإشارة الضوئ'), ['S2'])
+        self.assertEqual(self.search('q=stoppskylt'), ['S1'])
+        self.assertEqual(self.search('q=säkerhet'), ['S3'])
+        self.assertEqual(self.search('q=شرح&section_id=traffic_safety'), ['S3'])
+        self.assertEqual(self.search('q=توقف&limit=1'), ['S1'])
+        self.assertEqual(self.search('q=غير موجود'), [])
+
+        data = self.client.get('/api/questions/search/?q=حزام').json()
+        self.assertEqual(data['total'], 1)
+        self.assertNotIn('correct_answer', data['questions'][0])
+        self.assertEqual(self.client.get('/api/questions/search/').status_code, 400)
+        self.assertEqual(self.client.get('/api/questions/search/?q=x&limit=a').status_code, 400)
+
+    def test_ranking(self):
+        # السؤال الذي تتكرر فيه الكلمة أولاً، وأداة التعريف لا تؤثر (التوقف، للتوقف)
+        self.assertEqual(self.search('q=توقف'), ['S1', 'S2'])
+        results = question_search.search('اشاره', include_inactive=True)
+        self.assertEqual(len(results), 3)
+        self.assertIn(Question.objects.get(question_id='S4').pk, [pk for pk, score in results])
+        self.assertEqual(results, sorted(results, key=lambda item: -item[1]))
+
+    def test_index_follows_updates(self):
+        self.assertEqual(self.search('q=منعطف'), [])
+        question = Question.objects.get(question_id='S3')
+        question.explanation_en = 'Sharp bend ahead'
+        question.save(update_fields=['explanation_en'])
+        self.assertIn('bend', Question.objects.get(pk=question.pk).search_text)
+        self.assertEqual(self.search('q=bend'), ['S3'])
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'bank.json')
+            with open(path, 'w', encoding='utf-8') as bank:
+                json.dump([{
+                    'question_id': 'S3',
+                    'section_id': 'traffic_safety',
+                    'question_text': 'عند المُنعطف الحاد',
+                    'options': ['أبطئ', 'أسرع'],
+                    'correct_answer': 0,
+                    'explanation': 'شرح',
+                }], bank, ensure_ascii=False)
+            import_questions(path, stdout=lambda message: None)
+        self.assertEqual(self.search('q=منعطف'), ['S3'])
+        # الترجمات غير المستوردة تبقى قابلة للبحث
+        self.assertEqual(self.search('q=bend'), ['S3'])
+
+
+class DuplicateDetectionTests(APITestCase):
+    """كشف الأسئلة شبه المكررة (MinHash/LSH)"""
+
+    TEXT = 'ما هي السرعة القصوى المسموح بها داخل المناطق السكنية في حال عدم وجود لافتة تحدد السرعة'
+    OPTIONS = ['30 كم في الساعة', '50 كم في الساعة', '70 كم في الساعة', '90 كم في الساعة']
+
+    def records(self):
+        return [
+            ('A', self.TEXT, self.OPTIONS),
+            # تشكيل وأشكال ألف مختلفة وترتيب خيارات مختلف
+            ('B', 'مَا هِيَ السُّرعة القُصوى المسموح بها داخل المناطق السكنية في حال عدم وجود لافتة تحدد السرعة',
+             list(reversed(self.OPTIONS))),
+            # كلمة مضافة
+            ('C', self.TEXT + ' عادة', self.OPTIONS),
+            ('D', 'متى يجب استخدام الأضواء العالية عند القيادة ليلاً خارج المدن', ['دائماً', 'أبداً', 'عند الضباب']),
+            ('E', '', []),
+        ]
+
+    def test_clusters(self):
+        detector = DuplicateDetector()
+        for record in self.records():
+            detector.add(*record)
+        self.assertEqual(len(detector), 4)
+        self.assertEqual(detector.similarity(0, 1), 1.0)
+
+        clusters = detector.clusters()
+        self.assertEqual([sorted(cluster.keys) for cluster in clusters], [['A', 'B', 'C']])
+        self.assertGreaterEqual(clusters[0].similarity, 0.8)
+        self.assertEqual(find_duplicates(self.records(), threshold=1.0)[0].keys, ['A', 'B'])
+        with self.assertRaises(ValueError):
+            DuplicateDetector(num_perm=48)
+
+    def test_bank_and_file(self):
+        section = Section.objects.create(section_id='traffic_rules', name_ar='قواعد', description_ar='وصف')
+        bank = [
+            {'question_id': key, 'section_id': 'traffic_rules', 'question_text': text,
+             'options': options or ['أ', 'ب'], 'correct_answer': 0, 'explanation': 'شرح'}
+            for key, text, options in self.records() if text
+        ]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'bank.json')
+            with open(path, 'w', encoding='utf-8') as bank_file:
+                json.dump(bank, bank_file, ensure_ascii=False)
+
+            out = StringIO()
+            call_command('find_duplicate_questions', file=path, json=True, stdout=out)
+            self.assertEqual([sorted(item['keys']) for item in json.loads(out.getvalue())], [['A', 'B', 'C']])
+
+            report = import_questions(path, stdout=lambda message: None, check_duplicates=True)
+        self.assertEqual(report['inserted'], 4)
+        self.assertEqual([sorted(cluster.keys) for cluster in report['duplicates']], [['A', 'B', 'C']])
+
+        section.questions.filter(question_id='B').update(is_active=False)
+        out = StringIO()
+        call_command('find_duplicate_questions', stdout=out)
+        self.assertIn('A, C', out.getvalue())
+        self.assertIn('1 مجموعة', out.getvalue())
+
+
+class QuestionImportTests(TestCase):
+    """الاستيراد التدريجي وتطبيق الفروقات بالصيغتين المسطحة والمتداخلة"""
+
+    def question(self, key, text='نص السؤال', section=None):
+        data = {
+            'question_id': key,
+            'question_text': text,
+            'options': ['أ', 'ب', 'ج'],
+            'correct_answer': 1,
+            'explanation': 'شرح',
+        }
+        if section:
+            data['section_id'] = section
+        return data
+
+    def write(self, directory, data):
+        path = os.path.join(directory, 'bank.json')
+        with open(path, 'w', encoding='utf-8') as bank:
+            json.dump(data, bank, ensure_ascii=False, indent=1)
+        return path
+
+    def test_iter_json_array_small_chunks(self):
+        items = [12345, -1.5e3, 'نص طويل', True, None, {'a': [1, {'b': '}]'}]}, [], 7]
+        text = ' [ ' + ' , '.join(json.dumps(item, ensure_ascii=False) for item in items) + ' ] '
+        for chunk_size in range(1, 12):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(list(iter_json_array(StringIO(text), chunk_size=chunk_size)), items)
+        self.assertEqual(list(iter_json_array(StringIO('[12345]'), chunk_size=2)), [12345])
+        self.assertEqual(list(iter_json_array(StringIO('[]'), chunk_size=1)), [])
+
+        with self.assertRaises(ImportFormatError):
+            list(iter_json_array(StringIO('{"a": 1}'), chunk_size=2))
+        with self.assertRaises(ImportFormatError):
+            list(iter_json_array(StringIO('[1, 2'), chunk_size=2))
+
+    def test_flat_layout_counts(self):
+        bank = [self.question(f'TRS{i:03d}', section='traffic_safety') for i in range(5)]
+        # القسم من بادئة المعرف، وسجل بلا معرف يُتجاهل
+        bank.append(self.question('TRF001'))
+        bank.append({'question_text': 'بلا معرف'})
+        with tempfile.TemporaryDirectory() as directory:
+            path = self.write(directory, bank)
+            report = import_questions(path, batch_size=2, stdout=lambda message: None)
+            self.assertEqual(
+                (report['inserted'], report['updated'], report['unchanged'], report['skipped']),
+                (6, 0, 0, 1)
+            )
+
+            bank[0]['question_text'] = 'نص معدّل'
+            path = self.write(directory, bank)
+            report = import_questions(path, batch_size=2, stdout=lambda message: None)
+            self.assertEqual((report['inserted'], report['updated'], report['unchanged']), (0, 1, 5))
+
+        self.assertEqual(Question.objects.get(question_id='TRS000').text_ar, 'نص معدّل')
+        self.assertEqual(Section.objects.get(section_id='traffic_safety').question_count, 5)
+        self.assertTrue(Question.objects.filter(question_id='TRF001', section__section_id='traffic_rules').exists())
+
+    def test_nested_layout_counts(self):
+        def bank(text):
+            return {'swedish_driving_theory_test': {'sections': {
+                'environment': {
+                    'section_name': 'البيئة',
+                    'section_description': 'وصف',
+                    'number_of_questions': 3,
+                    'questions': [self.question(f'ENV{i:03d}', text if i == 2 else 'نص السؤال') for i in range(3)],
+                },
+            }}}
+
+        with tempfile.TemporaryDirectory() as directory:
+            report = import_questions(self.write(directory, bank('نص السؤال')), stdout=lambda message: None)
+            self.assertEqual((report['inserted'], report['updated'], report['unchanged']), (3, 0, 0))
+
+            report = import_questions(self.write(directory, bank('نص جديد')), stdout=lambda message: None)
+            self.assertEqual((report['inserted'], report['updated'], report['unchanged']), (0, 1, 2))
+
+        section = Section.objects.get(section_id='environment')
+        self.assertEqual((section.name_ar, section.question_count), ('البيئة', 3))
@@ -1,13 +1,22 @@
-
-from django.urls import path, include
-from rest_framework.routers import DefaultRouter
-from .views import SectionViewSet, QuestionViewSet, TestAttemptViewSet
-
-router = DefaultRouter()
-router.register(r'sections', SectionViewSet, basename='section')
-router.register(r'questions', QuestionViewSet, basename='question')
-router.register(r'attempts', TestAttemptViewSet, basename='attempt')
-
-urlpatterns = [
-    path('', include(router.urls)),
-]
+
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+from .views import SectionViewSet, QuestionViewSet, TestAttemptViewSet
+from .instrumentation import metrics_view
+from . import async_views
+
+router = DefaultRouter()
+router.register(r'sections', SectionViewSet, basename='section')
+router.register(r'questions', QuestionViewSet, basename='question')
+router.register(r'attempts', TestAttemptViewSet, basename='attempt')
+
+urlpatterns = [
+    path('metrics/', metrics_view, name='metrics'),
+
+    # نسخ غير متزامنة من نقاط النهاية الساخنة (تحت ASGI)
+    path('async/questions/random_full_test/', async_views.random_full_test, name='async-random-full-test'),
+    path('async/questions/by_section/', async_views.by_section, name='async-by-section'),
+    path('async/attempts/', async_views.create_attempt, name='async-attempt-create'),
+    path('async/attempts/<int:pk>/submit/', async_views.submit, name='async-attempt-submit'),
+    path('', include(router.urls)),
+]
@@ -1,317 +1,807 @@
-from rest_framework import viewsets, status
-from rest_framework.decorators import action
-from rest_framework.response import Response
-from django.db.models import Count, Q
-from django.utils import timezone
-import random
-
-from .models import Section, Question, TestAttempt, TestAnswer
-from .serializers import (
-    SectionSerializer,
-    QuestionSerializer,
-    QuestionWithoutAnswerSerializer,
-    TestAttemptSerializer,
-    TestAnswerSerializer,
-    TestSubmissionSerializer
-)
-
-
-class SectionViewSet(viewsets.ReadOnlyModelViewSet):
-    """
-    API للأقسام
-    - list: عرض جميع الأقسام
-    - retrieve: عرض قسم محدد
-    - statistics: إحصائيات القسم
-    """
-    queryset = Section.objects.all()
-    serializer_class = SectionSerializer
-    lookup_field = 'section_id'
-
-    @action(detail=True, methods=['get'])
-    def statistics(self, request, section_id=None):
-        """إحصائيات القسم"""
-        section = self.get_object()
-
-        stats = {
-            'section_id': section.section_id,
-            'section_name': section.name_ar,
-            'total_questions': section.questions.filter(is_active=True).count(),
-            'difficulty_breakdown': {
-                'easy': section.questions.filter(difficulty='easy', is_active=True).count(),
-                'medium': section.questions.filter(difficulty='medium', is_active=True).count(),
-                'hard': section.questions.filter(difficulty='hard', is_active=True).count(),
-            }
-        }
-
-        return Response(stats)
-
-
-class QuestionViewSet(viewsets.ReadOnlyModelViewSet):
-    """
-    API للأسئلة
-    - list: عرض جميع الأسئلة
-    - retrieve: عرض سؤال محدد
-    - random_full_test: توليد 65 سؤال عشوائي
-    - by_section: الحصول على أسئلة قسم محدد
-    """
-    queryset = Question.objects.filter(is_active=True)
-    serializer_class = QuestionSerializer
-
-    def get_serializer_class(self):
-        """اختيار المحول المناسب"""
-        if self.action in ['random_full_test', 'by_section']:
-            return QuestionWithoutAnswerSerializer
-        return QuestionSerializer
-
-    @action(detail=False, methods=['get'])
-    def random_full_test(self, request):
-        """
-        توليد 65 سؤال عشوائي حسب التوزيع المطلوب:
-        - 16 من السلامة المرورية
-        - 32 من قواعد المرور
-        - 5 من البيئة
-        - 7 من معرفة المركبة والمناورة
-        - 5 من الشروط الشخصية
-        """
-        try:
-            questions = []
-
-            # توزيع الأسئلة حسب القسم
-            distribution = {
-                'traffic_safety': 16,
-                'traffic_rules': 32,
-                'environment': 5,
-                'vehicle_knowledge_and_manoeuvring': 7,
-                'personal_conditions': 5
-            }
-
-            for section_id, count in distribution.items():
-                section_questions = self._get_random_questions(section_id, count)
-                questions.extend(section_questions)
-
-            # خلط الأسئلة
-            random.shuffle(questions)
-
-            serializer = self.get_serializer(questions, many=True)
-            return Response({
-                'total': len(questions),
-                'distribution': distribution,
-                'questions': serializer.data
-            })
-
-        except Exception as e:
-            return Response(
-                {'error': str(e)},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
-
-    def _get_random_questions(self, section_id, count):
-        """الحصول على عدد محدد من الأسئلة العشوائية من قسم معين"""
-        try:
-            section = Section.objects.get(section_id=section_id)
-            questions = list(
-                Question.objects.filter(section=section, is_active=True)
-            )
-
-            # إذا كان عدد الأسئلة المطلوبة أكبر من المتاح
-            if len(questions) < count:
-                print(f"تحذير: القسم {section_id} يحتوي على {len(questions)} سؤال فقط، مطلوب {count}")
-                return questions
-
-            return random.sample(questions, count)
-
-        except Section.DoesNotExist:
-            print(f"خطأ: القسم {section_id} غير موجود")
-            return []
-
-    @action(detail=False, methods=['get'])
-    def by_section(self, request):
-        """
-        الحصول على أسئلة قسم محدد
-        Parameters:
-            - section_id: معرف القسم
-            - random: عدد الأسئلة العشوائية (اختياري)
-        """
-        section_id = request.query_params.get('section_id')
-        random_count = request.query_params.get('random')
-
-        if not section_id:
-            return Response(
-                {'error': 'معرف القسم مطلوب (section_id)'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-
-        try:
-            section = Section.objects.get(section_id=section_id)
-            questions = Question.objects.filter(
-                section=section,
-                is_active=True
-            )
-
-            # إذا طلب عدد عشوائي محدد
-            if random_count:
-                try:
-                    count = int(random_count)
-                    questions = list(questions)
-                    if len(questions) > count:
-                        questions = random.sample(questions, count)
-                except ValueError:
-                    pass
-
-            serializer = self.get_serializer(questions, many=True)
-            return Response({
-                'section': SectionSerializer(section).data,
-                'total': len(serializer.data),
-                'questions': serializer.data
-            })
-
-        except Section.DoesNotExist:
-            return Response(
-                {'error': 'القسم غير موجود'},
-                status=status.HTTP_404_NOT_FOUND
-            )
-
-
-class TestAttemptViewSet(viewsets.ModelViewSet):
-    """
-    API لمحاولات الاختبار
-    - create: إنشاء محاولة جديدة
-    - submit: إرسال نتائج الاختبار
-    - statistics: إحصائيات عامة
-    """
-    queryset = TestAttempt.objects.all()
-    serializer_class = TestAttemptSerializer
-
-    def create(self, request, *args, **kwargs):
-        """إنشاء محاولة اختبار جديدة"""
-        test_type = request.data.get('test_type')
-        section_id = request.data.get('section_id')
-        with_timer = request.data.get('with_timer', False)
-
-        # التحقق من نوع الاختبار
-        if test_type not in ['full', 'section']:
-            return Response(
-                {'error': 'نوع الاختبار غير صحيح'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-
-        # حساب عدد الأسئلة
-        if test_type == 'full':
-            total_questions = 65
-            section = None
-        else:
-            if not section_id:
-                return Response(
-                    {'error': 'معرف القسم مطلوب لاختبار القسم'},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-            try:
-                section = Section.objects.get(section_id=section_id)
-                total_questions = section.questions.filter(is_active=True).count()
-            except Section.DoesNotExist:
-                return Response(
-                    {'error': 'القسم غير موجود'},
-                    status=status.HTTP_404_NOT_FOUND
-                )
-
-        # إنشاء المحاولة
-        attempt = TestAttempt.objects.create(
-            test_type=test_type,
-            section=section,
-            with_timer=with_timer,
-            total_questions=total_questions,
-            user_ip=self._get_client_ip(request),
-            user_agent=request.META.get('HTTP_USER_AGENT', '')
-        )
-
-        serializer = self.get_serializer(attempt)
-        return Response(serializer.data, status=status.HTTP_201_CREATED)
-
-    @action(detail=True, methods=['post'])
-    def submit(self, request, pk=None):
-        """
-        إرسال نتائج الاختبار
-        Body: {
-            "answers": {
-                "question_id": selected_answer_index,
-                ...
-            }
-        }
-        """
-        attempt = self.get_object()
-
-        # التحقق من أن الاختبار لم يكتمل بعد
-        if attempt.completed_at:
-            return Response(
-                {'error': 'تم إكمال هذا الاختبار مسبقاً'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-
-        # التحقق من البيانات
-        submission_serializer = TestSubmissionSerializer(data=request.data)
-        if not submission_serializer.is_valid():
-            return Response(
-                submission_serializer.errors,
-                status=status.HTTP_400_BAD_REQUEST
-            )
-
-        answers_data = submission_serializer.validated_data['answers']
-
-        # حفظ الإجابات
-        for question_id, selected_answer in answers_data.items():
-            try:
-                question = Question.objects.get(id=question_id)
-                is_correct = question.correct_answer == selected_answer
-
-                TestAnswer.objects.create(
-                    attempt=attempt,
-                    question=question,
-                    selected_answer=selected_answer,
-                    is_correct=is_correct
-                )
-            except Question.DoesNotExist:
-                continue
-
-        # تحديث المحاولة
-        attempt.completed_at = timezone.now()
-        attempt.calculate_results()
-
-        # إرجاع النتائج
-        serializer = self.get_serializer(attempt)
-        return Response(serializer.data)
-
-    @action(detail=False, methods=['get'])
-    def statistics(self, request):
-        """إحصائيات عامة"""
-        total_attempts = TestAttempt.objects.filter(
-            completed_at__isnull=False
-        ).count()
-
-        passed_attempts = TestAttempt.objects.filter(
-            completed_at__isnull=False,
-            passed=True
-        ).count()
-
-        full_test_attempts = TestAttempt.objects.filter(
-            test_type='full',
-            completed_at__isnull=False
-        ).count()
-
-        stats = {
-            'total_attempts': total_attempts,
-            'passed_attempts': passed_attempts,
-            'failed_attempts': total_attempts - passed_attempts,
-            'pass_rate': (passed_attempts / total_attempts * 100) if total_attempts > 0 else 0,
-            'full_test_attempts': full_test_attempts,
-        }
-
-        return Response(stats)
-
-    def _get_client_ip(self, request):
-        """الحصول على IP العميل"""
-        x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-        if x_forwarded_for:
-            ip = x_forwarded_for.split(',')[0]
-        else:
-            ip = request.META.get('REMOTE_ADDR')
-        return ip
\ No newline at end of file
+import json
+
+from rest_framework import viewsets, status, permissions
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from django.core.cache import cache
+from django.http import HttpResponse, StreamingHttpResponse
+from django.db.models import Count, F, Q, Prefetch, prefetch_related_objects
+
+from .models import (
+    Section,
+    Question,
+    TestAttempt,
+    TestAnswer,
+    QuestionStatistics,
+    AttemptStatistics,
+    DailyAttemptStatistics,
+    MAX_OPTIONS
+)
+from .serializers import (
+    SectionSerializer,
+    QuestionSerializer,
+    QuestionWithoutAnswerSerializer,
+    TestAttemptSerializer,
+    TestAttemptListSerializer,
+    TestSubmissionSerializer,
+    TestAnswerSubmissionSerializer,
+    TestAnswerBatchSerializer
+)
+from .question_pool import question_pool, get_pool_version, FULL_TEST_DISTRIBUTION
+from .pagination import AttemptPagination, QuestionPagination
+from .payload_cache import question_payload_cache, render_with_fragments
+from .instrumentation import InstrumentedViewMixin, timed_serialization
+from .http_caching import BankVersionCacheMixin
+from .sampling import adaptive_sampler
+from .search import question_search
+from .write_behind import attempt_buffer
+from .export import ExportError, iter_export, export_filename, export_content_type
+from .negotiation import (
+    QuestionShape,
+    MessagePackRenderer,
+    COLUMNAR,
+    compact_renderer_classes,
+    to_columnar
+)
+from .exam_pool import (
+    exam_pool,
+    generate_exam_ids,
+    render_exam,
+    build_exam_snapshot,
+    ExamSnapshotError
+)
+
+
+def get_client_ip(request):
+    """الحصول على IP العميل"""
+    x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
+    if x_forwarded_for:
+        ip = x_forwarded_for.split(',')[0]
+    else:
+        ip = request.META.get('REMOTE_ADDR')
+    return ip
+
+
+def answers_queryset():
+    """الإجابات مع نص السؤال فقط"""
+    return TestAnswer.objects.select_related('question').only(
+        'id',
+        'attempt_id',
+        'question_id',
+        'question__text_ar',
+        'selected_answer',
+        'is_correct',
+        'answered_at',
+        'time_spent_seconds',
+    )
+
+
+def parse_selected_answers(answers_data):
+    """تحويل {question_id: selected_answer} إلى مفاتيح رقمية مع تجاهل المعرفات غير الصالحة"""
+    selected_answers = {}
+    for question_id, selected_answer in answers_data.items():
+        try:
+            selected_answers[int(question_id)] = selected_answer
+        except (TypeError, ValueError):
+            continue
+    return selected_answers
+
+
+def invalid_answers_error(selected_answers, state):
+    """
+    خطأ 400 إذا كان رقم الخيار المختار أكبر من خيارات السؤال (حسب الفهرس)
+    الأسئلة غير الموجودة في الفهرس يتجاهلها التصحيح أصلاً
+    """
+    invalid = sorted(
+        pk for pk, selected in selected_answers.items()
+        if selected >= state.option_counts.get(pk, MAX_OPTIONS)
+    )
+    if not invalid:
+        return None
+    return {'selected_answer': f"رقم الخيار خارج نطاق خيارات السؤال: {', '.join(map(str, invalid))}"}
+
+
+class SectionViewSet(BankVersionCacheMixin, InstrumentedViewMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    API للأقسام
+    - list: عرض جميع الأقسام
+    - retrieve: عرض قسم محدد
+    - statistics: إحصائيات القسم
+    - all_statistics: إحصائيات جميع الأقسام (sections/statistics/)
+    """
+    queryset = Section.objects.all()
+    serializer_class = SectionSerializer
+    lookup_field = 'section_id'
+    conditional_actions = ('list', 'retrieve', 'statistics', 'all_statistics')
+
+    @action(detail=True, methods=['get'])
+    def statistics(self, request, section_id=None):
+        """إحصائيات القسم"""
+        section = self.get_object()
+        return Response(self._build_statistics(section))
+
+    @action(detail=False, methods=['get'], url_path='statistics')
+    def all_statistics(self, request):
+        """إحصائيات جميع الأقسام في استعلام واحد"""
+        cache_key = f'section-statistics:{get_pool_version()}'
+        stats = cache.get(cache_key)
+
+        if stats is None:
+            stats = [
+                self._build_statistics(section)
+                for section in self._annotate_statistics(self.get_queryset())
+            ]
+            cache.set(cache_key, stats, timeout=None)
+
+        return Response(stats)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'statistics':
+            queryset = self._annotate_statistics(queryset)
+        return queryset
+
+    def _annotate_statistics(self, queryset):
+        """إضافة أعداد الأسئلة النشطة حسب الصعوبة كتجميع شرطي"""
+        active = Q(questions__is_active=True)
+        return queryset.annotate(
+            total_questions=Count('questions', filter=active),
+            easy_questions=Count('questions', filter=active & Q(questions__difficulty='easy')),
+            medium_questions=Count('questions', filter=active & Q(questions__difficulty='medium')),
+            hard_questions=Count('questions', filter=active & Q(questions__difficulty='hard')),
+        ).order_by(*Section._meta.ordering)
+
+    def _build_statistics(self, section):
+        return {
+            'section_id': section.section_id,
+            'section_name': section.name_ar,
+            'total_questions': section.total_questions,
+            'difficulty_breakdown': {
+                'easy': section.easy_questions,
+                'medium': section.medium_questions,
+                'hard': section.hard_questions,
+            }
+        }
+
+
+class QuestionViewSet(BankVersionCacheMixin, InstrumentedViewMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    API للأسئلة
+    - list: عرض جميع الأسئلة
+    - retrieve: عرض سؤال محدد
+    - random_full_test: توليد 65 سؤال عشوائي
+    - by_section: الحصول على أسئلة قسم محدد
+    - weak_areas: أسئلة مرجحة بالصعوبة ونسبة الخطأ
+    - analytics: إحصائيات سؤال أو عدة أسئلة (questions/analytics/)
+    - search: البحث في نصوص الأسئلة وخياراتها وشروحها (questions/search/?q=)
+    - lang=ar|en|sv و fields=... و layout=columnar لتقليص حجم الاستجابة
+    """
+    queryset = Question.objects.filter(is_active=True).select_related('section')
+    serializer_class = QuestionSerializer
+    pagination_class = QuestionPagination
+    renderer_classes = api_settings.DEFAULT_RENDERER_CLASSES + compact_renderer_classes()
+    conditional_actions = ('list', 'retrieve', 'by_section')
+    question_shape = None
+
+    def is_conditional(self, request, action):
+        # الأسئلة العشوائية تختلف في كل طلب
+        return super().is_conditional(request, action) and 'random' not in request.GET
+
+    def get_serializer_class(self):
+        """اختيار المحول المناسب"""
+        if self.action in ['random_full_test', 'by_section', 'weak_areas', 'search']:
+            return QuestionWithoutAnswerSerializer
+        return QuestionSerializer
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action in ['analytics', 'bulk_analytics']:
+            queryset = queryset.select_related('statistics')
+        return queryset
+
+    def validate_query(self, request):
+        # lang و fields و layout (أخطاء الحقول تظهر هنا قبل أي استعلام أو رد 304)
+        self.question_shape = QuestionShape.from_request(request)
+        self.get_serializer().fields
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['question_shape'] = self.question_shape
+        return context
+
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        if self.question_shape.layout == COLUMNAR:
+            response.data['results'] = to_columnar(response.data['results'])
+        return response
+
+    @action(detail=False, methods=['get'])
+    def random_full_test(self, request):
+        """
+        توليد 65 سؤال عشوائي حسب التوزيع المطلوب:
+        - 16 من السلامة المرورية
+        - 32 من قواعد المرور
+        - 5 من البيئة
+        - 7 من معرفة المركبة والمناورة
+        - 5 من الشروط الشخصية
+        """
+        try:
+            shape = self.question_shape
+            if not shape.is_default or shape.layout:
+                return self._render_questions({
+                    'total': 0,
+                    'distribution': FULL_TEST_DISTRIBUTION,
+                }, generate_exam_ids())
+
+            # اختبار جاهز من المجمّع إن وجد، وإلا يُولّد عند الطلب
+            body = exam_pool.pop()
+            if body is None:
+                body = render_exam(generate_exam_ids())
+            return HttpResponse(body, content_type='application/json')
+
+        except Exception as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+    def _render_questions(self, envelope, question_ids):
+        """بناء استجابة JSON بدمج أجزاء الأسئلة المخزنة مؤقتاً"""
+        shape = self.question_shape
+        fragments = question_payload_cache.render(question_ids, shape)
+        envelope['total'] = len(fragments)
+        if shape.layout == COLUMNAR or isinstance(self.request.accepted_renderer, MessagePackRenderer):
+            questions = [json.loads(fragment) for fragment in fragments]
+            envelope['questions'] = to_columnar(questions) if shape.layout == COLUMNAR else questions
+            return Response(envelope)
+        with timed_serialization():
+            body = render_with_fragments(envelope, 'questions', fragments)
+        return HttpResponse(body, content_type='application/json')
+
+    @action(detail=False, methods=['get'])
+    def by_section(self, request):
+        """
+        الحصول على أسئلة قسم محدد
+        Parameters:
+            - section_id: معرف القسم
+            - random: عدد الأسئلة العشوائية (اختياري)
+        """
+        section_id = request.query_params.get('section_id')
+        random_count = request.query_params.get('random')
+
+        if not section_id:
+            return Response(
+                {'error': 'معرف القسم مطلوب (section_id)'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            section = Section.objects.get(section_id=section_id)
+            question_ids = list(question_pool.get_ids(section_id))
+
+            # إذا طلب عدد عشوائي محدد
+            if random_count:
+                try:
+                    count = int(random_count)
+                    question_ids = question_pool.sample_ids(section_id, count)
+                except ValueError:
+                    pass
+
+            return self._render_questions({
+                'section': SectionSerializer(section).data,
+                'total': len(question_ids),
+            }, question_ids)
+
+        except Section.DoesNotExist:
+            return Response(
+                {'error': 'القسم غير موجود'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+    @action(detail=False, methods=['get'])
+    def weak_areas(self, request):
+        """
+        تدرّب على نقاط الضعف: أسئلة مرجحة بالصعوبة ونسبة الخطأ
+        Parameters:
+            - section_id: معرف القسم (اختياري، بدونه اختبار كامل بنفس التوزيع)
+            - count: عدد الأسئلة من القسم (الافتراضي 20)
+        """
+        section_id = request.query_params.get('section_id')
+        if not section_id:
+            return self._render_questions({
+                'mode': 'weak_areas',
+                'total': 0,
+                'distribution': FULL_TEST_DISTRIBUTION,
+            }, adaptive_sampler.generate_exam_ids())
+
+        try:
+            count = int(request.query_params.get('count', 20))
+        except ValueError:
+            return Response(
+                {'error': 'عدد الأسئلة يجب أن يكون رقماً صحيحاً'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            section = Section.objects.get(section_id=section_id)
+        except Section.DoesNotExist:
+            return Response(
+                {'error': 'القسم غير موجود'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        return self._render_questions({
+            'mode': 'weak_areas',
+            'section': SectionSerializer(section).data,
+            'total': 0,
+        }, adaptive_sampler.sample_ids(section_id, max(count, 0)))
+
+    # أقصى عدد لنتائج البحث في طلب واحد
+    search_max_limit = 100
+
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        """
+        البحث في نصوص الأسئلة وخياراتها وشروحها بكل اللغات (مرتبة حسب الصلة)
+        Parameters:
+            - q: نص البحث (التشكيل وأشكال الألف لا تؤثر، والكلمة الأخيرة تطابق البادئة)
+            - section_id: معرف القسم (اختياري)
+            - limit: عدد النتائج (الافتراضي 20، الأقصى 100)
+        """
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response(
+                {'error': 'نص البحث مطلوب (q)'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            limit = int(request.query_params.get('limit', 20))
+        except ValueError:
+            return Response(
+                {'error': 'عدد النتائج يجب أن يكون رقماً صحيحاً'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        results = question_search.search(
+            query,
+            section_id=request.query_params.get('section_id') or None,
+            limit=min(max(limit, 0), self.search_max_limit)
+        )
+        return self._render_questions({
+            'query': query,
+            'total': 0,
+        }, [pk for pk, score in results])
+
+    # ترتيب التحليلات المسموح به: اسم المعامل -> عمود جدول الإحصائيات
+    analytics_ordering = {
+        'answered_count': 'statistics__answered_count',
+        'percent_correct': 'statistics__percent_correct',
+        'median_time_seconds': 'statistics__median_time_seconds',
+    }
+
+    def _build_analytics(self, question):
+        statistics = getattr(question, 'statistics', None) or QuestionStatistics(question=question)
+        return {
+            'id': question.id,
+            'question_id': question.question_id,
+            'section': question.section.section_id,
+            'difficulty': question.difficulty,
+            **statistics.as_dict(),
+        }
+
+    @action(detail=True, methods=['get'])
+    def analytics(self, request, pk=None):
+        """إحصائيات سؤال من الجدول المجمع"""
+        return Response(self._build_analytics(self.get_object()))
+
+    @action(detail=False, methods=['get'], url_path='analytics')
+    def bulk_analytics(self, request):
+        """
+        إحصائيات عدة أسئلة من الجدول المجمع
+        Parameters:
+            - ids: معرفات الأسئلة مفصولة بفواصل، أو
+            - section_id: معرف القسم
+            - ordering: answered_count أو percent_correct أو median_time_seconds (مع - للتنازلي)
+        """
+        ids = request.query_params.get('ids')
+        section_id = request.query_params.get('section_id')
+        ordering = request.query_params.get('ordering', 'percent_correct')
+
+        queryset = self.get_queryset()
+        if ids:
+            try:
+                queryset = queryset.filter(pk__in=[int(pk) for pk in ids.split(',') if pk.strip()])
+            except ValueError:
+                return Response(
+                    {'error': 'معرفات الأسئلة غير صالحة'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        elif section_id:
+            queryset = queryset.filter(section__section_id=section_id)
+        else:
+            return Response(
+                {'error': 'يجب تحديد ids أو section_id'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        column = self.analytics_ordering.get(ordering.lstrip('-'))
+        if column is None:
+            return Response(
+                {'error': f"الترتيب المدعوم: {', '.join(self.analytics_ordering)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if ordering.startswith('-'):
+            order = F(column).desc(nulls_last=True)
+        else:
+            order = F(column).asc(nulls_last=True)
+
+        return Response([
+            self._build_analytics(question)
+            for question in queryset.order_by(order, 'question_id')
+        ])
+
+
+class TestAttemptViewSet(InstrumentedViewMixin, viewsets.ModelViewSet):
+    """
+    API لمحاولات الاختبار
+    - create: إنشاء محاولة جديدة مع نسخة من أسئلتها
+    - questions: استئناف الاختبار بنفس الأسئلة
+    - submit: إرسال نتائج الاختبار
+    - answer / answer_batch: تسجيل الإجابات أثناء الاختبار
+    - finalize: إنهاء الاختبار باستخدام العدادات الجارية
+    - export: تصدير المحاولات والإجابات بتدفق (CSV / JSONL)
+    - statistics: إحصائيات عامة
+    """
+    queryset = TestAttempt.objects.select_related('section')
+    serializer_class = TestAttemptSerializer
+    pagination_class = AttemptPagination
+
+    # الأعمدة المطلوبة لعرض قائمة المحاولات
+    list_fields = [
+        'id',
+        'test_type',
+        'section',
+        'section__name_ar',
+        'with_timer',
+        'started_at',
+        'completed_at',
+        'total_questions',
+        'answered_questions',
+        'correct_answers',
+        'score_percentage',
+        'passed',
+        'time_taken_seconds',
+    ]
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            return queryset.only(*self.list_fields)
+        if self.action == 'retrieve':
+            return queryset.prefetch_related(self._answers_prefetch())
+        return queryset
+
+    def get_serializer_class(self):
+        """قائمة المحاولات بدون الإجابات المتداخلة"""
+        if self.action == 'list':
+            return TestAttemptListSerializer
+        return TestAttemptSerializer
+
+    def update(self, request, *args, **kwargs):
+        """تعديل المحاولة وإرجاعها مع الإجابات دون استعلامات متكررة"""
+        partial = kwargs.pop('partial', False)
+        attempt = self.get_object()
+        serializer = self.get_serializer(attempt, data=request.data, partial=partial)
+        serializer.is_valid(raise_exception=True)
+        self.perform_update(serializer)
+        return Response(self._serialize_attempt(serializer.instance))
+
+    def get_object(self):
+        pk = self.kwargs.get(self.lookup_url_kwarg or self.lookup_field)
+        if not attempt_buffer.enabled:
+            return super().get_object()
+        # محاولة في مخزن هذه العملية لم تُكتب بعد، وإلا فالبحث في قاعدة البيانات مباشرة
+        # (محاولة في مخزن عملية أخرى تأخذ 404 حتى تُكتب خلال مهلة الكتابة)
+        attempt_buffer.flush_pending(pk)
+        return super().get_object()
+
+    def _answers_prefetch(self):
+        """جلب الإجابات مع نص السؤال فقط باستعلام واحد"""
+        return Prefetch('answers', queryset=answers_queryset())
+
+    def _serialize_attempt(self, attempt):
+        """تحويل المحاولة مع إجاباتها بعد تعديلها"""
+        prefetch_related_objects([attempt], self._answers_prefetch())
+        return self.get_serializer(attempt).data
+
+    def create(self, request, *args, **kwargs):
+        """إنشاء محاولة اختبار جديدة"""
+        test_type = request.data.get('test_type')
+        section_id = request.data.get('section_id')
+        with_timer = request.data.get('with_timer', False)
+
+        # التحقق من نوع الاختبار
+        if test_type not in ['full', 'section']:
+            return Response(
+                {'error': 'نوع الاختبار غير صحيح'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if test_type == 'full':
+            section = None
+        else:
+            if not section_id:
+                return Response(
+                    {'error': 'معرف القسم مطلوب لاختبار القسم'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            try:
+                section = Section.objects.get(section_id=section_id)
+            except Section.DoesNotExist:
+                return Response(
+                    {'error': 'القسم غير موجود'},
+                    status=status.HTTP_404_NOT_FOUND
+                )
+
+        # تحديد أسئلة الاختبار (المستلمة أو المولّدة من البذرة) وحفظ نسخة منها
+        state = question_pool.get_state()
+        try:
+            question_ids, answer_keys, seed = build_exam_snapshot(
+                state,
+                test_type,
+                section_id,
+                request.data.get('question_ids'),
+                request.data.get('seed')
+            )
+        except ExamSnapshotError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        # إنشاء المحاولة
+        attempt = TestAttempt(
+            test_type=test_type,
+            section=section,
+            with_timer=with_timer,
+            user_ip=get_client_ip(request),
+            user_agent=request.META.get('HTTP_USER_AGENT', '')
+        )
+        attempt.set_snapshot(question_ids, answer_keys, seed, state.version)
+        if attempt_buffer.enabled:
+            # معرف محجوز مسبقاً والكتابة لاحقاً على دفعات
+            attempt_buffer.add(attempt)
+            attempt._prefetched_objects_cache = {'answers': TestAnswer.objects.none()}
+            return Response(self.get_serializer(attempt).data, status=status.HTTP_201_CREATED)
+        attempt.save()
+
+        return Response(self._serialize_attempt(attempt), status=status.HTTP_201_CREATED)
+
+    @action(detail=True, methods=['post'])
+    def submit(self, request, pk=None):
+        """
+        إرسال نتائج الاختبار
+        Body: {
+            "answers": {
+                "question_id": selected_answer_index,
+                ...
+            }
+        }
+        الإجابات المسجلة مسبقاً عبر answer تُدمج مع الإجابات المرسلة.
+        """
+        attempt = self.get_object()
+
+        # التحقق من أن الاختبار لم يكتمل بعد
+        error = self._check_in_progress(attempt)
+        if error:
+            return error
+
+        # التحقق من البيانات
+        submission_serializer = TestSubmissionSerializer(data=request.data)
+        if not submission_serializer.is_valid():
+            return Response(
+                submission_serializer.errors,
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        selected_answers = parse_selected_answers(
+            submission_serializer.validated_data['answers']
+        )
+        error = invalid_answers_error(selected_answers, question_pool.get_state())
+        if error:
+            return Response(error, status=status.HTTP_400_BAD_REQUEST)
+
+        # تصحيح الإجابات وحفظها وإنهاء المحاولة في معاملة واحدة
+        if not attempt.submit_answers(selected_answers):
+            return self._completed_error()
+
+        # إرجاع النتائج
+        return Response(self._serialize_attempt(attempt))
+
+    @action(detail=True, methods=['get'])
+    def questions(self, request, pk=None):
+        """
+        استئناف الاختبار: نفس الأسئلة بنفس الترتيب مع الإجابات المسجلة
+        (بدون الإجابات الصحيحة)
+        """
+        attempt = self.get_object()
+
+        if not attempt.has_snapshot:
+            return Response(
+                {'error': 'لا توجد نسخة محفوظة من أسئلة هذه المحاولة'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        answers = attempt.answers.order_by().values_list('question_id', 'selected_answer')
+        fragments = question_payload_cache.render(attempt.get_question_ids())
+        with timed_serialization():
+            body = render_with_fragments({
+                'attempt': attempt.id,
+                'seed': attempt.exam_seed,
+                'completed': attempt.completed_at is not None,
+                'answers': {str(question_id): selected for question_id, selected in answers},
+                'total': len(fragments),
+            }, 'questions', fragments)
+        return HttpResponse(body, content_type='application/json')
+
+    @action(detail=True, methods=['post'])
+    def answer(self, request, pk=None):
+        """
+        تسجيل إجابة واحدة أثناء الاختبار
+        Body: {
+            "question": question_id,
+            "selected_answer": selected_answer_index,
+            "time_spent_seconds": 12  (اختياري)
+        }
+        """
+        attempt = self.get_object()
+
+        error = self._check_in_progress(attempt)
+        if error:
+            return error
+
+        answer_serializer = TestAnswerSubmissionSerializer(data=request.data)
+        if not answer_serializer.is_valid():
+            return Response(
+                answer_serializer.errors,
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        return self._record_answers(attempt, [answer_serializer.validated_data])
+
+    @action(detail=True, methods=['post'], url_path='answer/batch')
+    def answer_batch(self, request, pk=None):
+        """
+        تسجيل مجموعة من الإجابات أثناء الاختبار
+        Body: {
+            "answers": [
+                {"question": question_id, "selected_answer": 1, "time_spent_seconds": 12},
+                ...
+            ]
+        }
+        """
+        attempt = self.get_object()
+
+        error = self._check_in_progress(attempt)
+        if error:
+            return error
+
+        batch_serializer = TestAnswerBatchSerializer(data=request.data)
+        if not batch_serializer.is_valid():
+            return Response(
+                batch_serializer.errors,
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        return self._record_answers(attempt, batch_serializer.validated_data['answers'])
+
+    @action(detail=True, methods=['post'])
+    def finalize(self, request, pk=None):
+        """إنهاء الاختبار بعد تسجيل الإجابات عبر answer"""
+        attempt = self.get_object()
+
+        error = self._check_in_progress(attempt)
+        if error:
+            return error
+
+        if not attempt.finalize():
+            return self._completed_error()
+
+        return Response(self._serialize_attempt(attempt))
+
+    def _record_answers(self, attempt, answers_data):
+        """تسجيل الإجابات وإرجاع العدادات الحالية"""
+        selected_answers = {}
+        time_spent = {}
+        for item in answers_data:
+            selected_answers[item['question']] = item['selected_answer']
+            if item.get('time_spent_seconds') is not None:
+                time_spent[item['question']] = item['time_spent_seconds']
+
+        error = invalid_answers_error(selected_answers, question_pool.get_state())
+        if error:
+            return Response(error, status=status.HTTP_400_BAD_REQUEST)
+
+        recorded = attempt.record_answers(selected_answers, time_spent)
+        if recorded is None:
+            return self._completed_error()
+
+        return Response({
+            'id': attempt.id,
+            'recorded': len(recorded),
+            'answered_questions': attempt.answered_questions,
+            'total_questions': attempt.total_questions,
+        })
+
+    def _check_in_progress(self, attempt):
+        """التحقق من أن الاختبار لم يكتمل بعد"""
+        if attempt.completed_at:
+            return self._completed_error()
+        return None
+
+    def _completed_error(self):
+        return Response(
+            {'error': 'تم إكمال هذا الاختبار مسبقاً'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    @action(detail=False, methods=['get'], permission_classes=[permissions.IsAdminUser])
+    def export(self, request):
+        """
+        تصدير المحاولات أو الإجابات بتدفق (للمشرفين)
+        Parameters:
+            - kind: attempts أو answers
+            - output: csv أو jsonl (format محجوز لتفاوض DRF)
+            - since / until: YYYY-MM-DD (اختياري)
+            - section_id: معرف القسم (اختياري)
+            - compress: gzip (اختياري)
+            - include_archived: 1 لإضافة المحاولات المؤرشفة (لا تُصدّر افتراضياً)
+        """
+        params = request.query_params
+        kind = params.get('kind', 'attempts')
+        export_format = params.get('output', 'csv')
+        compress = params.get('compress') == 'gzip'
+
+        try:
+            chunks = iter_export(
+                kind,
+                export_format,
+                compress,
+                since=params.get('since'),
+                until=params.get('until'),
+                section_id=params.get('section_id'),
+                include_archived=params.get('include_archived', '').lower() in ('1', 'true', 'yes')
+            )
+        except ExportError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        response = StreamingHttpResponse(chunks, content_type=export_content_type(export_format, compress))
+        response['Content-Disposition'] = (
+            f'attachment; filename="{export_filename(kind, export_format, compress)}"'
+        )
+        return response
+
+    @action(detail=False, methods=['get'])
+    def statistics(self, request):
+        """
+        إحصائيات عامة من الجداول المجمعة
+        Parameters:
+            - days: عدد الأيام الأخيرة (اختياري، مثال 7 أو 30)
+        """
+        days = request.query_params.get('days')
+
+        if days:
+            try:
+                days = int(days)
+            except ValueError:
+                days = 0
+            if days <= 0:
+                return Response(
+                    {'error': 'عدد الأيام يجب أن يكون رقماً موجباً'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            stats = DailyAttemptStatistics.get_window(days).as_dict()
+            stats['days'] = days
+        else:
+            stats = AttemptStatistics.get_totals().as_dict()
+
+        return Response(stats)
@@ -0,0 +1,328 @@
+"""
+كتابة مؤجلة (write-behind) لإنشاء محاولات الاختبار
+
+بدلاً من INSERT لكل طلب تُحجز معرفات المحاولات مسبقاً على دفعات من
+تسلسل الجدول نفسه (فلا تتعارض مع الإدراج العادي)، وتُحفظ المحاولات في
+الذاكرة ثم يكتبها خيط خلفي بـ bulk_create كل INTERVAL_MS أو عند
+امتلاء MAX_ROWS.
+
+أي طلب لاحق على محاولة لم تُكتب بعد (answer، submit، ...) يكتب المخزن
+المؤقت أولاً. مع عدة عمليات (workers) قد يصل الطلب لعملية أخرى قبل
+الكتابة فيأخذ 404، والمحاولة تُكتب خلال INTERVAL_MS فيمكن إعادة الطلب.
+
+إذا فشلت كتابة دفعة تُكتب صفاً صفاً: الصفوف المرفوضة (قيد أو قيمة غير
+صالحة) تُنقل إلى ملف dead-attempts-*.jsonl في مجلد السجل ولا يُعاد
+تجربتها، أما أخطاء الاتصال فتُعيد الصفوف المتبقية إلى المخزن لمحاولة لاحقة.
+
+مستويات الحفظ (ATTEMPT_WRITE_BEHIND_DURABILITY):
+- memory: الذاكرة فقط؛ توقف العملية المفاجئ يفقد ما لم يُكتب بعد
+- journal: كل محاولة تُضاف إلى ملف سجل قبل الرد (تنجو من توقف العملية)
+- fsync: مثل journal مع fsync لكل محاولة (تنجو من انقطاع الكهرباء)
+ملفات السجل تُحذف بعد الكتابة الناجحة، والأمر replay_attempt_journal
+يعيد كتابة ما تبقى منها بعد توقف مفاجئ (قبل تشغيل الخادم).
+
+الإعدادات:
+- ATTEMPT_WRITE_BEHIND: تفعيل الكتابة المؤجلة
+- ATTEMPT_WRITE_BEHIND_MAX_ROWS / ATTEMPT_WRITE_BEHIND_INTERVAL_MS
+- ATTEMPT_WRITE_BEHIND_ID_BLOCK: عدد المعرفات المحجوزة في كل مرة
+- ATTEMPT_WRITE_BEHIND_DURABILITY / ATTEMPT_WRITE_BEHIND_JOURNAL_DIR
+- ATTEMPT_WRITE_BEHIND_THREAD: الكتابة في خيط خلفي (وإلا عند الامتلاء فقط)
+"""
+import atexit
+import glob
+import os
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core import serializers
+from django.db import DataError, IntegrityError, connection, transaction
+
+from .models import TestAttempt
+
+
+DURABILITY_LEVELS = ('memory', 'journal', 'fsync')
+
+# أخطاء تخص صفاً بعينه فلا تنجح إعادة كتابته أبداً
+ROW_ERRORS = (IntegrityError, DataError, ValueError, OverflowError)
+
+
+class IdAllocator:
+    """حجز معرفات المحاولات على دفعات من تسلسل الجدول"""
+
+    def __init__(self, model):
+        self.model = model
+        self._lock = threading.Lock()
+        self._ids = []
+
+    @property
+    def block_size(self):
+        return max(1, getattr(settings, 'ATTEMPT_WRITE_BEHIND_ID_BLOCK', 100))
+
+    @staticmethod
+    def is_supported():
+        return connection.vendor in ('postgresql', 'sqlite')
+
+    def allocate(self):
+        with self._lock:
+            if not self._ids:
+                self._ids = self._reserve(self.block_size)
+                self._ids.reverse()
+            return self._ids.pop()
+
+    def _reserve(self, count):
+        table = self.model._meta.db_table
+        column = self.model._meta.pk.column
+        with transaction.atomic(), connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute(
+                    'SELECT nextval(pg_get_serial_sequence(%s, %s)) FROM generate_series(1, %s)',
+                    [table, column, count]
+                )
+                return [row[0] for row in cursor.fetchall()]
+
+            # SQLite: AUTOINCREMENT يحفظ آخر معرف في sqlite_sequence
+            cursor.execute(
+                'INSERT INTO sqlite_sequence (name, seq) '
+                f'SELECT %s, COALESCE((SELECT MAX({connection.ops.quote_name(column)}) '
+                f'FROM {connection.ops.quote_name(table)}), 0) '
+                'WHERE NOT EXISTS (SELECT 1 FROM sqlite_sequence WHERE name = %s)',
+                [table, table]
+            )
+            cursor.execute('UPDATE sqlite_sequence SET seq = seq + %s WHERE name = %s', [count, table])
+            cursor.execute('SELECT seq FROM sqlite_sequence WHERE name = %s', [table])
+            last = cursor.fetchone()[0]
+            return list(range(last - count + 1, last + 1))
+
+    def reset(self):
+        with self._lock:
+            self._ids = []
+
+
+def journal_files(directory=None):
+    """ملفات السجل الموجودة (من هذه العملية أو عمليات سابقة)"""
+    directory = directory or settings.ATTEMPT_WRITE_BEHIND_JOURNAL_DIR
+    return sorted(glob.glob(os.path.join(directory, 'attempts-*.jsonl')))
+
+
+def dead_letter_files(directory=None):
+    """ملفات المحاولات التي رفضت قاعدة البيانات كتابتها (للفحص اليدوي)"""
+    directory = directory or settings.ATTEMPT_WRITE_BEHIND_JOURNAL_DIR
+    return sorted(glob.glob(os.path.join(directory, 'dead-attempts-*.jsonl')))
+
+
+def replay_journal(path):
+    """كتابة محاولات ملف سجل (المكتوبة سابقاً تُتجاهل) ثم حذفه، وإرجاع عددها"""
+    with open(path, encoding='utf-8') as journal:
+        attempts = [
+            item.object
+            for line in journal if line.strip()
+            for item in serializers.deserialize('json', line)
+        ]
+    TestAttempt.objects.bulk_create(attempts, ignore_conflicts=True)
+    os.remove(path)
+    return len(attempts)
+
+
+class AttemptWriteBuffer:
+    """مخزن مؤقت لمحاولات الاختبار الجديدة مع خيط كتابة خلفي"""
+
+    def __init__(self):
+        self.ids = IdAllocator(TestAttempt)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._rows = []
+        self._pending = set()
+        self._journal = None
+        self._journal_path = None
+        # ملفات سجل لدفعات فشلت كتابتها وأعيدت إلى المخزن
+        self._retry_journals = []
+        atexit.register(self._flush_at_exit)
+
+    @property
+    def enabled(self):
+        return getattr(settings, 'ATTEMPT_WRITE_BEHIND', False) and IdAllocator.is_supported()
+
+    @property
+    def max_rows(self):
+        return getattr(settings, 'ATTEMPT_WRITE_BEHIND_MAX_ROWS', 100)
+
+    @property
+    def interval(self):
+        return getattr(settings, 'ATTEMPT_WRITE_BEHIND_INTERVAL_MS', 50) / 1000
+
+    @property
+    def durability(self):
+        durability = getattr(settings, 'ATTEMPT_WRITE_BEHIND_DURABILITY', 'journal')
+        if durability not in DURABILITY_LEVELS:
+            print(f"تحذير: مستوى الحفظ {durability} غير معروف، سيتم استخدام journal")
+            return 'journal'
+        return durability
+
+    def __len__(self):
+        return len(self._rows)
+
+    def is_pending(self, pk):
+        try:
+            return int(pk) in self._pending
+        except (TypeError, ValueError):
+            return False
+
+    def add(self, attempt):
+        """حجز معرف للمحاولة وإضافتها إلى المخزن (تُكتب لاحقاً)"""
+        attempt.pk = self.ids.allocate()
+        durability = self.durability
+        with self._lock:
+            if durability != 'memory':
+                self._write_journal(attempt, durability == 'fsync')
+            self._rows.append(attempt)
+            self._pending.add(attempt.pk)
+            full = len(self._rows) >= self.max_rows
+
+        if getattr(settings, 'ATTEMPT_WRITE_BEHIND_THREAD', True):
+            self._ensure_thread()
+            if full:
+                self._wakeup.set()
+        elif full:
+            self.flush()
+        return attempt
+
+    def _write_journal(self, attempt, sync):
+        if self._journal is None:
+            directory = settings.ATTEMPT_WRITE_BEHIND_JOURNAL_DIR
+            os.makedirs(directory, exist_ok=True)
+            self._journal_path = os.path.join(
+                directory,
+                f'attempts-{os.getpid()}-{uuid.uuid4().hex[:8]}.jsonl'
+            )
+            self._journal = open(self._journal_path, 'a', encoding='utf-8')
+        self._journal.write(serializers.serialize('json', [attempt]) + '\n')
+        self._journal.flush()
+        if sync:
+            os.fsync(self._journal.fileno())
+
+    def flush(self):
+        """كتابة المحاولات المخزنة بـ bulk_create وإرجاع عددها"""
+        with self._flush_lock:
+            with self._lock:
+                rows = self._rows
+                journals = self._retry_journals
+                if self._journal is not None:
+                    self._journal.close()
+                    journals = journals + [self._journal_path]
+                self._rows = []
+                self._retry_journals = []
+                self._journal = None
+                self._journal_path = None
+
+            if not rows:
+                return 0
+
+            rejected = remaining = []
+            try:
+                with transaction.atomic():
+                    TestAttempt.objects.bulk_create(rows)
+            except Exception:
+                rejected, remaining = self._write_one_by_one(rows)
+                if len(remaining) == len(rows):
+                    # خطأ عام (الاتصال مثلاً): إعادة الدفعة مع ملفات سجلها لمحاولة لاحقة
+                    self._requeue(rows, journals)
+                    raise
+
+            if rejected:
+                self._dead_letter(rejected)
+            if remaining:
+                self._requeue(remaining, journals)
+            done = {row.pk for row in rows} - {row.pk for row in remaining}
+            with self._lock:
+                self._pending.difference_update(done)
+            if not remaining:
+                for path in journals:
+                    os.remove(path)
+            return len(rows) - len(rejected) - len(remaining)
+
+    def _write_one_by_one(self, rows):
+        """كتابة الصفوف واحداً واحداً وإرجاع (المرفوضة، المتبقية بعد خطأ عام)"""
+        rejected = []
+        for i, row in enumerate(rows):
+            try:
+                with transaction.atomic():
+                    TestAttempt.objects.bulk_create([row])
+            except ROW_ERRORS:
+                rejected.append(row)
+            except Exception:
+                return rejected, rows[i:]
+        return rejected, []
+
+    def _requeue(self, rows, journals):
+        with self._lock:
+            self._rows = rows + self._rows
+            self._retry_journals = journals + self._retry_journals
+
+    def _dead_letter(self, rows):
+        directory = settings.ATTEMPT_WRITE_BEHIND_JOURNAL_DIR
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f'dead-attempts-{os.getpid()}-{uuid.uuid4().hex[:8]}.jsonl')
+        with open(path, 'w', encoding='utf-8') as dead:
+            for row in rows:
+                dead.write(serializers.serialize('json', [row]) + '\n')
+            dead.flush()
+            os.fsync(dead.fileno())
+        print(f"خطأ: رفضت قاعدة البيانات {len(rows)} محاولة مؤجلة، حُفظت في {path}")
+
+    def flush_pending(self, pk):
+        """كتابة المخزن إذا كانت المحاولة المطلوبة لم تُكتب بعد"""
+        if self.is_pending(pk):
+            self.flush()
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name='attempt-write-behind',
+                    daemon=True
+                )
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            if not self._rows:
+                continue
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"خطأ في كتابة المحاولات المؤجلة: {e}")
+                time.sleep(self.interval)
+            finally:
+                connection.close_if_unusable_or_obsolete()
+
+    def _flush_at_exit(self):
+        if not self._rows:
+            return
+        try:
+            self.flush()
+        except Exception as e:
+            print(f"خطأ في كتابة المحاولات المؤجلة عند الإغلاق: {e}")
+
+    def discard(self):
+        """إفراغ المخزن دون كتابة (يحاكي توقف العملية؛ ملفات السجل تبقى)"""
+        with self._lock:
+            if self._journal is not None:
+                self._journal.close()
+            self._rows = []
+            self._pending = set()
+            self._journal = None
+            self._journal_path = None
+            self._retry_journals = []
+        self.ids.reset()
+
+
+attempt_buffer = AttemptWriteBuffer()
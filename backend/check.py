@@ -1,21 +1,35 @@
-import json
-
-
-def verify_file(file_path):
-    with open(file_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-
-    unique_texts = set()
-    total = 0
-    sections = data['swedish_driving_theory_test']['sections']
-
-    for sec_id, sec_data in sections.items():
-        for q in sec_data['questions']:
-            total += 1
-            unique_texts.add(q['question_text'].strip())
-
-    print(f"إجمالي الأسئلة في الملف: {total}")
-    print(f"الأسئلة الفريدة (بدون تكرار): {len(unique_texts)}")
-
-
-verify_file('data/1.json')  # تأكد من وضع اسم ملفك هنا
\ No newline at end of file
+import json
+import sys
+
+from api.duplicates import find_duplicates
+
+
+def verify_file(file_path):
+    with open(file_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    # القائمة المسطحة أو الصيغة المتداخلة حسب الأقسام
+    if isinstance(data, list):
+        questions = data
+    else:
+        sections = data['swedish_driving_theory_test']['sections']
+        questions = [q for sec_data in sections.values() for q in sec_data['questions']]
+
+    unique_texts = set()
+    records = []
+    for q in questions:
+        unique_texts.add(q['question_text'].strip())
+        records.append((q.get('question_id', len(records)), q['question_text'], q.get('options')))
+
+    # الأسئلة شبه المكررة (اختلاف التشكيل أو كلمة أو ترتيب الخيارات)
+    clusters = find_duplicates(records)
+    near_unique = len(records) - sum(len(cluster) - 1 for cluster in clusters)
+
+    print(f"إجمالي الأسئلة في الملف: {len(records)}")
+    print(f"الأسئلة الفريدة (بدون تكرار): {len(unique_texts)}")
+    print(f"الأسئلة الفريدة (بدون الأسئلة شبه المكررة): {near_unique}")
+    for cluster in clusters[:20]:
+        print(f"   ({cluster.similarity:.2f}) {', '.join(str(key) for key in cluster.keys)}")
+
+
+verify_file(sys.argv[1] if len(sys.argv) > 1 else 'data/1.json')  # تأكد من وضع اسم ملفك هنا
\ No newline at end of file
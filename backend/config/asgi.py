@@ -1,16 +1,19 @@
-"""
-ASGI config for config project.
-
-It exposes the ASGI callable as a module-level variable named ``application``.
-
-For more information on this file, see
-https://docs.djangoproject.com/en/6.0/howto/deployment/asgi/
-"""
-
-import os
-
-from django.core.asgi import get_asgi_application
-
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
-
-application = get_asgi_application()
+"""
+ASGI config for config project.
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/6.0/howto/deployment/asgi/
+"""
+
+import os
+
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+# تحت ASGI تُنفذ استعلامات ORM في خيوط sync_to_async، والاتصال الدائم لكل خيط
+# لا يُغلق عند نهاية الطلب، لذلك الافتراضي هنا اتصال جديد لكل طلب
+os.environ.setdefault('DB_CONN_MAX_AGE', '0')
+
+application = get_asgi_application()
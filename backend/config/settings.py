@@ -1,176 +1,269 @@
-"""
-Django settings for config project.
-
-Generated by 'django-admin startproject' using Django 6.0.
-
-For more information on this file, see
-https://docs.djangoproject.com/en/6.0/topics/settings/
-
-For the full list of settings and their values, see
-https://docs.djangoproject.com/en/6.0/ref/settings/
-"""
-
-from pathlib import Path
-import os
-from dotenv import load_dotenv
-
-load_dotenv()
-
-# Build paths inside the project like this: BASE_DIR / 'subdir'.
-BASE_DIR = Path(__file__).resolve().parent.parent
-
-
-# Quick-start development settings - unsuitable for production
-# See https://docs.djangoproject.com/en/6.0/howto/deployment/checklist/
-
-# SECURITY WARNING: keep the secret key used in production secret!
-SECRET_KEY = os.getenv('SECRET_KEY')
-
-# SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
-
-
-
-
-# Application definition
-
-INSTALLED_APPS = [
-    'django.contrib.admin',
-    'django.contrib.auth',
-    'django.contrib.contenttypes',
-    'django.contrib.sessions',
-    'django.contrib.messages',
-    'django.contrib.staticfiles',
-    'rest_framework',
-    'corsheaders',
-    'api',
-]
-
-MIDDLEWARE = [
-    'corsheaders.middleware.CorsMiddleware',
-    'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
-    'django.middleware.common.CommonMiddleware',
-    'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
-    'django.contrib.messages.middleware.MessageMiddleware',
-    'django.middleware.clickjacking.XFrameOptionsMiddleware',
-]
-
-ROOT_URLCONF = 'config.urls'
-
-TEMPLATES = [
-    {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
-        'DIRS': [],
-        'APP_DIRS': True,
-        'OPTIONS': {
-            'context_processors': [
-                'django.template.context_processors.request',
-                'django.contrib.auth.context_processors.auth',
-                'django.contrib.messages.context_processors.messages',
-            ],
-        },
-    },
-]
-
-WSGI_APPLICATION = 'config.wsgi.application'
-
-
-# Database
-# https://docs.djangoproject.com/en/6.0/ref/settings/#databases
-
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.postgresql',
-        'NAME': os.getenv('DB_NAME'),
-        'USER': os.getenv('DB_USER'),
-        'PASSWORD': os.getenv('DB_PASSWORD'),
-        'HOST': os.getenv('DB_HOST'),
-        'PORT': os.getenv('DB_PORT'),
-    }
-}
-
-
-# Password validation
-# https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
-
-AUTH_PASSWORD_VALIDATORS = [
-    {
-        'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
-    },
-    {
-        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
-    },
-    {
-        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
-    },
-    {
-        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
-    },
-]
-
-
-# Internationalization
-# https://docs.djangoproject.com/en/6.0/topics/i18n/
-
-LANGUAGE_CODE = 'ar'
-TIME_ZONE = 'Europe/Stockholm'
-USE_I18N = True
-USE_TZ = True
-
-# Static files
-STATIC_URL = 'static/'
-STATIC_ROOT = BASE_DIR / 'staticfiles'
-
-STATICFILES_DIRS = [
-    BASE_DIR / "static",
-]
-MEDIA_URL = 'media/'
-MEDIA_ROOT = BASE_DIR / 'media'
-
-DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
-
-# CORS Settings
-CORS_ALLOWED_ORIGINS = [
-    "http://localhost:3000",
-    "http://127.0.0.1:3000",
-    "http://localhost:5173",
-]
-
-CORS_ALLOW_CREDENTIALS = True
-# settings.py
-CORS_ALLOW_ALL_ORIGINS = True
-
-CORS_ALLOW_METHODS = [
-    'DELETE',
-    'GET',
-    'OPTIONS',
-    'PATCH',
-    'POST',
-    'PUT',
-]
-
-CORS_ALLOW_HEADERS = [
-    'accept',
-    'accept-encoding',
-    'authorization',
-    'content-type',
-    'dnt',
-    'origin',
-    'user-agent',
-    'x-csrftoken',
-    'x-requested-with',
-]
-# REST Framework Settings
-REST_FRAMEWORK = {
-    'DEFAULT_PERMISSION_CLASSES': [
-        'rest_framework.permissions.AllowAny',
-    ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
-    'PAGE_SIZE': 100,
-    'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
-        'rest_framework.renderers.BrowsableAPIRenderer',
-    ]
-}
\ No newline at end of file
+"""
+Django settings for config project.
+
+Generated by 'django-admin startproject' using Django 6.0.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/6.0/topics/settings/
+
+For the full list of settings and their values, see
+https://docs.djangoproject.com/en/6.0/ref/settings/
+"""
+
+from pathlib import Path
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Build paths inside the project like this: BASE_DIR / 'subdir'.
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+# Quick-start development settings - unsuitable for production
+# See https://docs.djangoproject.com/en/6.0/howto/deployment/checklist/
+
+# SECURITY WARNING: keep the secret key used in production secret!
+SECRET_KEY = os.getenv('SECRET_KEY')
+
+# SECURITY WARNING: don't run with debug turned on in production!
+DEBUG = True
+
+
+
+
+# Application definition
+
+INSTALLED_APPS = [
+    'django.contrib.admin',
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+    'rest_framework',
+    'corsheaders',
+    'api',
+]
+
+MIDDLEWARE = [
+    'api.instrumentation.RequestMetricsMiddleware',
+    'api.compression.CompressionMiddleware',
+    'corsheaders.middleware.CorsMiddleware',
+    'django.middleware.security.SecurityMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+ROOT_URLCONF = 'config.urls'
+
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [],
+        'APP_DIRS': True,
+        'OPTIONS': {
+            'context_processors': [
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+            ],
+        },
+    },
+]
+
+WSGI_APPLICATION = 'config.wsgi.application'
+
+
+# Database
+# https://docs.djangoproject.com/en/6.0/ref/settings/#databases
+
+TRUE_VALUES = ('1', 'true', 'yes', 'on')
+
+# DB_ENGINE=sqlite: ملف SQLite محلي للتطوير وقياس الأداء دون خادم PostgreSQL
+DB_ENGINE = os.getenv('DB_ENGINE', 'postgresql')
+
+if DB_ENGINE == 'sqlite':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.getenv('DB_NAME') or BASE_DIR / 'db.sqlite3',
+            'OPTIONS': {
+                # مدة انتظار القفل بالثواني بدلاً من الفشل الفوري "database is locked"
+                'timeout': int(os.getenv('DB_SQLITE_TIMEOUT', 20)),
+            },
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.getenv('DB_NAME'),
+            'USER': os.getenv('DB_USER'),
+            'PASSWORD': os.getenv('DB_PASSWORD'),
+            'HOST': os.getenv('DB_HOST'),
+            'PORT': os.getenv('DB_PORT'),
+        }
+    }
+
+# الاتصالات الدائمة: إعادة استخدام اتصال قاعدة البيانات بين الطلبات لمدة
+# DB_CONN_MAX_AGE ثانية (0 = اتصال جديد لكل طلب، none = بلا حد، والافتراضي 0 تحت ASGI)
+# مع فحص صلاحية الاتصال قبل إعادة استخدامه
+DB_CONN_MAX_AGE = os.getenv('DB_CONN_MAX_AGE', '60')
+DATABASES['default']['CONN_MAX_AGE'] = None if DB_CONN_MAX_AGE.lower() == 'none' else int(DB_CONN_MAX_AGE)
+DATABASES['default']['CONN_HEALTH_CHECKS'] = os.getenv('DB_CONN_HEALTH_CHECKS', 'true').lower() in TRUE_VALUES
+
+# أوامر PRAGMA تُنفذ عند فتح كل اتصال SQLite (WAL يسمح بالقراءة أثناء الكتابة)
+SQLITE_PRAGMAS = {
+    'journal_mode': os.getenv('DB_SQLITE_JOURNAL_MODE', 'wal'),
+    'synchronous': os.getenv('DB_SQLITE_SYNCHRONOUS', 'normal'),
+}
+
+
+# Password validation
+# https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
+
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
+    },
+]
+
+
+# Internationalization
+# https://docs.djangoproject.com/en/6.0/topics/i18n/
+
+LANGUAGE_CODE = 'ar'
+TIME_ZONE = 'Europe/Stockholm'
+USE_I18N = True
+USE_TZ = True
+
+# Static files
+STATIC_URL = 'static/'
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+
+STATICFILES_DIRS = [
+    BASE_DIR / "static",
+]
+MEDIA_URL = 'media/'
+MEDIA_ROOT = BASE_DIR / 'media'
+
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# CORS Settings
+CORS_ALLOWED_ORIGINS = [
+    "http://localhost:3000",
+    "http://127.0.0.1:3000",
+    "http://localhost:5173",
+]
+
+CORS_ALLOW_CREDENTIALS = True
+# settings.py
+CORS_ALLOW_ALL_ORIGINS = True
+
+CORS_ALLOW_METHODS = [
+    'DELETE',
+    'GET',
+    'OPTIONS',
+    'PATCH',
+    'POST',
+    'PUT',
+]
+
+CORS_ALLOW_HEADERS = [
+    'accept',
+    'accept-encoding',
+    'authorization',
+    'content-type',
+    'dnt',
+    'origin',
+    'user-agent',
+    'x-csrftoken',
+    'x-requested-with',
+]
+# REST Framework Settings
+REST_FRAMEWORK = {
+    'DEFAULT_PERMISSION_CLASSES': [
+        'rest_framework.permissions.AllowAny',
+    ],
+    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'PAGE_SIZE': 100,
+    'DEFAULT_RENDERER_CLASSES': [
+        'rest_framework.renderers.JSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ]
+}
+
+# Cache Settings
+# يمكن استبدال الخلفية بـ Redis أو ملفات عبر متغيرات البيئة، مثال:
+# CACHE_BACKEND=django.core.cache.backends.redis.RedisCache
+# CACHE_LOCATION=redis://127.0.0.1:6379/1
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', ''),
+    }
+}
+
+# رقم إصدار بنك الأسئلة يُقرأ من قاعدة البيانات (مشترك بين كل العمليات)
+# وتُحفظ نسخته داخل العملية لهذا العدد من الثواني قبل إعادة قراءته
+QUESTION_POOL_VERSION_TTL = float(os.getenv('QUESTION_POOL_VERSION_TTL', 1))
+
+# الأسئلة المحوّلة مسبقاً (JSON) المستخدمة في random_full_test و by_section
+# (طبقة LRU داخل العملية، مع طبقة ثانية اختيارية مثل QUESTION_PAYLOAD_CACHE_ALIAS=default)
+QUESTION_PAYLOAD_CACHE_ALIAS = os.getenv('QUESTION_PAYLOAD_CACHE_ALIAS', '')
+QUESTION_PAYLOAD_LRU_SIZE = int(os.getenv('QUESTION_PAYLOAD_LRU_SIZE', 5000))
+QUESTION_PAYLOAD_CACHE_TIMEOUT = int(os.getenv('QUESTION_PAYLOAD_CACHE_TIMEOUT', 24 * 60 * 60))
+
+# قياس الاستعلامات والزمن لكل طلب (ترويسة Server-Timing و /api/metrics/)
+# نسبة الطلبات المقاسة بين 0 و 1، القيمة 0 تعطّل القياس بالكامل
+REQUEST_METRICS_SAMPLE_RATE = float(os.getenv('REQUEST_METRICS_SAMPLE_RATE', 0))
+
+# مجمّع اختبارات كاملة جاهزة مسبقاً لـ random_full_test (0 يعطّله)
+# يُعاد ملؤه في خيط خلفي عند نزوله تحت EXAM_POOL_LOW_WATER أو عبر:
+# python manage.py refill_exam_pool --loop
+EXAM_POOL_SIZE = int(os.getenv('EXAM_POOL_SIZE', 0))
+EXAM_POOL_LOW_WATER = int(os.getenv('EXAM_POOL_LOW_WATER', EXAM_POOL_SIZE // 2))
+EXAM_POOL_REFILL_THREAD = os.getenv('EXAM_POOL_REFILL_THREAD', 'true').lower() in TRUE_VALUES
+EXAM_POOL_CACHE_ALIAS = os.getenv('EXAM_POOL_CACHE_ALIAS', 'default')
+EXAM_POOL_TIMEOUT = int(os.getenv('EXAM_POOL_TIMEOUT', 60 * 60))
+
+# الكتابة المؤجلة لمحاولات الاختبار الجديدة (انظر api/write_behind.py)
+# ATTEMPT_WRITE_BEHIND_DURABILITY: memory أو journal أو fsync
+ATTEMPT_WRITE_BEHIND = os.getenv('ATTEMPT_WRITE_BEHIND', 'false').lower() in TRUE_VALUES
+ATTEMPT_WRITE_BEHIND_MAX_ROWS = int(os.getenv('ATTEMPT_WRITE_BEHIND_MAX_ROWS', 100))
+ATTEMPT_WRITE_BEHIND_INTERVAL_MS = int(os.getenv('ATTEMPT_WRITE_BEHIND_INTERVAL_MS', 50))
+ATTEMPT_WRITE_BEHIND_ID_BLOCK = int(os.getenv('ATTEMPT_WRITE_BEHIND_ID_BLOCK', 100))
+ATTEMPT_WRITE_BEHIND_DURABILITY = os.getenv('ATTEMPT_WRITE_BEHIND_DURABILITY', 'journal')
+ATTEMPT_WRITE_BEHIND_JOURNAL_DIR = os.getenv(
+    'ATTEMPT_WRITE_BEHIND_JOURNAL_DIR',
+    str(BASE_DIR / 'var' / 'attempt-journal')
+)
+ATTEMPT_WRITE_BEHIND_THREAD = os.getenv('ATTEMPT_WRITE_BEHIND_THREAD', 'true').lower() in TRUE_VALUES
+
+# مدة صلاحية ردود الأقسام والأسئلة في ذاكرة المتصفح (0 = التحقق عبر ETag في كل طلب)
+QUESTION_BANK_CACHE_MAX_AGE = int(os.getenv('QUESTION_BANK_CACHE_MAX_AGE', 0))
+
+# أرشفة المحاولات المكتملة الأقدم من عدد الأيام (python manage.py archive_attempts)
+ATTEMPT_ARCHIVE_AFTER_DAYS = int(os.getenv('ATTEMPT_ARCHIVE_AFTER_DAYS', 365))
+ATTEMPT_ARCHIVE_DIR = os.getenv('ATTEMPT_ARCHIVE_DIR', str(BASE_DIR / 'var' / 'archive'))
+
+# سحب الأسئلة الموزون (weak_areas): أوزان الصعوبة وأقصى عمر لجداول السحب بالثواني
+ADAPTIVE_SAMPLER_DIFFICULTY_WEIGHTS = {'easy': 1.0, 'medium': 1.5, 'hard': 2.0}
+ADAPTIVE_SAMPLER_REFRESH = int(os.getenv('ADAPTIVE_SAMPLER_REFRESH', 300))
+
+# ضغط الاستجابات: brotli إذا كانت مكتبة brotli مثبتة وإلا gzip
+RESPONSE_BROTLI_QUALITY = int(os.getenv('RESPONSE_BROTLI_QUALITY', 5))
@@ -1,14 +1,14 @@
-import React from 'react';
-
-const LoadingSpinner = ({ message = 'جاري التحميل...' }) => {
-  return (
-    <div className="min-h-screen bg-gradient-to-br from-blue-50 to-indigo-100 flex items-center justify-center">
-      <div className="text-center">
-        <div className="inline-block animate-spin rounded-full h-16 w-16 border-b-2 border-blue-600 mb-4"></div>
-        <p className="text-xl text-gray-700 font-bold">{message}</p>
-      </div>
-    </div>
-  );
-};
-
-export default LoadingSpinner;
+import React from 'react';
+
+const LoadingSpinner = ({ message = 'جاري التحميل...' }) => {
+  return (
+    <div className="min-h-screen bg-gradient-to-br from-blue-50 to-indigo-100 flex items-center justify-center">
+      <div className="text-center">
+        <div className="inline-block animate-spin rounded-full h-16 w-16 border-b-2 border-blue-600 mb-4"></div>
+        <p className="text-xl text-gray-700 font-bold">{message}</p>
+      </div>
+    </div>
+  );
+};
+
+export default LoadingSpinner;
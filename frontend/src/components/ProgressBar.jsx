@@ -1,26 +1,26 @@
-import React from 'react';
-
-const ProgressBar = ({ current, total }) => {
-  const progress = (current / total) * 100;
-
-  return (
-    <div className="w-full">
-      <div className="flex items-center justify-between mb-2">
-        <span className="text-sm font-bold text-gray-700">
-          السؤال {current} من {total}
-        </span>
-        <span className="text-sm text-gray-600">
-          {progress.toFixed(0)}%
-        </span>
-      </div>
-      <div className="w-full bg-gray-200 rounded-full h-3">
-        <div
-          className="bg-blue-600 h-3 rounded-full transition-all duration-300"
-          style={{ width: `${progress}%` }}
-        />
-      </div>
-    </div>
-  );
-};
-
-export default ProgressBar;
+import React from 'react';
+
+const ProgressBar = ({ current, total }) => {
+  const progress = (current / total) * 100;
+
+  return (
+    <div className="w-full">
+      <div className="flex items-center justify-between mb-2">
+        <span className="text-sm font-bold text-gray-700">
+          السؤال {current} من {total}
+        </span>
+        <span className="text-sm text-gray-600">
+          {progress.toFixed(0)}%
+        </span>
+      </div>
+      <div className="w-full bg-gray-200 rounded-full h-3">
+        <div
+          className="bg-blue-600 h-3 rounded-full transition-all duration-300"
+          style={{ width: `${progress}%` }}
+        />
+      </div>
+    </div>
+  );
+};
+
+export default ProgressBar;
@@ -1,4 +1,5 @@
 import React, { createContext, useContext, useState, useMemo } from "react";
+import { attemptsAPI } from "../services/api";
 
 const TestContext = createContext(null);
 
@@ -32,6 +33,11 @@ export const TestProvider = ({ children }) => {
 
   const answerQuestion = (questionId, answerIndex) => {
     setAnswers(prev => ({ ...prev, [questionId]: answerIndex }));
+
+    // تسجيل الإجابة فوراً على الخادم حتى لا تضيع عند فشل الإرسال النهائي
+    if (currentAttempt) {
+      attemptsAPI.answer(currentAttempt.id, questionId, answerIndex).catch(() => {});
+    }
   };
 
   const nextQuestion = () => {